@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks of the CPU hot paths of AWS Athena MCP Server.
+
+Times query validation, identifier sanitizing, result page decoding, QueryResult
+construction, JSON serialization of results and schema digests on generated
+inputs at realistic scales, and compares them with a stored baseline.
+
+Timings are divided by a fixed pure-Python calibration workload timed in the same
+run, so a baseline recorded on one machine is usable on another. A benchmark
+regresses when its normalized time exceeds the baseline by more than the threshold.
+
+Usage:
+    python benchmarks/hot_paths.py                 # compare with baseline.json
+    python benchmarks/hot_paths.py --update        # record a new baseline
+    python benchmarks/hot_paths.py --scale 0.1     # smaller inputs, no comparison
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import timeit
+import warnings
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from athena_mcp.athena import QueryValidator
+from athena_mcp.cooperative import DEFAULT_CHUNK_CELLS, dumps_cooperatively
+from athena_mcp.digest import build_schema_digest
+from athena_mcp.models import QueryResult, TableInfo
+from athena_mcp.results import MAX_PAGE_ROWS, ResultBuffer
+
+BASELINE_FILE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+# Allowed slowdown against the baseline before a benchmark counts as regressed
+DEFAULT_THRESHOLD = 0.25
+
+# Timed runs per benchmark; the fastest is kept, as noise only ever adds time
+DEFAULT_REPEATS = 7
+
+# Each timed run repeats a benchmark until it takes at least this long
+MIN_RUN_SECONDS = 0.2
+
+TYPES = ["bigint", "varchar", "double", "timestamp", "boolean"]
+
+
+def generate_query(size: int) -> str:
+    """A SELECT of about size characters, mostly a long IN list."""
+    head = "SELECT " + ", ".join(f"col_{i}" for i in range(50)) + " FROM events WHERE id IN ("
+    values: List[str] = []
+    length = len(head) + 40
+    while length < size:
+        value = f"'{len(values):08d}'"
+        values.append(value)
+        length += len(value) + 2
+    return head + ", ".join(values) + ") AND dt >= '2024-01-01'"
+
+
+def generate_pages(rows: int, columns: int) -> List[Dict[str, Any]]:
+    """GetQueryResults responses for a result of rows x columns, header row first."""
+    names = [f"col_{i}" for i in range(columns)]
+    column_info = [{"Name": name, "Type": TYPES[i % len(TYPES)]} for i, name in enumerate(names)]
+    data = [{"Data": [{"VarCharValue": name} for name in names]}]
+    for row in range(rows):
+        data.append(
+            {"Data": [{"VarCharValue": f"value-{row}-{column}"} for column in range(columns)]}
+        )
+
+    pages = []
+    for first in range(0, len(data), MAX_PAGE_ROWS):
+        page: Dict[str, Any] = {
+            "ResultSet": {
+                "ResultSetMetadata": {"ColumnInfo": column_info},
+                "Rows": data[first : first + MAX_PAGE_ROWS],
+            }
+        }
+        if first + MAX_PAGE_ROWS < len(data):
+            page["NextToken"] = f"token-{first}"
+        pages.append(page)
+    return pages
+
+
+def generate_tables(tables: int, columns: int) -> List[TableInfo]:
+    """Wide table schemas sharing half their columns."""
+    return [
+        TableInfo(
+            database="bench",
+            table_name=f"table_{t}",
+            columns=[
+                {
+                    "name": f"shared_{c}" if c % 2 else f"t{t}_col_{c}",
+                    "type": TYPES[c % len(TYPES)],
+                }
+                for c in range(columns)
+            ],
+            partition_keys=["dt"],
+        )
+        for t in range(tables)
+    ]
+
+
+def decode(pages: List[Dict[str, Any]]) -> ResultBuffer:
+    """Decode pages the way get_query_results does."""
+    buffer = ResultBuffer()
+    for page in pages:
+        buffer.add_page(page)
+    return buffer
+
+
+def build_result(buffer: ResultBuffer) -> QueryResult:
+    """The QueryResult get_query_results returns for a whole buffer."""
+    result = QueryResult(
+        query_execution_id="00000000-0000-0000-0000-000000000000",
+        columns=buffer.columns,
+        column_types=buffer.column_types,
+        rows=[],
+        bytes_scanned=buffer.bytes_scanned,
+        execution_time_ms=buffer.execution_time_ms,
+        truncated=False,
+    )
+    result.rows = list(buffer.rows)
+    return result
+
+
+def serialize(result: QueryResult) -> str:
+    """Serialize a result the way the query tools do."""
+    payload = result.copy(update={"rows": []}).dict()
+    payload["rows"] = result.rows
+    return asyncio.run(dumps_cooperatively(payload, "rows", DEFAULT_CHUNK_CELLS))
+
+
+def calibrate() -> None:
+    """Fixed pure-Python work that timings are expressed as multiples of."""
+    rows = [{f"k{i}": f"v{i}-{n}" for i in range(20)} for n in range(2000)]
+    json.dumps(rows)
+    sorted(str(n * 7919 % 10007) for n in range(20000))
+
+
+def build_benchmarks(scale: float = 1.0) -> Dict[str, Callable[[], Any]]:
+    """Benchmarks by name, with inputs generated once at the given scale."""
+    rows = max(int(10000 * scale), 1)
+    query = generate_query(max(int(99000 * scale), 200))
+    identifiers = [f"analytics-db_{n}.events" for n in range(max(int(10000 * scale), 1))]
+    pages = generate_pages(rows, 50)
+    buffer = decode(pages)
+    result = build_result(buffer)
+    tables = generate_tables(max(int(50 * scale), 2), max(int(500 * scale), 10))
+
+    def sanitize() -> None:
+        for identifier in identifiers:
+            QueryValidator.sanitize_identifier(identifier)
+
+    return {
+        "validate_query": lambda: QueryValidator.validate_query(query),
+        "sanitize_identifier": sanitize,
+        "decode_pages": lambda: decode(pages),
+        "build_query_result": lambda: build_result(buffer),
+        "serialize_result": lambda: serialize(result),
+        "schema_digest": lambda: build_schema_digest("bench", tables, []),
+    }
+
+
+def best_time(
+    function: Callable[[], Any], repeats: int, min_run_seconds: float = MIN_RUN_SECONDS
+) -> float:
+    """Seconds per call in the fastest of several timed runs, with garbage collection off."""
+    timer = timeit.Timer(function)
+    number = 1
+    while timer.timeit(number) < min_run_seconds:
+        number *= 2
+    return min(timer.repeat(repeats, number)) / number
+
+
+def run(
+    scale: float = 1.0, repeats: int = DEFAULT_REPEATS, min_run_seconds: float = MIN_RUN_SECONDS
+) -> Dict[str, Any]:
+    """
+    Run every benchmark.
+
+    Returns:
+        Calibration seconds, and per benchmark its seconds and its time in
+        calibration units
+    """
+    benchmarks = build_benchmarks(scale)
+    results: Dict[str, Dict[str, float]] = {}
+    calibrations = []
+    for name, function in benchmarks.items():
+        # Calibrate next to each benchmark, so both see the same machine load
+        calibration = best_time(calibrate, repeats, min_run_seconds)
+        calibrations.append(calibration)
+        seconds = best_time(function, repeats, min_run_seconds)
+        results[name] = {"seconds": seconds, "relative": seconds / calibration}
+    return {"scale": scale, "calibration_seconds": min(calibrations), "benchmarks": results}
+
+
+def compare(
+    current: Dict[str, Any], baseline: Dict[str, Any], threshold: float = DEFAULT_THRESHOLD
+) -> List[str]:
+    """
+    Benchmarks slower than the baseline by more than threshold (as a fraction).
+
+    Returns:
+        A message per regression; benchmarks missing from either side are skipped
+    """
+    regressions = []
+    for name, timing in current["benchmarks"].items():
+        reference = baseline["benchmarks"].get(name)
+        if reference is None:
+            continue
+        change = timing["relative"] / reference["relative"] - 1
+        if change > threshold:
+            regressions.append(
+                f"{name}: {change:+.0%} ({timing['relative']:.2f} vs "
+                f"{reference['relative']:.2f} calibration units)"
+            )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--update", action="store_true", help="Record a new baseline")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="Baseline file")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Allowed slowdown as a fraction (default: %(default)s)",
+    )
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS)
+    parser.add_argument("--scale", type=float, default=1.0, help="Input size factor")
+    args = parser.parse_args(argv)
+    # The tools use pydantic's deprecated .dict(), so the benchmarks do too
+    warnings.simplefilter("ignore", DeprecationWarning)
+
+    current = run(args.scale, args.repeats)
+    for name, timing in current["benchmarks"].items():
+        print(f"{name:24} {timing['seconds'] * 1000:9.2f} ms {timing['relative']:8.2f} units")
+
+    if args.update:
+        with open(args.baseline, "w") as f:
+            json.dump(current, f, indent=2)
+            f.write("\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update to record one")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline.get("scale") != args.scale:
+        print(f"Baseline was recorded at scale {baseline.get('scale')}; not comparing")
+        return 0
+
+    regressions = compare(current, baseline, args.threshold)
+    for message in regressions:
+        print(f"❌ Regression: {message}")
+    if not regressions:
+        print(f"✅ No benchmark is more than {args.threshold:.0%} slower than the baseline")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,18 +8,84 @@ import asyncio
 import logging
 import re
 import time
-from typing import Optional, Union
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Literal, Optional, Tuple, Union
 
 import boto3
+from botocore.config import Config as BotoConfig
 from botocore.exceptions import ClientError
 
+from .cache import LRUCache
+from .catalog import SchemaCatalog
 from .config import Config
-from .models import DatabaseInfo, QueryRequest, QueryResult, QueryState, QueryStatus, TableInfo
+from .cooperative import chunk_rows, copy_rows_cooperatively, decode_rows_cooperatively
+from .digest import build_schema_digest
+from .fingerprint import QueryStatsTracker
+from .history import ExecutionHistory, HistoryFilter
+from .incremental import (
+    MAX_DELTA_PARTITIONS,
+    IncrementalAggregate,
+    PendingRun,
+    check_incremental_query,
+    key_versions,
+)
+from .lint import QueryLinter, add_predicate
+from .local import LocalEngine
+from .materialize import MaterializationCache, canonical_sql
+from .memory import MB, MemoryManager
+from .models import (
+    DatabaseInfo,
+    IncrementalInfo,
+    LintPolicy,
+    LintReport,
+    LocalQueryResult,
+    PartitionList,
+    QueryHistory,
+    QueryProfile,
+    QueryRequest,
+    QueryResult,
+    QueryState,
+    QueryStatus,
+    SchemaDigest,
+    SchemaMatch,
+    TableInfo,
+)
+from .partitions import PartitionCatalog, partition_literal
+from .prepared import PreparedStatementRegistry, count_placeholders, statement_name
+from .replay import RecordingClient, ReplaySession, SessionRecorder
+from .results import DEFAULT_ROW_BYTES, ResultBuffer, decode_cursor, row_size
+from .rewrite import rewrite_query, table_references
+from .routing import WorkgroupRoute, WorkgroupRouter
+from .runtime_stats import build_query_profile
+from .spill import SpillStore
+from .throttle import ApiRateLimiter
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
 
+# States after which an execution, its status and its results never change
+TERMINAL_STATES = {QueryState.SUCCEEDED, QueryState.FAILED, QueryState.CANCELLED}
+
+# Predicted-quick queries wait for their p95 runtime times this margin, plus a second,
+# but never longer than this many timeouts
+WAIT_MARGIN = 1.25
+MAX_WAIT_TIMEOUTS = 2
+
+# Complete results larger than this in memory are moved to spill files
+SPILL_MIN_BYTES = 256 * 1024
+
+# Status polling starts fast, so quick queries return soon after finishing, then backs off
+POLL_INITIAL_SECONDS = 0.25
+POLL_MAX_SECONDS = 1.0
+
+# CTAS and DROP statements for materialized subqueries run in the background this long
+STATEMENT_TIMEOUT_SECONDS = 1800
+
+# Receives human-readable progress updates while a query runs and its results are fetched
+ProgressCallback = Callable[[str], Awaitable[None]]
+
+
 class AthenaError(Exception):
     """Simple Athena error with code."""
 
@@ -76,6 +142,32 @@ class QueryValidator:
 
         logger.debug(f"Query validation passed for query of length {len(query)}")
 
+    # Literal forms accepted as prepared statement parameters
+    PARAMETER_PATTERN = re.compile(
+        r"^(?:-?\d+(?:\.\d+)?(?:e[-+]?\d+)?"  # numbers
+        r"|'(?:[^']|'')*'"  # string literals
+        r"|true|false|null"
+        r"|(?:date|time|timestamp|decimal)\s+'(?:[^']|'')*')$",  # typed literals
+        re.IGNORECASE,
+    )
+
+    @classmethod
+    def validate_parameters(cls, parameters: List[str]) -> None:
+        """
+        Validate prepared statement parameters.
+
+        Args:
+            parameters: SQL literals to bind to `?` placeholders
+
+        Raises:
+            ValueError: If a parameter is not a single SQL literal
+        """
+        for parameter in parameters:
+            if len(parameter) > 1024:
+                raise ValueError("Query parameter is too large (max 1024 characters)")
+            if not cls.PARAMETER_PATTERN.match(parameter.strip()):
+                raise ValueError(f"Query parameter must be a single SQL literal: {parameter[:100]}")
+
     @classmethod
     def sanitize_identifier(cls, identifier: str) -> str:
         """
@@ -112,16 +204,133 @@ class AthenaClient:
     def __init__(self, config: Config):
         self.config = config
 
-        # Initialize boto3 client
-        session = boto3.Session(region_name=config.aws_region)
-        self.client = session.client("athena")
+        # Sessions recorded to, or replayed from, a file instead of only talking to AWS
+        self.recorder = SessionRecorder(config.record_file) if config.record_file else None
+        self.replay = (
+            ReplaySession.load(config.replay_file, config.replay_speed)
+            if config.replay_file
+            else None
+        )
+
+        # Initialize boto3 client; retries are handled by the shared rate limiter
+        self.client = self._aws_client("athena", config.aws_region)
+        self.glue = self._aws_client("glue", config.aws_region)
+        self.api = ApiRateLimiter(max_retries=config.api_max_retries)
+
+        # One Athena client per region in the workgroup pool
+        regional_clients = {config.aws_region: self.client}
+        routes = []
+        for workgroup in config.workgroup_pool():
+            if workgroup.region not in regional_clients:
+                regional_clients[workgroup.region] = self._aws_client("athena", workgroup.region)
+            routes.append(WorkgroupRoute(workgroup, regional_clients[workgroup.region]))
+        self.router = WorkgroupRouter(routes)
+
+        self.partitions = PartitionCatalog(self.glue, self.api, config.partition_refresh_seconds)
+        self.prepared_statements = PreparedStatementRegistry()
+        self.history = ExecutionHistory(self.api)
+        self.catalog = SchemaCatalog(
+            self.glue,
+            self.api,
+            config.prefetch_databases,
+            config.prefetch_refresh_seconds,
+            config.prefetch_concurrency,
+        )
+
+        self.linter = QueryLinter(self.catalog, self.partitions)
+        self.local = LocalEngine()
+        self.query_stats = QueryStatsTracker()
+        # Hot CTE bodies materialized into a scratch database, when one is configured
+        self.materialized = (
+            MaterializationCache(
+                self._run_statement,
+                self._aws_client("s3", config.aws_region),
+                self.api,
+                config.materialize_database,
+                config.materialize_prefix(),
+                config.materialize_min_uses,
+                config.materialize_ttl_seconds,
+            )
+            if config.materialize_database
+            else None
+        )
+
+        # Terminal statuses and result pages are immutable, so repeat lookups stay local
+        self.statuses: LRUCache[str, QueryStatus] = LRUCache(max_entries=10000)
+        self.results: LRUCache[str, ResultBuffer] = LRUCache(
+            max_entries=1000,
+            max_bytes=config.result_cache_mb * 1024 * 1024,
+            sizeof=lambda buffer: buffer.size,
+        )
+        # Lint reports and rewritten SQL of executions, for responses after a timeout
+        self.lint_reports: LRUCache[str, LintReport] = LRUCache(max_entries=1000)
+        self.executed_queries: LRUCache[str, str] = LRUCache(max_entries=1000)
+        # Per-partition results of incremental queries, by (database, query, key)
+        self.incremental: LRUCache[Tuple[str, str, str], IncrementalAggregate] = LRUCache(
+            max_entries=200,
+            max_bytes=config.result_cache_mb * MB,
+            sizeof=lambda aggregate: aggregate.size,
+        )
+        # Large complete results live on disk; buffers of evicted spill files are dropped
+        self.spill = (
+            SpillStore(config.spill_mb * MB, config.spill_dir, on_evict=self.results.discard)
+            if config.spill_mb
+            else None
+        )
+
+        # One memory ceiling; result pages, then local tables, are evicted first when full
+        self.memory = MemoryManager(config.memory_limit_mb * MB)
+        self.memory.register_cache("results", lambda: self.results.bytes, self.results.evict_bytes)
+        self.memory.register_cache("local", lambda: self.local.bytes, self.local.evict_bytes)
+        self.memory.register_cache(
+            "incremental", lambda: self.incremental.bytes, self.incremental.evict_bytes
+        )
+        self.memory.register_cache("statuses", lambda: 500 * len(self.statuses))
+        self.memory.register_cache("history", lambda: 2000 * len(self.history.finished))
+        self.memory.register_cache("catalog", self.catalog.approximate_bytes)
+        self.memory.register_cache("query_stats", lambda: 2000 * len(self.query_stats))
 
         logger.info(f"Initialized Athena client for region: {config.aws_region}")
 
-    async def execute_query(self, request: QueryRequest) -> Union[QueryResult, str]:
+    def _aws_client(self, service: Literal["athena", "glue", "s3"], region: str) -> Any:
+        """A boto3 client for a service and region, wrapped for recording or replay."""
+        if self.replay is not None:
+            return self.replay.client(service, region)
+
+        boto_config = BotoConfig(retries={"total_max_attempts": 1})
+        client = boto3.Session(region_name=region).client(service, config=boto_config)
+        if self.recorder is not None:
+            return RecordingClient(client, service, self.recorder)
+        return client
+
+    async def execute_query(
+        self, request: QueryRequest, progress: Optional[ProgressCallback] = None
+    ) -> Union[QueryResult, str]:
         """
         Execute a query and return results or execution ID if timeout.
 
+        progress, if given, is called on state changes, as more data is scanned and as
+        result pages are fetched.
+
+        Returns:
+            QueryResult if completed within timeout, otherwise query_execution_id string
+        """
+        if request.incremental_key is not None:
+            return await self._execute_incremental(request, progress)
+        return await self._run_query(request, progress)
+
+    async def _run_query(
+        self,
+        request: QueryRequest,
+        progress: Optional[ProgressCallback] = None,
+        materialize: bool = True,
+    ) -> Union[QueryResult, str]:
+        """
+        Lint, rewrite and run a single query, waiting as long as its shape's history suggests.
+
+        materialize=False reads CTE bodies from the base tables even when they are
+        materialized.
+
         Returns:
             QueryResult if completed within timeout, otherwise query_execution_id string
         """
@@ -129,32 +338,93 @@ class AthenaClient:
         logger.debug(f"Query: {request.query[:200]}...")  # Log first 200 chars
 
         try:
-            # Validate and sanitize inputs
-            QueryValidator.validate_query(request.query)
+            # Validate and sanitize inputs (parameterized shapes are validated once when prepared)
+            if request.parameters is None:
+                QueryValidator.validate_query(request.query)
+            else:
+                QueryValidator.validate_parameters(request.parameters)
             sanitized_database = QueryValidator.sanitize_identifier(request.database)
 
+            # Cost lint against table schemas and partition keys
+            policy = request.lint_policy or LintPolicy(self.config.lint_policy)
+            lint_report, linted_query = await self.linter.lint(
+                request.query, sanitized_database, policy
+            )
+            if lint_report is not None:
+                if policy == LintPolicy.BLOCK:
+                    messages = "; ".join(finding.message for finding in lint_report.findings)
+                    raise AthenaError(f"Query blocked by cost lint: {messages}", "LINT_BLOCKED")
+                shape_stats = self.query_stats.shape(request.query)
+                if shape_stats is not None and lint_report.estimated_savings_percent is not None:
+                    lint_report.estimated_bytes_saved = int(
+                        shape_stats.mean_bytes_scanned * lint_report.estimated_savings_percent / 100
+                    )
+
+            # Read hot subqueries from their materialized tables; sampled and
+            # parameterized queries are left alone, as their CTE text is not the data read
+            if (
+                self.materialized is not None
+                and materialize
+                and request.parameters is None
+                and request.sample_percent is None
+            ):
+                linted_query = self.materialized.apply(linted_query, sanitized_database)
+
+            # Apply opt-in exploratory rewrites (LIMIT pushdown, TABLESAMPLE)
+            if linted_query != request.query:
+                executed_query = rewrite_query(request.copy(update={"query": linted_query}))
+            else:
+                executed_query = rewrite_query(request)
+
+            # Route to the least-loaded workgroup in the pool
+            route = self.router.select()
+
             # Start query execution
             start_params = {
-                "QueryString": request.query,
+                "QueryString": executed_query,
                 "QueryExecutionContext": {"Database": sanitized_database},
-                "ResultConfiguration": {"OutputLocation": self.config.s3_output_location},
+                "ResultConfiguration": {"OutputLocation": route.workgroup.s3_output_location},
             }
 
-            if self.config.athena_workgroup:
-                start_params["WorkGroup"] = self.config.athena_workgroup
-                logger.debug(f"Using workgroup: {self.config.athena_workgroup}")
-
-            response = self.client.start_query_execution(**start_params)
+            if route.name:
+                start_params["WorkGroup"] = route.name
+                logger.debug(f"Using workgroup: {route.name}")
+
+            if request.parameters is not None:
+                # Prepared statements are scoped to a workgroup
+                name = await self._prepare_statement(executed_query, route, len(request.parameters))
+                start_params["WorkGroup"] = route.name or "primary"
+                start_params["QueryString"] = f"EXECUTE {name}"
+                executed_query = f"EXECUTE {name}"
+                if request.parameters:
+                    start_params["ExecutionParameters"] = request.parameters
+                    executed_query += f" USING {', '.join(request.parameters)}"
+
+            # The idempotency token makes StartQueryExecution safe to retry when throttled
+            start_params["ClientRequestToken"] = str(uuid.uuid4())
+            response = await self.api.call(route.client, "start_query_execution", **start_params)
             query_execution_id = response["QueryExecutionId"]
-
-            logger.info(f"Started query execution: {query_execution_id}")
-
-            # Wait for completion with timeout
-            if await self._wait_for_completion(query_execution_id):
+            self.router.bind(query_execution_id, route)
+            if lint_report is not None:
+                self.lint_reports.put(query_execution_id, lint_report)
+            if executed_query != request.query:
+                self.executed_queries.put(query_execution_id, executed_query)
+            shape = self.query_stats.started(query_execution_id, request.query, route.key)
+
+            logger.info(f"Started query execution: {query_execution_id} (shape {shape})")
+            if progress is not None:
+                await progress(f"Started query execution {query_execution_id}")
+
+            # Wait for completion, as long as this shape's history suggests
+            wait_seconds = self._wait_budget(request.query, route.key)
+            if await self._wait_for_completion(query_execution_id, wait_seconds, progress):
                 logger.info(f"Query completed successfully: {query_execution_id}")
                 query_result: QueryResult = await self.get_query_results(
-                    query_execution_id, request.max_rows
+                    query_execution_id, request.max_rows, request.max_bytes, progress=progress
                 )
+                if executed_query != request.query:
+                    query_result.executed_query = executed_query
+                query_result.lint = lint_report
                 return query_result
             else:
                 # Timeout - return execution ID for later retrieval
@@ -170,23 +440,276 @@ class AthenaClient:
             logger.error(f"Unexpected error during query execution: {str(e)}")
             raise
 
+    async def _execute_incremental(
+        self, request: QueryRequest, progress: Optional[ProgressCallback] = None
+    ) -> Union[QueryResult, str]:
+        """
+        Execute a query grouped by a partition key, reusing the per-partition results of
+        earlier runs and querying only new or changed partitions.
+
+        Returns:
+            QueryResult over all partitions, or the execution ID if the Athena run timed
+            out (its rows are merged by the next run of the same query)
+        """
+        key = request.incremental_key or ""
+        if request.parameters is not None or request.sample_percent is not None:
+            raise ValueError("Incremental queries cannot be parameterized or sampled")
+        if request.exploratory:
+            raise ValueError("Incremental queries cannot be exploratory")
+        if request.lint_policy == LintPolicy.REWRITE:
+            # A rewritten run covers one partition, but would be cached as covering them all
+            raise ValueError("Incremental queries cannot use the rewrite lint policy")
+        QueryValidator.validate_query(request.query)
+        database = QueryValidator.sanitize_identifier(request.database)
+        descending = check_incremental_query(request.query, key)
+        references = table_references(request.query)
+        if len(references) != 1 or references[0].depth or references[0].sampled:
+            raise ValueError(
+                "Incremental queries must read a single partitioned table, outside subqueries"
+            )
+        reference = references[0]
+        table_database = reference.database or database.lower()
+
+        # Incremental refreshes only see the newest partitions; full listings also catch
+        # rewritten older ones
+        try:
+            index = self.partitions.cached_index(table_database, reference.table)
+            refresh = (
+                index is not None
+                and time.time() - index.full_refreshed_at >= self.config.partition_refresh_seconds
+            )
+            index = await self.partitions.get_index(table_database, reference.table, refresh)
+        except ClientError as e:
+            error_code = e.response.get("Error", {}).get("Code", "UNKNOWN")
+            raise AthenaError(str(e), error_code)
+        names = [name.lower() for name in index.key_names]
+        if key.lower() not in names:
+            raise ValueError(f"{key} is not a partition key of {table_database}.{reference.table}")
+        position = names.index(key.lower())
+        key_name, key_type = index.keys[position]["name"], index.keys[position]["type"]
+        versions = key_versions(index, position)
+
+        cache_key = (database, canonical_sql(request.query), key_name.lower())
+        aggregate = self.incremental.get(cache_key) or IncrementalAggregate()
+
+        # A run that timed out earlier is merged once it has finished
+        pending = aggregate.pending
+        if pending is not None:
+            status = await self.get_query_status(pending.execution_id)
+            if status.state in (QueryState.QUEUED, QueryState.RUNNING):
+                logger.info(f"Incremental run {pending.execution_id} is still running")
+                return pending.execution_id
+            aggregate.pending = None
+            if status.state == QueryState.SUCCEEDED:
+                result = await self._incremental_rows(pending.execution_id)
+                if pending.full or result.columns == aggregate.columns:
+                    aggregate.merge(
+                        result.columns,
+                        result.column_types,
+                        result.rows,
+                        pending.versions,
+                        self._key_column(result, key_name),
+                        key_type,
+                    )
+
+        aggregate.prune(versions)
+        newest = (
+            max(versions, key=lambda value: index.sort_value(position, value)) if versions else None
+        )
+        stale = aggregate.stale(versions, newest)
+        delta_query = None
+        if aggregate.partitions and len(stale) <= MAX_DELTA_PARTITIONS:
+            literals = ", ".join(partition_literal(value, key_type) for value in stale)
+            delta_query = add_predicate(request.query, reference, f'"{key_name}" IN ({literals})')
+        full = delta_query is None
+        covered = versions if full else {value: versions[value] for value in stale}
+        logger.info(
+            f"Incremental query over {len(versions)} values of {key_name}: "
+            + ("running in full" if full else f"querying {len(stale)}")
+        )
+
+        # Materialized CTE bodies are not refreshed with the partitions they read
+        outcome = await self._run_query(
+            request.copy(
+                update={
+                    "query": request.query if full else delta_query,
+                    "incremental_key": None,
+                    "max_rows": 10000,
+                    "max_bytes": None,
+                }
+            ),
+            progress,
+            materialize=False,
+        )
+        if isinstance(outcome, str):
+            aggregate.pending = PendingRun(outcome, covered, full)
+            self.incremental.put(cache_key, aggregate)
+            return outcome
+
+        result = await self._incremental_rows(outcome.query_execution_id, outcome)
+        if not full and result.columns != aggregate.columns:
+            # The result's columns changed (say, with the table's schema); start over
+            self.incremental.discard(cache_key)
+            return await self._execute_incremental(request, progress)
+        aggregate.merge(
+            result.columns,
+            result.column_types,
+            result.rows,
+            covered,
+            self._key_column(result, key_name),
+            key_type,
+        )
+        self.incremental.put(cache_key, aggregate)
+
+        rows = aggregate.rows(descending, lambda value: index.sort_value(position, value))
+        count = used = 0
+        for row in rows:
+            size = row_size(row)
+            if count >= request.max_rows or (
+                request.max_bytes is not None and count and used + size > request.max_bytes
+            ):
+                break
+            count += 1
+            used += size
+
+        executed_query = outcome.executed_query or (None if full else delta_query)
+        return QueryResult(
+            query_execution_id=outcome.query_execution_id,
+            columns=aggregate.columns,
+            column_types=aggregate.column_types,
+            rows=rows[:count],
+            bytes_scanned=outcome.bytes_scanned,
+            execution_time_ms=outcome.execution_time_ms,
+            executed_query=executed_query,
+            truncated=count < len(rows),
+            result_bytes=used,
+            lint=outcome.lint,
+            incremental=IncrementalInfo(
+                key=key_name,
+                partitions=len(versions),
+                partitions_reused=len(versions) - len(covered),
+                partitions_queried=len(covered),
+                full_refresh=full,
+            ),
+        )
+
+    async def _incremental_rows(
+        self, query_execution_id: str, first: Optional[QueryResult] = None
+    ) -> QueryResult:
+        """All rows of an incremental run, up to ATHENA_LOCAL_MAX_ROWS."""
+        result = first
+        if result is None or result.truncated:
+            result = await self.get_query_results(query_execution_id, self.config.local_max_rows)
+        if result.truncated:
+            raise AthenaError(
+                f"Incremental query results are limited to {self.config.local_max_rows} rows",
+                "INCREMENTAL_TOO_LARGE",
+                query_execution_id,
+            )
+        return result
+
+    @staticmethod
+    def _key_column(result: QueryResult, key_name: str) -> str:
+        """The result column holding the partition key."""
+        for column in result.columns:
+            if column.lower() == key_name.lower():
+                return column
+        raise ValueError(f"Incremental queries must select the partition key {key_name}")
+
+    async def _run_statement(self, sql: str, database: str) -> str:
+        """
+        Run a statement the server issues on its own behalf and wait for it to succeed.
+
+        Returns:
+            The statement's execution ID
+        """
+        route = self.router.select()
+        start_params: Dict[str, Any] = {
+            "QueryString": sql,
+            "QueryExecutionContext": {"Database": database},
+            "ResultConfiguration": {"OutputLocation": route.workgroup.s3_output_location},
+            "ClientRequestToken": str(uuid.uuid4()),
+        }
+        if route.name:
+            start_params["WorkGroup"] = route.name
+        response = await self.api.call(route.client, "start_query_execution", **start_params)
+        query_execution_id: str = response["QueryExecutionId"]
+        self.router.bind(query_execution_id, route)
+        if not await self._wait_for_completion(query_execution_id, STATEMENT_TIMEOUT_SECONDS):
+            raise AthenaError(
+                f"Statement did not finish in {STATEMENT_TIMEOUT_SECONDS}s",
+                "TIMEOUT",
+                query_execution_id,
+            )
+        return query_execution_id
+
+    async def _prepare_statement(
+        self, query: str, route: WorkgroupRoute, parameter_count: int
+    ) -> str:
+        """
+        Return the prepared statement for a query shape, creating it on first use.
+
+        Raises:
+            ValueError: If the shape fails validation or the parameter count is wrong
+        """
+        workgroup = route.name or "primary"
+        name = self.prepared_statements.get(route.key, query)
+        if name is None:
+            QueryValidator.validate_query(query)
+            placeholders = count_placeholders(query)
+            if placeholders != parameter_count:
+                raise ValueError(
+                    f"Query has {placeholders} parameter placeholders but {parameter_count} "
+                    "parameters were given"
+                )
+
+            name = statement_name(query)
+            try:
+                await self.api.call(
+                    route.client,
+                    "create_prepared_statement",
+                    StatementName=name,
+                    WorkGroup=workgroup,
+                    QueryStatement=query,
+                )
+                logger.info(f"Created prepared statement {name} in workgroup {workgroup}")
+            except ClientError as e:
+                # Names are derived from the query text, so an existing one has this shape
+                if "already exists" not in str(e):
+                    raise
+                logger.debug(f"Prepared statement {name} already exists")
+
+            for evicted_key, evicted_name in self.prepared_statements.register(
+                route.key, query, name
+            ):
+                evicted_route = self.router.get(evicted_key)
+                try:
+                    await self.api.call(
+                        evicted_route.client,
+                        "delete_prepared_statement",
+                        StatementName=evicted_name,
+                        WorkGroup=evicted_route.name or "primary",
+                    )
+                except ClientError as e:
+                    logger.warning(f"Could not delete prepared statement {evicted_name}: {e}")
+
+        return name
+
     async def get_query_status(self, query_execution_id: str) -> QueryStatus:
         """Get the status of a query execution."""
         logger.debug(f"Getting status for query: {query_execution_id}")
 
-        try:
-            response = self.client.get_query_execution(QueryExecutionId=query_execution_id)
-            execution = response.get("QueryExecution", {})
-
-            status = execution.get("Status", {})
-            statistics = execution.get("Statistics", {})
+        cached = self.statuses.get(query_execution_id)
+        if cached is not None:
+            return cached
 
-            query_status = QueryStatus(
-                query_execution_id=query_execution_id,
-                state=QueryState(status.get("State", "UNKNOWN")),
-                state_change_reason=status.get("StateChangeReason"),
-                bytes_scanned=statistics.get("DataScannedInBytes", 0),
-                execution_time_ms=statistics.get("EngineExecutionTimeInMillis", 0),
+        try:
+            client = self.router.route_for(query_execution_id).client
+            response = await self.api.call(
+                client, "get_query_execution", QueryExecutionId=query_execution_id
+            )
+            query_status = self._record_status(
+                query_execution_id, response.get("QueryExecution", {})
             )
 
             logger.debug(f"Query {query_execution_id} status: {query_status.state}")
@@ -197,69 +720,274 @@ class AthenaClient:
             logger.error(f"Error getting query status: {error_code} - {str(e)}")
             raise AthenaError(str(e), error_code, query_execution_id)
 
-    async def get_query_results(self, query_execution_id: str, max_rows: int = 1000) -> QueryResult:
-        """Get results for a completed query."""
-        logger.info(f"Getting results for query: {query_execution_id}, max_rows: {max_rows}")
+    def _record_status(self, query_execution_id: str, execution: Dict[str, Any]) -> QueryStatus:
+        """Build a QueryStatus from a QueryExecution, caching it once terminal."""
+        status = execution.get("Status", {})
+        statistics = execution.get("Statistics", {})
+
+        query_status = QueryStatus(
+            query_execution_id=query_execution_id,
+            state=QueryState(status.get("State", "UNKNOWN")),
+            state_change_reason=status.get("StateChangeReason"),
+            bytes_scanned=statistics.get("DataScannedInBytes", 0),
+            execution_time_ms=statistics.get("EngineExecutionTimeInMillis", 0),
+        )
 
-        try:
-            # Check status first
-            status = await self.get_query_status(query_execution_id)
-
-            if status.state in [QueryState.RUNNING, QueryState.QUEUED]:
-                raise AthenaError("Query is still running", "QUERY_RUNNING", query_execution_id)
-
-            if status.state == QueryState.FAILED:
-                reason = status.state_change_reason or "Query failed"
-                logger.error(f"Query failed: {query_execution_id} - {reason}")
-                raise AthenaError(reason, "QUERY_FAILED", query_execution_id)
-
-            if status.state != QueryState.SUCCEEDED:
-                logger.error(f"Query in unexpected state: {status.state}")
-                raise AthenaError(
-                    f"Query in unexpected state: {status.state}",
-                    "UNEXPECTED_STATE",
-                    query_execution_id,
-                )
+        if query_status.state in TERMINAL_STATES:
+            self.router.finished(query_execution_id, statistics.get("QueryQueueTimeInMillis"))
+            self.query_stats.finished(query_execution_id, query_status.state.value, statistics)
+            self.statuses.put(query_execution_id, query_status)
 
-            # Get results
-            response = self.client.get_query_results(
-                QueryExecutionId=query_execution_id, MaxResults=max_rows
-            )
+        return query_status
+
+    async def _result_buffer(
+        self, query_execution_id: str, cursor: Optional[str]
+    ) -> Tuple[ResultBuffer, int]:
+        """
+        Find or create the buffer to serve a result from, and the starting row in it.
 
-            result_set = response.get("ResultSet", {})
+        Buffers that start at the first row are cached; a cursor into rows that are
+        not cached gets a fresh, uncached buffer starting at the cursor's page.
+        """
+        page_token, offset = decode_cursor(cursor) if cursor else (None, 0)
+
+        buffer = self.results.get(query_execution_id)
+        if buffer is None and self.spill is not None:
+            spill_file = self.spill.get(query_execution_id)
+            if spill_file is not None:
+                buffer = ResultBuffer.from_spill(spill_file)
+                self.results.put(query_execution_id, buffer)
+        elif buffer is not None and buffer.spilled is not None and self.spill is not None:
+            self.spill.get(query_execution_id)  # Mark the spill file recently used
+        if buffer is not None:
+            start = buffer.position(page_token, offset)
+            if start is not None:
+                return buffer, start
+
+        # Check status before fetching (served from cache once the query has finished)
+        status = await self.get_query_status(query_execution_id)
+
+        if status.state in [QueryState.RUNNING, QueryState.QUEUED]:
+            raise AthenaError("Query is still running", "QUERY_RUNNING", query_execution_id)
+
+        if status.state == QueryState.FAILED:
+            reason = status.state_change_reason or "Query failed"
+            logger.error(f"Query failed: {query_execution_id} - {reason}")
+            raise AthenaError(reason, "QUERY_FAILED", query_execution_id)
+
+        if status.state != QueryState.SUCCEEDED:
+            logger.error(f"Query in unexpected state: {status.state}")
+            raise AthenaError(
+                f"Query in unexpected state: {status.state}",
+                "UNEXPECTED_STATE",
+                query_execution_id,
+            )
 
-            # Extract columns
-            column_info = result_set.get("ResultSetMetadata", {}).get("ColumnInfo", [])
-            columns = [col.get("Name", "") for col in column_info]
+        buffer = ResultBuffer(page_token, status.bytes_scanned, status.execution_time_ms)
+        return buffer, offset
+
+    async def get_query_results(
+        self,
+        query_execution_id: str,
+        max_rows: int = 1000,
+        max_bytes: Optional[int] = None,
+        cursor: Optional[str] = None,
+        progress: Optional[ProgressCallback] = None,
+    ) -> QueryResult:
+        """
+        Get results for a completed query.
 
-            # Extract rows (skip header for SELECT queries)
-            rows_data = result_set.get("Rows", [])
-            start_index = 1 if len(rows_data) > 0 and columns else 0
+        Pages are fetched only until max_rows rows or roughly max_bytes of serialized
+        rows are available; the result then reports truncation and a cursor to resume.
+        progress, if given, is called after each page fetched.
+        """
+        logger.info(
+            f"Getting results for query: {query_execution_id}, max_rows: {max_rows}, "
+            f"max_bytes: {max_bytes}"
+        )
 
-            rows = []
-            for row_data in rows_data[start_index:]:
-                row = {}
-                data_list = row_data.get("Data", [])
-                for i, data in enumerate(data_list):
-                    if i < len(columns):
-                        row[columns[i]] = data.get("VarCharValue")
-                rows.append(row)
+        reserved = 0
+        try:
+            buffer, start = await self._result_buffer(query_execution_id, cursor)
+            client = self.router.route_for(query_execution_id).client
+
+            # Concurrent calls on a cached buffer take turns, so each page is fetched
+            # and appended once
+            async with buffer.lock:
+                while True:
+                    count, used, budget_reached = buffer.take(start, max_rows, max_bytes)
+                    if budget_reached or buffer.complete:
+                        break
+
+                    remaining_bytes = None if max_bytes is None else max(max_bytes - used, 0)
+                    if (
+                        remaining_bytes is not None
+                        and count
+                        and remaining_bytes < buffer.mean_row_size()
+                    ):
+                        # Another page would most likely not add a row that fits the budget
+                        break
+
+                    page_rows = buffer.next_page_size(
+                        max_rows - count, remaining_bytes, max(start - len(buffer.rows), 0)
+                    )
+                    # Decoded rows take roughly twice their serialized size
+                    estimate = 2 * page_rows * int(buffer.mean_row_size() or DEFAULT_ROW_BYTES)
+                    if not await self.memory.reserve("result_fetches", estimate):
+                        if count:
+                            # Near the memory limit: return what we have, with a cursor
+                            logger.warning(f"Memory limit reached; truncating {query_execution_id}")
+                            break
+                        self.memory.force_reserve("result_fetches", estimate)
+                    reserved += estimate
+
+                    params = {"QueryExecutionId": query_execution_id, "MaxResults": page_rows}
+                    if buffer.next_token:
+                        params["NextToken"] = buffer.next_token
+                    response = await self.api.call(client, "get_query_results", **params)
+                    rows, sizes = await decode_rows_cooperatively(
+                        buffer.page_rows(response), buffer.columns, self.config.cpu_chunk_cells
+                    )
+                    buffer.append_page(response, rows, sizes)
+                    if progress is not None:
+                        fetched = len(buffer.rows) - start
+                        await progress(
+                            f"Fetched {fetched} rows"
+                            + ("" if buffer.complete else ", more available")
+                            + (
+                                f" (columns: {', '.join(buffer.columns)})"
+                                if len(buffer.pages) == 1
+                                else ""
+                            )
+                        )
+
+                if buffer.from_start:
+                    if (
+                        self.spill is not None
+                        and buffer.complete
+                        and buffer.spilled is None
+                        and buffer.size > SPILL_MIN_BYTES
+                    ):
+                        await buffer.spill_cooperatively(
+                            self.spill,
+                            query_execution_id,
+                            chunk_rows(len(buffer.columns), self.config.cpu_chunk_cells),
+                        )
+                    # Re-insert so the cache accounts for the pages just added
+                    self.results.put(query_execution_id, buffer)
+
+                end = start + count
+                rows = await copy_rows_cooperatively(
+                    buffer.rows, start, end, len(buffer.columns), self.config.cpu_chunk_cells
+                )
 
+            truncated = not (buffer.complete and end >= len(buffer.rows))
             result = QueryResult(
                 query_execution_id=query_execution_id,
-                columns=columns,
-                rows=rows,
-                bytes_scanned=status.bytes_scanned,
-                execution_time_ms=status.execution_time_ms,
+                columns=buffer.columns,
+                column_types=buffer.column_types,
+                rows=[],
+                bytes_scanned=buffer.bytes_scanned,
+                execution_time_ms=buffer.execution_time_ms,
+                truncated=truncated,
+                next_cursor=buffer.cursor_at(end) if truncated else None,
+                result_bytes=used,
             )
+            # Assigned rather than validated, which would take a pass over every value
+            result.rows = rows
 
-            logger.info(f"Retrieved {len(rows)} rows for query: {query_execution_id}")
+            logger.info(
+                f"Retrieved {count} rows ({used} bytes) for query: {query_execution_id}"
+                + (" (truncated)" if truncated else "")
+            )
             return result
 
         except ClientError as e:
             error_code = e.response.get("Error", {}).get("Code", "UNKNOWN")
             logger.error(f"Error getting query results: {error_code} - {str(e)}")
             raise AthenaError(str(e), error_code, query_execution_id)
+        finally:
+            if reserved:
+                self.memory.release("result_fetches", reserved)
+
+    async def query_local(self, sql: str, max_rows: int = 1000) -> LocalQueryResult:
+        """
+        Run SQL in-process over earlier results, referenced by execution ID as table names.
+
+        Results not loaded yet are fetched (from the result cache where possible) up to
+        ATHENA_LOCAL_MAX_ROWS rows; larger results are loaded partially.
+        """
+        sources = self.local.referenced_ids(sql)
+        if not sources:
+            raise ValueError(
+                'Reference at least one earlier result by execution ID, e.g. SELECT * FROM "<id>"'
+            )
+
+        for execution_id in sources:
+            if execution_id not in self.local:
+                result = await self.get_query_results(execution_id, self.config.local_max_rows)
+                await self.local.load(result)
+
+        return await self.local.query(sql, max_rows)
+
+    async def profile_query(self, query_execution_id: str) -> QueryProfile:
+        """Get timing, stage and row statistics for a query execution."""
+        logger.info(f"Profiling query: {query_execution_id}")
+
+        client = self.router.route_for(query_execution_id).client
+
+        try:
+            response = await self.api.call(
+                client, "get_query_execution", QueryExecutionId=query_execution_id
+            )
+            execution = response.get("QueryExecution", {})
+
+            # Runtime statistics are only available once the query has started running
+            runtime_statistics = None
+            if execution.get("Status", {}).get("State") != QueryState.QUEUED:
+                try:
+                    runtime_response = await self.api.call(
+                        client,
+                        "get_query_runtime_statistics",
+                        QueryExecutionId=query_execution_id,
+                    )
+                    runtime_statistics = runtime_response.get("QueryRuntimeStatistics")
+                except ClientError as e:
+                    logger.warning(f"Runtime statistics unavailable for {query_execution_id}: {e}")
+
+            return build_query_profile(query_execution_id, execution, runtime_statistics)
+
+        except ClientError as e:
+            error_code = e.response.get("Error", {}).get("Code", "UNKNOWN")
+            logger.error(f"Error profiling query: {error_code} - {str(e)}")
+            raise AthenaError(str(e), error_code, query_execution_id)
+
+    async def query_history(
+        self,
+        history_filter: HistoryFilter,
+        workgroup: Optional[str] = None,
+        limit: int = 20,
+        max_scanned: int = 500,
+        next_token: Optional[str] = None,
+    ) -> QueryHistory:
+        """List recent executions of a workgroup in the pool, newest first."""
+        route = self.router.default
+        if workgroup:
+            matching = [r for r in self.router.routes if r.name == workgroup]
+            if not matching:
+                raise ValueError(f"Workgroup is not configured: {workgroup}")
+            route = matching[0]
+
+        logger.info(f"Searching query history of workgroup: {route.name}")
+
+        try:
+            return await self.history.search(
+                route.client, route.name, history_filter, limit, max_scanned, next_token
+            )
+        except ClientError as e:
+            error_code = e.response.get("Error", {}).get("Code", "UNKNOWN")
+            logger.error(f"Error listing query history: {error_code} - {str(e)}")
+            raise AthenaError(str(e), error_code)
 
     async def list_tables(self, database: str) -> DatabaseInfo:
         """List all tables in a database."""
@@ -267,6 +995,11 @@ class AthenaClient:
 
         sanitized_database = QueryValidator.sanitize_identifier(database)
 
+        cached = self.catalog.get_database(sanitized_database)
+        if cached is not None:
+            logger.debug(f"Serving prefetched table list for database: {database}")
+            return cached
+
         request = QueryRequest(database=sanitized_database, query="SHOW TABLES", max_rows=1000)
 
         result = await self.execute_query(request)
@@ -293,6 +1026,11 @@ class AthenaClient:
         sanitized_database = QueryValidator.sanitize_identifier(database)
         sanitized_table = QueryValidator.sanitize_identifier(table_name)
 
+        cached = self.catalog.get_table(sanitized_database, sanitized_table)
+        if cached is not None:
+            logger.debug(f"Serving prefetched schema for table: {database}.{table_name}")
+            return cached
+
         request = QueryRequest(
             database=sanitized_database, query=f"DESCRIBE {sanitized_table}", max_rows=1000
         )
@@ -304,58 +1042,178 @@ class AthenaClient:
             logger.error(f"DESCRIBE query timed out for table: {database}.{table_name}")
             raise AthenaError(f"DESCRIBE {table_name} query timed out", "TIMEOUT", result)
 
-        # Extract column information
+        # Extract column information; partition keys follow a "# Partition Information" marker
         columns = []
+        partition_keys = []
+        in_partition_section = False
         for row in result.rows:
+            name = (row.get("col_name") or "").strip()
+            if name.startswith("#"):
+                in_partition_section = in_partition_section or "partition" in name.lower()
+                continue
+            if not name:
+                continue
+            if in_partition_section:
+                partition_keys.append(name)
+                continue
             columns.append(
                 {
-                    "name": row.get("col_name", ""),
-                    "type": row.get("data_type", ""),
-                    "comment": row.get("comment", ""),
+                    "name": name,
+                    "type": (row.get("data_type") or "").strip(),
+                    "comment": (row.get("comment") or "").strip(),
                 }
             )
 
         table_info = TableInfo(
-            database=sanitized_database, table_name=sanitized_table, columns=columns
+            database=sanitized_database,
+            table_name=sanitized_table,
+            columns=columns,
+            partition_keys=partition_keys,
         )
 
+        self.linter.remember(table_info)
         logger.info(f"Described table {database}.{table_name} with {len(columns)} columns")
         return table_info
 
-    async def _wait_for_completion(self, query_execution_id: str) -> bool:
+    async def describe_tables(
+        self, database: str, table_names: Optional[List[str]] = None
+    ) -> SchemaDigest:
+        """Describe many tables, or a whole database, as one compact digest."""
+        logger.info(f"Describing {len(table_names) if table_names else 'all'} tables in {database}")
+
+        sanitized_database = QueryValidator.sanitize_identifier(database).lower()
+        try:
+            if table_names:
+                wanted = {QueryValidator.sanitize_identifier(name).lower() for name in table_names}
+                tables = await self.catalog.fetch_tables(sanitized_database, sorted(wanted))
+            else:
+                await self.catalog.ensure_database(sanitized_database)
+                wanted = set()
+                tables = self.catalog.cached_tables(sanitized_database) or {}
+        except ClientError as e:
+            error_code = e.response.get("Error", {}).get("Code", "UNKNOWN")
+            logger.error(f"Error describing tables: {error_code} - {str(e)}")
+            raise AthenaError(str(e), error_code)
+
+        return build_schema_digest(
+            sanitized_database, list(tables.values()), sorted(wanted - set(tables))
+        )
+
+    async def search_schema(
+        self, query: str, database: Optional[str] = None, limit: int = 20
+    ) -> List[SchemaMatch]:
+        """Search table and column names, types and comments of catalogued databases."""
+        logger.info(f"Searching schema for: {query}")
+
+        if database:
+            sanitized_database = QueryValidator.sanitize_identifier(database)
+            try:
+                await self.catalog.ensure_database(sanitized_database)
+            except ClientError as e:
+                error_code = e.response.get("Error", {}).get("Code", "UNKNOWN")
+                logger.error(f"Error loading schema of {database}: {error_code} - {str(e)}")
+                raise AthenaError(str(e), error_code)
+        elif not len(self.catalog.index):
+            raise AthenaError(
+                "No schemas are indexed yet; pass a database or set ATHENA_PREFETCH_DATABASES",
+                "INDEX_EMPTY",
+            )
+
+        return self.catalog.index.search(query, database, limit)
+
+    async def list_partitions(
+        self, database: str, table_name: str, max_partitions: int = 100, refresh: bool = False
+    ) -> PartitionList:
+        """List partition keys, value ranges and the newest partitions of a table."""
+        logger.info(f"Listing partitions for table: {database}.{table_name}")
+
+        sanitized_database = QueryValidator.sanitize_identifier(database)
+        sanitized_table = QueryValidator.sanitize_identifier(table_name)
+
+        try:
+            index = await self.partitions.get_index(sanitized_database, sanitized_table, refresh)
+        except ClientError as e:
+            error_code = e.response.get("Error", {}).get("Code", "UNKNOWN")
+            logger.error(f"Error listing partitions: {error_code} - {str(e)}")
+            raise AthenaError(str(e), error_code)
+
+        return index.to_model(max_partitions)
+
+    def _wait_budget(self, query: str, workgroup: str) -> float:
         """
-        Wait for query completion with timeout.
+        Seconds to wait for a query before handing back its execution ID.
+
+        Without enough history this is the configured timeout. Shapes whose median
+        runtime in the workgroup exceeds the timeout are not waited for; others get
+        enough time for their p95 runtime, up to twice the timeout.
+        """
+        timeout_seconds = self.config.timeout_seconds
+        prediction = self.query_stats.predict(query, workgroup)
+        if prediction is None:
+            return timeout_seconds
+
+        if prediction.median_ms / 1000 > timeout_seconds:
+            logger.info(
+                f"Query shape usually runs {prediction.median_ms / 1000:.0f}s; "
+                "returning its execution ID without waiting"
+            )
+            return 0
+        predicted_seconds = prediction.p95_ms / 1000 * WAIT_MARGIN + 1
+        return min(max(timeout_seconds, predicted_seconds), MAX_WAIT_TIMEOUTS * timeout_seconds)
+
+    async def _wait_for_completion(
+        self,
+        query_execution_id: str,
+        timeout_seconds: Optional[float] = None,
+        progress: Optional[ProgressCallback] = None,
+    ) -> bool:
+        """
+        Wait for query completion with timeout (the configured one by default),
+        reporting state changes and data scanned so far to progress.
 
         Returns:
             True if completed successfully, False if timed out
         """
-        timeout_seconds = self.config.timeout_seconds
+        if timeout_seconds is None:
+            timeout_seconds = self.config.timeout_seconds
+        if timeout_seconds <= 0:
+            return False
         start_time = time.time()
 
         logger.debug(
             f"Waiting for query completion: {query_execution_id}, timeout: {timeout_seconds}s"
         )
 
+        client = self.router.route_for(query_execution_id).client
+        poll_seconds = POLL_INITIAL_SECONDS
+        reported: Optional[Tuple[QueryState, int]] = None
+
         while time.time() - start_time < timeout_seconds:
             try:
-                response = self.client.get_query_execution(QueryExecutionId=query_execution_id)
-                state = response.get("QueryExecution", {}).get("Status", {}).get("State")
+                response = await self.api.call(
+                    client, "get_query_execution", QueryExecutionId=query_execution_id
+                )
+                status = self._record_status(query_execution_id, response.get("QueryExecution", {}))
 
-                if state == QueryState.SUCCEEDED:
+                if progress is not None and (status.state, status.bytes_scanned) != reported:
+                    reported = (status.state, status.bytes_scanned)
+                    await progress(
+                        f"{status.state.value}: {status.bytes_scanned} bytes scanned after "
+                        f"{time.time() - start_time:.1f}s"
+                    )
+
+                if status.state == QueryState.SUCCEEDED:
                     logger.debug(f"Query completed successfully: {query_execution_id}")
                     return True
 
-                if state in [QueryState.FAILED, QueryState.CANCELLED]:
-                    reason = (
-                        response.get("QueryExecution", {})
-                        .get("Status", {})
-                        .get("StateChangeReason", "Query failed")
-                    )
+                if status.state in [QueryState.FAILED, QueryState.CANCELLED]:
+                    reason = status.state_change_reason or "Query failed"
                     logger.error(f"Query failed: {query_execution_id} - {reason}")
                     raise AthenaError(reason, "QUERY_FAILED", query_execution_id)
 
                 # Wait before checking again
-                await asyncio.sleep(1)
+                await asyncio.sleep(poll_seconds)
+                poll_seconds = min(poll_seconds * 2, POLL_MAX_SECONDS)
 
             except ClientError as e:
                 error_code = e.response.get("Error", {}).get("Code", "UNKNOWN")
@@ -0,0 +1,102 @@
+"""
+In-memory caches for AWS Athena MCP Server.
+
+Simple bounded LRU caches for data that never changes once fetched, such as
+executions that reached a terminal state and their result pages.
+"""
+
+import logging
+from collections import OrderedDict
+from typing import Callable, Dict, Generic, Hashable, Optional, TypeVar, Union
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class LRUCache(Generic[K, V]):
+    """Least-recently-used cache bounded by entry count and, optionally, by size."""
+
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        max_bytes: Optional[int] = None,
+        sizeof: Optional[Callable[[V], int]] = None,
+    ):
+        if max_bytes is not None and sizeof is None:
+            raise ValueError("sizeof is required when max_bytes is set")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes = 0
+        self._entries: "OrderedDict[K, V]" = OrderedDict()
+        self._sizes: Dict[K, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._entries
+
+    def get(self, key: K) -> Optional[V]:
+        """Return a cached value and mark it recently used."""
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: K, value: V) -> None:
+        """Insert a value, evicting the least recently used entries if full."""
+        self.discard(key)
+
+        size = self.sizeof(value) if self.sizeof else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            logger.debug(f"Not caching {key}: {size} bytes exceeds the {self.max_bytes} limit")
+            return
+
+        self._entries[key] = value
+        self._sizes[key] = size
+        self.bytes += size
+
+        while len(self._entries) > self.max_entries or (
+            self.max_bytes is not None and self.bytes > self.max_bytes
+        ):
+            evicted_key, _ = self._entries.popitem(last=False)
+            self.bytes -= self._sizes.pop(evicted_key)
+            self.evictions += 1
+
+    def evict_bytes(self, size: int) -> int:
+        """Evict least recently used entries until at least size bytes are freed."""
+        freed = 0
+        while freed < size and self._entries:
+            evicted_key, _ = self._entries.popitem(last=False)
+            removed = self._sizes.pop(evicted_key)
+            self.bytes -= removed
+            freed += removed
+            self.evictions += 1
+        return freed
+
+    def discard(self, key: K) -> None:
+        """Remove an entry if present."""
+        if self._entries.pop(key, None) is not None:
+            self.bytes -= self._sizes.pop(key)
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """Entry, size and hit-rate counters."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
@@ -0,0 +1,280 @@
+"""
+Schema catalog prefetching for AWS Athena MCP Server.
+
+Loads table lists and schemas of configured databases from the Glue Data
+Catalog in the background, so list_tables and describe_table can answer
+without running SHOW TABLES or DESCRIBE queries, and keeps the schema search
+index in step with each page loaded.
+"""
+
+import asyncio
+import fnmatch
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from botocore.exceptions import ClientError
+
+from .models import DatabaseInfo, TableInfo
+from .search import SchemaIndex
+from .throttle import ApiRateLimiter
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+GLOB_CHARACTERS = set("*?[")
+
+# Table names per GetTables call when fetching named tables
+TABLE_BATCH_SIZE = 25
+
+
+def _table_info(database: str, table: Dict[str, Any]) -> TableInfo:
+    """Convert a Glue table into the shape DESCRIBE produces (partition keys last)."""
+    descriptor_columns = table.get("StorageDescriptor", {}).get("Columns", [])
+    partition_columns = table.get("PartitionKeys", [])
+    columns = [
+        {
+            "name": column.get("Name", ""),
+            "type": column.get("Type", ""),
+            "comment": column.get("Comment", ""),
+        }
+        for column in descriptor_columns + partition_columns
+    ]
+    return TableInfo(
+        database=database,
+        table_name=table.get("Name", ""),
+        columns=columns,
+        partition_keys=[column.get("Name", "") for column in partition_columns],
+    )
+
+
+class CatalogEntry:
+    """Prefetched tables of one database."""
+
+    def __init__(self, tables: Dict[str, TableInfo]):
+        self.tables = tables
+        self.loaded_at = time.time()
+
+    @property
+    def age_seconds(self) -> float:
+        """Seconds since the entry was loaded."""
+        return time.time() - self.loaded_at
+
+
+class SchemaCatalog:
+    """Background-refreshed table lists and schemas for configured databases."""
+
+    def __init__(
+        self,
+        glue_client: Any,
+        api: ApiRateLimiter,
+        patterns: List[str],
+        refresh_seconds: int = 900,
+        concurrency: int = 4,
+    ):
+        self.glue = glue_client
+        self.api = api
+        self.patterns = patterns
+        self.refresh_seconds = refresh_seconds
+        self.concurrency = concurrency
+        self._entries: Dict[str, CatalogEntry] = {}
+        self.index = SchemaIndex()
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._progress: Dict[str, Any] = {
+            "refreshes": 0,
+            "databases_total": 0,
+            "databases_loaded": 0,
+            "failures": 0,
+            "last_started_at": None,
+            "last_completed_at": None,
+        }
+
+    @property
+    def max_staleness_seconds(self) -> float:
+        """Entries older than this are not served (a refresh has failed or stalled)."""
+        if not self.refresh_seconds:
+            return float("inf")
+        return 2 * self.refresh_seconds
+
+    def start(self) -> None:
+        """Start background prefetching; does nothing without configured databases."""
+        if not self.patterns or self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"Started schema prefetch for databases: {', '.join(self.patterns)}")
+
+    async def stop(self) -> None:
+        """Cancel background prefetching."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def get_database(self, database: str) -> Optional[DatabaseInfo]:
+        """Prefetched table list, or None if not prefetched or too stale."""
+        entry = self._fresh_entry(database)
+        if entry is None:
+            return None
+        tables = sorted(entry.tables)
+        return DatabaseInfo(database=database, tables=tables, table_count=len(tables))
+
+    def get_table(self, database: str, table_name: str) -> Optional[TableInfo]:
+        """Prefetched table schema, or None if not prefetched or too stale."""
+        entry = self._fresh_entry(database)
+        if entry is None:
+            return None
+        return entry.tables.get(table_name.lower())
+
+    async def ensure_database(self, database: str) -> None:
+        """Load a database on demand if it is not cached or too stale."""
+        if self._fresh_entry(database) is None:
+            await self._load_database(database.lower())
+
+    async def fetch_tables(self, database: str, table_names: List[str]) -> Dict[str, TableInfo]:
+        """
+        Schemas of named tables, from cache when fresh, otherwise by batched GetTables calls.
+
+        Returns:
+            Found tables keyed by lowercase name (missing tables are absent)
+        """
+        database = database.lower()
+        wanted = sorted({name.lower() for name in table_names})
+        entry = self._fresh_entry(database)
+        if entry is not None and all(name in entry.tables for name in wanted):
+            return {name: entry.tables[name] for name in wanted}
+
+        found: Dict[str, TableInfo] = {}
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def fetch(batch: List[str]) -> None:
+            params: Dict[str, Any] = {"DatabaseName": database, "Expression": "|".join(batch)}
+            async with semaphore:
+                while True:
+                    response = await self.api.call_in_thread(self.glue, "get_tables", **params)
+                    for table in response.get("TableList", []):
+                        info = _table_info(database, table)
+                        # The expression is a pattern; keep exact name matches only
+                        if info.table_name.lower() in batch:
+                            found[info.table_name.lower()] = info
+                            self.index.update_table(info)
+                    next_token = response.get("NextToken")
+                    if not next_token:
+                        break
+                    params["NextToken"] = next_token
+
+        batches = [
+            wanted[i : i + TABLE_BATCH_SIZE] for i in range(0, len(wanted), TABLE_BATCH_SIZE)
+        ]
+        await asyncio.gather(*(fetch(batch) for batch in batches))
+        logger.debug(
+            f"Fetched {len(found)}/{len(wanted)} tables of {database} in {len(batches)} calls"
+        )
+        return found
+
+    def cached_tables(self, database: str) -> Optional[Dict[str, TableInfo]]:
+        """All tables of a fresh cached database, or None."""
+        entry = self._fresh_entry(database)
+        return entry.tables if entry is not None else None
+
+    def approximate_bytes(self) -> int:
+        """Rough memory held by cached schemas and the search index."""
+        columns = sum(
+            len(table.columns)
+            for entry in self._entries.values()
+            for table in entry.tables.values()
+        )
+        return 300 * columns + 500 * len(self.index)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Prefetch progress and staleness."""
+        ages = {name: round(entry.age_seconds, 1) for name, entry in self._entries.items()}
+        return {
+            **self._progress,
+            "running": self._task is not None and not self._task.done(),
+            "tables": sum(len(entry.tables) for entry in self._entries.values()),
+            "indexed_tables": len(self.index),
+            "age_seconds": ages,
+            "max_age_seconds": max(ages.values()) if ages else None,
+        }
+
+    def _fresh_entry(self, database: str) -> Optional[CatalogEntry]:
+        entry = self._entries.get(database.lower())
+        if entry is None or entry.age_seconds > self.max_staleness_seconds:
+            return None
+        return entry
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.warning(f"Schema prefetch failed: {e}")
+            if not self.refresh_seconds:
+                return
+            await asyncio.sleep(self.refresh_seconds)
+
+    async def refresh(self) -> None:
+        """Load every matching database, a few at a time."""
+        self._progress["refreshes"] += 1
+        self._progress["last_started_at"] = time.time()
+        self._progress["databases_loaded"] = 0
+
+        databases = await self._matching_databases()
+        self._progress["databases_total"] = len(databases)
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def load(database: str) -> None:
+            async with semaphore:
+                try:
+                    await self._load_database(database)
+                    self._progress["databases_loaded"] += 1
+                except ClientError as e:
+                    self._progress["failures"] += 1
+                    logger.warning(f"Could not prefetch schema of {database}: {e}")
+
+        await asyncio.gather(*(load(database) for database in databases))
+        self._progress["last_completed_at"] = time.time()
+        logger.info(f"Prefetched {self._progress['databases_loaded']}/{len(databases)} databases")
+
+    async def _matching_databases(self) -> List[str]:
+        """Databases named by the configured names or glob patterns."""
+        if not any(GLOB_CHARACTERS.intersection(pattern) for pattern in self.patterns):
+            return [pattern.lower() for pattern in self.patterns]
+
+        names: List[str] = []
+        params: Dict[str, Any] = {}
+        while True:
+            response = await self.api.call_in_thread(self.glue, "get_databases", **params)
+            names.extend(database.get("Name", "") for database in response.get("DatabaseList", []))
+            next_token = response.get("NextToken")
+            if not next_token:
+                break
+            params["NextToken"] = next_token
+
+        return [
+            name
+            for name in names
+            if any(fnmatch.fnmatchcase(name, pattern.lower()) for pattern in self.patterns)
+        ]
+
+    async def _load_database(self, database: str) -> None:
+        tables: Dict[str, TableInfo] = {}
+        params: Dict[str, Any] = {"DatabaseName": database}
+        while True:
+            response = await self.api.call_in_thread(self.glue, "get_tables", **params)
+            for table in response.get("TableList", []):
+                info = _table_info(database, table)
+                tables[info.table_name.lower()] = info
+                self.index.update_table(info)
+            next_token = response.get("NextToken")
+            if not next_token:
+                break
+            params["NextToken"] = next_token
+
+        self._entries[database] = CatalogEntry(tables)
+        dropped = self.index.retain_tables(database, tables)
+        logger.debug(f"Prefetched {len(tables)} tables of {database} ({dropped} dropped)")
@@ -4,9 +4,112 @@ Configuration management for AWS Athena MCP Server.
 Handles environment variables with sensible defaults and clear validation.
 """
 
+import json
 import os
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+
+def _int_from_env(name: str, default: int, minimum: int) -> int:
+    """Read an integer environment variable, enforcing a lower bound."""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    try:
+        parsed = int(value)
+    except ValueError as e:
+        raise ValueError(f"{name} must be an integer. Got: {value}") from e
+    if parsed < minimum:
+        raise ValueError(f"{name} must be at least {minimum}. Got: {value}")
+    return parsed
+
+
+def _float_from_env(name: str) -> Optional[float]:
+    """Read an optional positive number from an environment variable."""
+    value = os.getenv(name)
+    if value is None:
+        return None
+    try:
+        parsed = float(value)
+    except ValueError as e:
+        raise ValueError(f"{name} must be a number. Got: {value}") from e
+    if parsed <= 0:
+        raise ValueError(f"{name} must be positive. Got: {value}")
+    return parsed
+
+
+def _list_from_env(name: str) -> List[str]:
+    """Read a comma-separated environment variable."""
+    value = os.getenv(name, "")
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+# Server-wide cost lint policies; "rewrite" changes results, so it is only accepted per query
+LINT_POLICIES = ("off", "warn", "block")
+
+
+@dataclass
+class WorkgroupConfig:
+    """A workgroup in the routing pool."""
+
+    name: Optional[str]
+    region: str
+    s3_output_location: str
+    max_concurrent: Optional[int] = None
+
+
+def _workgroup_from_entry(
+    entry: Dict[str, Any], default_region: str, default_output: str
+) -> WorkgroupConfig:
+    """
+    Build a workgroup from one ATHENA_WORKGROUPS entry.
+
+    Raises:
+        KeyError, TypeError or AttributeError: If the entry is malformed
+    """
+    workgroup = WorkgroupConfig(
+        name=entry["name"],
+        region=entry.get("region", default_region),
+        s3_output_location=entry.get("s3_output_location", default_output),
+        max_concurrent=entry.get("max_concurrent"),
+    )
+    for text in (workgroup.name, workgroup.region, workgroup.s3_output_location):
+        if not isinstance(text, str):
+            raise TypeError(f"expected a string, got {text!r}")
+    limit = workgroup.max_concurrent
+    if limit is not None and (isinstance(limit, bool) or not isinstance(limit, int)):
+        raise TypeError(f"max_concurrent must be an integer, got {limit!r}")
+    return workgroup
+
+
+def _workgroups_from_env(default_region: str, default_output: str) -> List[WorkgroupConfig]:
+    """Parse the ATHENA_WORKGROUPS JSON list."""
+    value = os.getenv("ATHENA_WORKGROUPS")
+    if not value:
+        return []
+
+    try:
+        entries = json.loads(value)
+        if not isinstance(entries, list):
+            raise ValueError("expected a JSON list")
+        workgroups = [
+            _workgroup_from_entry(entry, default_region, default_output) for entry in entries
+        ]
+    except (ValueError, KeyError, TypeError, AttributeError) as e:
+        raise ValueError(
+            "ATHENA_WORKGROUPS must be a JSON list of objects with a 'name' and optional "
+            f"'region', 's3_output_location' and 'max_concurrent'. Got: {value}"
+        ) from e
+
+    for workgroup in workgroups:
+        if not workgroup.s3_output_location.startswith("s3://"):
+            raise ValueError(
+                f"Workgroup {workgroup.name} s3_output_location must start with 's3://'. "
+                f"Got: {workgroup.s3_output_location}"
+            )
+        if workgroup.max_concurrent is not None and workgroup.max_concurrent < 1:
+            raise ValueError(f"Workgroup {workgroup.name} max_concurrent must be at least 1")
+    return workgroups
 
 
 @dataclass
@@ -20,6 +123,26 @@ class Config:
     # Optional settings
     athena_workgroup: Optional[str] = None
     timeout_seconds: int = 60
+    partition_refresh_seconds: int = 300
+    workgroups: List[WorkgroupConfig] = field(default_factory=list)
+    api_max_retries: int = 5
+    result_cache_mb: int = 64
+    prefetch_databases: List[str] = field(default_factory=list)
+    prefetch_refresh_seconds: int = 900
+    prefetch_concurrency: int = 4
+    local_max_rows: int = 100000
+    memory_limit_mb: int = 512
+    spill_mb: int = 1024
+    spill_dir: Optional[str] = None  # A temporary directory by default
+    record_file: Optional[str] = None
+    replay_file: Optional[str] = None
+    replay_speed: Optional[float] = None  # None replays as fast as possible
+    lint_policy: str = "warn"  # One of LINT_POLICIES
+    materialize_database: Optional[str] = None  # Hot subqueries are not materialized if unset
+    materialize_location: Optional[str] = None  # Under the S3 output location by default
+    materialize_min_uses: int = 3
+    materialize_ttl_seconds: int = 3600
+    cpu_chunk_cells: int = 10000
 
     @classmethod
     def from_env(cls) -> "Config":
@@ -57,13 +180,78 @@ class Config:
                 f"ATHENA_TIMEOUT_SECONDS must be a positive integer. Got: {timeout_str}"
             ) from e
 
+        partition_refresh_seconds = _int_from_env("ATHENA_PARTITION_REFRESH_SECONDS", 300, 0)
+        workgroups = _workgroups_from_env(aws_region, s3_output_location)
+        api_max_retries = _int_from_env("ATHENA_API_MAX_RETRIES", 5, 0)
+        result_cache_mb = _int_from_env("ATHENA_RESULT_CACHE_MB", 64, 0)
+        prefetch_databases = _list_from_env("ATHENA_PREFETCH_DATABASES")
+        prefetch_refresh_seconds = _int_from_env("ATHENA_PREFETCH_REFRESH_SECONDS", 900, 0)
+        prefetch_concurrency = _int_from_env("ATHENA_PREFETCH_CONCURRENCY", 4, 1)
+        local_max_rows = _int_from_env("ATHENA_LOCAL_MAX_ROWS", 100000, 1)
+        memory_limit_mb = _int_from_env("ATHENA_MEMORY_LIMIT_MB", 512, 16)
+        spill_mb = _int_from_env("ATHENA_SPILL_MB", 1024, 0)
+        spill_dir = os.getenv("ATHENA_SPILL_DIR") or None
+        record_file = os.getenv("ATHENA_RECORD_FILE") or None
+        replay_file = os.getenv("ATHENA_REPLAY_FILE") or None
+        replay_speed = _float_from_env("ATHENA_REPLAY_SPEED")
+        if record_file and replay_file:
+            raise ValueError("ATHENA_RECORD_FILE and ATHENA_REPLAY_FILE cannot both be set")
+        lint_policy = os.getenv("ATHENA_LINT_POLICY", "warn").lower()
+        if lint_policy not in LINT_POLICIES:
+            raise ValueError(
+                f"ATHENA_LINT_POLICY must be one of: {', '.join(LINT_POLICIES)}. Got: {lint_policy}"
+            )
+
+        materialize_database = os.getenv("ATHENA_MATERIALIZE_DATABASE") or None
+        materialize_location = os.getenv("ATHENA_MATERIALIZE_LOCATION") or None
+        if materialize_location and not materialize_location.startswith("s3://"):
+            raise ValueError(
+                "ATHENA_MATERIALIZE_LOCATION must be an S3 path starting with 's3://'. "
+                f"Got: {materialize_location}"
+            )
+        materialize_min_uses = _int_from_env("ATHENA_MATERIALIZE_MIN_USES", 3, 2)
+        materialize_ttl_seconds = _int_from_env("ATHENA_MATERIALIZE_TTL_SECONDS", 3600, 60)
+        cpu_chunk_cells = _int_from_env("ATHENA_CPU_CHUNK_CELLS", 10000, 100)
+
         return cls(
             s3_output_location=s3_output_location,
             aws_region=aws_region,
             athena_workgroup=athena_workgroup,
             timeout_seconds=timeout_seconds,
+            partition_refresh_seconds=partition_refresh_seconds,
+            workgroups=workgroups,
+            api_max_retries=api_max_retries,
+            result_cache_mb=result_cache_mb,
+            prefetch_databases=prefetch_databases,
+            prefetch_refresh_seconds=prefetch_refresh_seconds,
+            prefetch_concurrency=prefetch_concurrency,
+            local_max_rows=local_max_rows,
+            memory_limit_mb=memory_limit_mb,
+            spill_mb=spill_mb,
+            spill_dir=spill_dir,
+            record_file=record_file,
+            replay_file=replay_file,
+            replay_speed=replay_speed,
+            lint_policy=lint_policy,
+            materialize_database=materialize_database,
+            materialize_location=materialize_location,
+            materialize_min_uses=materialize_min_uses,
+            materialize_ttl_seconds=materialize_ttl_seconds,
+            cpu_chunk_cells=cpu_chunk_cells,
         )
 
+    def workgroup_pool(self) -> List[WorkgroupConfig]:
+        """Workgroups to route queries across (the single configured one by default)."""
+        if self.workgroups:
+            return self.workgroups
+        return [WorkgroupConfig(self.athena_workgroup, self.aws_region, self.s3_output_location)]
+
+    def materialize_prefix(self) -> str:
+        """S3 prefix that materialized subquery tables are written under."""
+        if self.materialize_location:
+            return self.materialize_location.rstrip("/") + "/"
+        return self.s3_output_location.rstrip("/") + "/materialized/"
+
     def validate_aws_credentials(self) -> None:
         """Validate that AWS credentials are available."""
         import boto3
@@ -0,0 +1,106 @@
+"""
+Cooperative CPU work for AWS Athena MCP Server.
+
+Decoding result pages, copying rows out of spill files, sizing and
+serializing large results are CPU-bound and run on the event loop, so one
+large result would stall every other tool call while it is processed. Work on
+more than a chunk of cells is split into chunks of about that size, and the
+event loop runs other tasks between chunks. Smaller work runs inline in one
+step.
+
+Worker processes and threads do not help here: the rows are Python objects
+owned by the event loop's process, so handing them to another process costs
+about as much as processing them, and the C-level encoders hold the GIL for
+their whole call.
+"""
+
+import asyncio
+import json
+import uuid
+from typing import Any, Dict, List, Sequence, Tuple
+
+from .results import decode_rows, row_size
+
+# Cells (rows x columns) processed between yields to the event loop, a few ms of work
+DEFAULT_CHUNK_CELLS = 10000
+
+
+def chunk_rows(columns: int, chunk_cells: int) -> int:
+    """Rows of the given width that make up one chunk."""
+    return max(chunk_cells // max(columns, 1), 1)
+
+
+async def decode_rows_cooperatively(
+    rows_data: Sequence[Dict[str, Any]], columns: List[str], chunk_cells: int
+) -> Tuple[List[Dict[str, Any]], List[int]]:
+    """decode_rows, yielding to the event loop between chunks of rows."""
+    step = chunk_rows(len(columns), chunk_cells)
+    if len(rows_data) <= step:
+        return decode_rows(rows_data, columns)
+
+    rows: List[Dict[str, Any]] = []
+    sizes: List[int] = []
+    for start in range(0, len(rows_data), step):
+        if start:
+            await asyncio.sleep(0)
+        chunk, chunk_sizes = decode_rows(rows_data[start : start + step], columns)
+        rows.extend(chunk)
+        sizes.extend(chunk_sizes)
+    return rows, sizes
+
+
+async def copy_rows_cooperatively(
+    rows: Sequence[Dict[str, Any]], start: int, end: int, columns: int, chunk_cells: int
+) -> List[Dict[str, Any]]:
+    """
+    list(rows[start:end]) for rows of the given width, yielding to the event loop
+    between chunks (spilled rows are decoded as they are read).
+    """
+    step = chunk_rows(columns, chunk_cells)
+    copied: List[Dict[str, Any]] = []
+    for chunk_start in range(start, end, step):
+        if chunk_start > start:
+            await asyncio.sleep(0)
+        copied.extend(rows[chunk_start : min(chunk_start + step, end)])
+    return copied
+
+
+async def size_rows_cooperatively(rows: Sequence[Dict[str, Any]], chunk_cells: int) -> int:
+    """Total row_size of rows, yielding to the event loop between chunks."""
+    step = chunk_rows(len(rows[0]) if rows else 0, chunk_cells)
+    total = 0
+    for start in range(0, len(rows), step):
+        if start:
+            await asyncio.sleep(0)
+        total += sum(row_size(row) for row in rows[start : start + step])
+    return total
+
+
+async def dumps_cooperatively(payload: Dict[str, Any], rows_key: str, chunk_cells: int) -> str:
+    """
+    json.dumps(payload, indent=2), encoding the row list under rows_key a chunk at a
+    time and yielding to the event loop between chunks.
+    """
+    rows: List[Dict[str, Any]] = payload[rows_key]
+    step = chunk_rows(len(rows[0]) if rows else 0, chunk_cells)
+    if len(rows) <= step:
+        return json.dumps(payload, indent=2)
+
+    # Encode everything else around a placeholder, then put the rows in its place
+    placeholder = json.dumps(f"rows-{uuid.uuid4().hex}")
+    outline = json.dumps({**payload, rows_key: json.loads(placeholder)}, indent=2)
+    before, after = outline.split(placeholder, 1)
+
+    parts = [before, "[\n"]
+    for start in range(0, len(rows), step):
+        if start:
+            await asyncio.sleep(0)
+            parts.append(",\n")
+        encoded = json.dumps(rows[start : start + step], indent=2)
+        # Drop the brackets and indent one more level, as a value inside the payload;
+        # encoded strings escape newlines, so every newline is between JSON tokens
+        parts.append("  " + encoded[2:-2].replace("\n", "\n  "))
+    parts.extend(["\n  ]", after])
+    await asyncio.sleep(0)
+    # One copy into the response, the only step that grows with the whole result
+    return "".join(parts)
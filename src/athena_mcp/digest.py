@@ -0,0 +1,80 @@
+"""
+Schema digests for AWS Athena MCP Server.
+
+Condenses many table schemas into one compact description: columns that
+recur across tables are typed once, and tables with identical schemas are
+listed as copies of the first.
+"""
+
+import logging
+from collections import Counter
+from typing import Dict, List, Tuple
+
+from .models import SchemaDigest, TableInfo
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+def _column_key(column: Dict[str, str]) -> Tuple[str, str]:
+    return column["name"], column.get("type", "")
+
+
+def build_schema_digest(database: str, tables: List[TableInfo], missing: List[str]) -> SchemaDigest:
+    """
+    Build a digest of table schemas.
+
+    A column with the same name and type in two or more tables is listed once in
+    `shared_columns` and appears by name only in each table; other columns are
+    written as "name type".
+
+    Args:
+        database: The database the tables belong to
+        tables: Table schemas
+        missing: Requested tables that were not found
+    """
+    tables = sorted(tables, key=lambda table: table.table_name)
+    occurrences = Counter(_column_key(column) for table in tables for column in table.columns)
+    # A name that appears with conflicting types cannot be abbreviated
+    types_per_name = Counter(name for name, _ in occurrences)
+    shared = {
+        name: type_
+        for (name, type_), count in occurrences.items()
+        if count > 1 and types_per_name[name] == 1
+    }
+
+    schemas: Dict[str, Dict[str, str]] = {}
+    first_with_schema: Dict[Tuple[Tuple[str, str], ...], str] = {}
+    for table in tables:
+        signature = tuple(_column_key(column) for column in table.columns) + tuple(
+            ("#partition", key) for key in table.partition_keys
+        )
+        if signature in first_with_schema:
+            schemas[table.table_name] = {"same_as": first_with_schema[signature]}
+            continue
+        first_with_schema[signature] = table.table_name
+
+        partition_keys = set(table.partition_keys)
+        columns: List[str] = []
+        partitions: List[str] = []
+        for column in table.columns:
+            name, type_ = _column_key(column)
+            text = name if shared.get(name) == type_ else f"{name} {type_}".strip()
+            (partitions if name in partition_keys else columns).append(text)
+
+        schema = {"columns": ", ".join(columns)}
+        if partitions:
+            schema["partitioned_by"] = ", ".join(partitions)
+        schemas[table.table_name] = schema
+
+    logger.debug(
+        f"Built digest of {len(tables)} tables in {database} "
+        f"({len(shared)} shared columns, {len(tables) - len(first_with_schema)} duplicates)"
+    )
+    return SchemaDigest(
+        database=database,
+        table_count=len(tables),
+        shared_columns=dict(sorted(shared.items())),
+        tables=schemas,
+        missing=sorted(missing),
+    )
@@ -0,0 +1,264 @@
+"""
+Query fingerprinting for AWS Athena MCP Server.
+
+Normalizes SQL to its shape (literals replaced by `?`, comments dropped,
+whitespace and case folded, IN-lists collapsed) and keeps rolling statistics
+per shape for executions started by this server, to show which query shapes
+drive data scanned and latency, and to predict how long a query will run in
+a workgroup.
+"""
+
+import hashlib
+import logging
+import math
+import re
+import time
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from .models import QueryShapeStats
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+_TOKEN_PATTERN = re.compile(
+    r"""
+    (?P<comment>--[^\n]*|/\*.*?\*/)
+    |(?P<literal>(?:\b(?:date|time|timestamp|decimal|interval)\s+)?'(?:[^']|'')*'
+        |\b\d+(?:\.\d*)?(?:e[+-]?\d+)?\b|\.\d+\b|\?)
+    |(?P<identifier>"(?:[^"]|"")*"|`[^`]*`)
+    |(?P<word>[a-z_][a-z0-9_$]*)
+    |(?P<other>\S)
+    """,
+    re.VERBOSE | re.DOTALL | re.IGNORECASE,
+)
+
+# IN-lists of any length, including a single item
+_IN_LIST_PATTERN = re.compile(r"\bin \(\?(?:, \?)*\)")
+
+# Tokens written without a space before or after them
+_NO_SPACE_BEFORE = {",", ")", ".", ";"}
+_NO_SPACE_AFTER = {"(", "."}
+
+# Words followed by a spaced "(" (any other word before "(" is a function call)
+_SPACED_KEYWORDS = {"and", "as", "exists", "from", "in", "join", "not", "on", "or", "over"}
+_SPACED_KEYWORDS |= {"select", "using", "values", "where", "with"}
+
+ORDERINGS = ("cost", "latency", "count")
+
+
+def normalize_query(sql: str) -> str:
+    """The shape of a query: literals as `?`, lowercase, single-spaced, IN-lists collapsed."""
+    tokens: List[str] = []
+    for match in _TOKEN_PATTERN.finditer(sql):
+        kind = match.lastgroup
+        if kind == "comment":
+            continue
+        if kind == "literal":
+            tokens.append("?")
+        else:
+            tokens.append(match.group(0).lower())
+
+    text = ""
+    previous = ""
+    for token in tokens:
+        call = token == "(" and previous[:1].isalpha() and previous not in _SPACED_KEYWORDS
+        if text and not call and token not in _NO_SPACE_BEFORE and text[-1] not in _NO_SPACE_AFTER:
+            text += " "
+        text += token
+        previous = token
+    return _IN_LIST_PATTERN.sub("in (...)", text.rstrip(";").rstrip())
+
+
+def fingerprint(sql: str) -> str:
+    """Short stable identifier of a query's shape."""
+    return hashlib.sha1(normalize_query(sql).encode("utf-8")).hexdigest()[:16]
+
+
+def _percentile(samples: List[int], fraction: float) -> int:
+    """Nearest-rank percentile of non-empty samples."""
+    ordered = sorted(samples)
+    return ordered[max(math.ceil(fraction * len(ordered)) - 1, 0)]
+
+
+class RuntimePrediction:
+    """Expected runtime of a query shape in a workgroup, from recent successful runs."""
+
+    def __init__(self, samples: List[int]):
+        self.samples = len(samples)
+        self.median_ms = _percentile(samples, 0.5)
+        self.p95_ms = _percentile(samples, 0.95)
+
+
+class ShapeStats:
+    """Rolling statistics of one query shape."""
+
+    # Latency samples kept per shape for the p95
+    MAX_SAMPLES = 200
+
+    def __init__(self, query: str):
+        self.query = query
+        self.executions = 0
+        self.failed = 0
+        self.reused = 0
+        self.bytes_scanned = 0
+        self.total_execution_ms = 0
+        self.latencies_ms: Deque[int] = deque(maxlen=self.MAX_SAMPLES)
+        self.last_seen = 0.0
+
+    def record(self, succeeded: bool, bytes_scanned: int, execution_ms: int, reused: bool) -> None:
+        """Add one finished execution."""
+        self.executions += 1
+        self.failed += 0 if succeeded else 1
+        self.reused += 1 if reused else 0
+        self.bytes_scanned += bytes_scanned
+        self.total_execution_ms += execution_ms
+        self.latencies_ms.append(execution_ms)
+        self.last_seen = time.time()
+
+    def p95_ms(self) -> int:
+        """95th percentile latency of recent executions (nearest rank)."""
+        if not self.latencies_ms:
+            return 0
+        return _percentile(list(self.latencies_ms), 0.95)
+
+
+class PendingExecution:
+    """An execution started here that has not reached a terminal state."""
+
+    def __init__(self, query: str, workgroup: str):
+        self.query = query
+        self.workgroup = workgroup
+        self.started_at = time.time()
+
+
+class QueryStatsTracker:
+    """Per-shape statistics, bounded to the most recently seen shapes."""
+
+    # Successful runtimes kept per shape and workgroup, and the fewest that predict one
+    MAX_RUNTIME_SAMPLES = 50
+    MIN_RUNTIME_SAMPLES = 3
+
+    def __init__(self, max_shapes: int = 500, max_pending: int = 10000):
+        self.max_shapes = max_shapes
+        self.max_pending = max_pending
+        self._shapes: "OrderedDict[str, ShapeStats]" = OrderedDict()
+        self._pending: "OrderedDict[str, PendingExecution]" = OrderedDict()
+        # (fingerprint, workgroup) -> recent successful runtimes
+        self._runtimes: "OrderedDict[Tuple[str, str], Deque[int]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._shapes)
+
+    def started(self, execution_id: str, query: str, workgroup: str = "primary") -> str:
+        """Remember the query of an execution until it finishes. Returns its fingerprint."""
+        self._pending[execution_id] = PendingExecution(query, workgroup)
+        while len(self._pending) > self.max_pending:
+            self._pending.popitem(last=False)
+        return fingerprint(query)
+
+    def predict(self, query: str, workgroup: str = "primary") -> Optional[RuntimePrediction]:
+        """Expected runtime of a query in a workgroup, or None without enough history."""
+        samples = self._runtimes.get((fingerprint(query), workgroup))
+        if samples is None or len(samples) < self.MIN_RUNTIME_SAMPLES:
+            return None
+        return RuntimePrediction(list(samples))
+
+    def eta(self, execution_id: str) -> Optional[Dict[str, float]]:
+        """
+        Expected total and remaining runtime of a pending execution, in seconds, or
+        None if it is unknown or its shape has no history in its workgroup.
+        """
+        pending = self._pending.get(execution_id)
+        if pending is None:
+            return None
+        prediction = self.predict(pending.query, pending.workgroup)
+        if prediction is None:
+            return None
+        elapsed = time.time() - pending.started_at
+        return {
+            "expected_runtime_seconds": round(prediction.median_ms / 1000, 1),
+            "eta_seconds": round(max(prediction.median_ms / 1000 - elapsed, 0), 1),
+            "p95_remaining_seconds": round(max(prediction.p95_ms / 1000 - elapsed, 0), 1),
+        }
+
+    def finished(self, execution_id: str, state: str, statistics: Dict[str, Any]) -> None:
+        """Record an execution reaching a terminal state (idempotent)."""
+        pending = self._pending.pop(execution_id, None)
+        if pending is None:
+            return
+
+        query = pending.query
+        key = fingerprint(query)
+        shape = self._shapes.get(key)
+        if shape is None:
+            shape = self._shapes[key] = ShapeStats(normalize_query(query))
+            while len(self._shapes) > self.max_shapes:
+                self._shapes.popitem(last=False)
+        self._shapes.move_to_end(key)
+
+        execution_ms = statistics.get(
+            "TotalExecutionTimeInMillis", statistics.get("EngineExecutionTimeInMillis", 0)
+        )
+        shape.record(
+            succeeded=state == "SUCCEEDED",
+            bytes_scanned=statistics.get("DataScannedInBytes", 0),
+            execution_ms=execution_ms,
+            reused=statistics.get("ResultReuseInformation", {}).get("ReusedPreviousResult", False),
+        )
+
+        if state == "SUCCEEDED":
+            runtime_key = (key, pending.workgroup)
+            samples = self._runtimes.get(runtime_key)
+            if samples is None:
+                samples = self._runtimes[runtime_key] = deque(maxlen=self.MAX_RUNTIME_SAMPLES)
+                while len(self._runtimes) > self.max_shapes:
+                    self._runtimes.popitem(last=False)
+            self._runtimes.move_to_end(runtime_key)
+            samples.append(execution_ms)
+        logger.debug(f"Recorded execution {execution_id} for query shape {key}")
+
+    def top(self, limit: int = 10, order_by: str = "cost") -> List[QueryShapeStats]:
+        """
+        The heaviest query shapes.
+
+        Args:
+            limit: Maximum number of shapes to return
+            order_by: "cost" (total bytes scanned), "latency" (p95) or "count" (executions)
+
+        Raises:
+            ValueError: If order_by is not a known ordering
+        """
+        if order_by not in ORDERINGS:
+            raise ValueError(f"order_by must be one of: {', '.join(ORDERINGS)}")
+
+        summaries = [self._summary(key, shape) for key, shape in self._shapes.items()]
+        sort_key = {
+            "cost": lambda stats: stats.bytes_scanned,
+            "latency": lambda stats: stats.p95_execution_ms,
+            "count": lambda stats: stats.executions,
+        }[order_by]
+        summaries.sort(key=lambda stats: (-sort_key(stats), stats.fingerprint))
+        return summaries[:limit]
+
+    @staticmethod
+    def _summary(key: str, shape: ShapeStats) -> QueryShapeStats:
+        return QueryShapeStats(
+            fingerprint=key,
+            query=shape.query,
+            executions=shape.executions,
+            failed=shape.failed,
+            bytes_scanned=shape.bytes_scanned,
+            mean_bytes_scanned=shape.bytes_scanned // shape.executions,
+            total_execution_ms=shape.total_execution_ms,
+            mean_execution_ms=shape.total_execution_ms // shape.executions,
+            p95_execution_ms=shape.p95_ms(),
+            reuse_hit_rate=round(shape.reused / shape.executions, 3),
+            last_seen=shape.last_seen,
+        )
+
+    def shape(self, query: str) -> Optional[QueryShapeStats]:
+        """Statistics of a query's shape, or None if no execution of it has finished here."""
+        key = fingerprint(query)
+        shape = self._shapes.get(key)
+        return self._summary(key, shape) if shape is not None else None
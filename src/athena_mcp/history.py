@@ -0,0 +1,206 @@
+"""
+Query history for AWS Athena MCP Server.
+
+Lists recent executions of a workgroup with paginated ListQueryExecutions and
+BatchGetQueryExecution calls, caching executions that already finished.
+"""
+
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from .cache import LRUCache
+from .models import QueryExecutionSummary, QueryHistory, QueryState
+from .results import decode_cursor, encode_cursor
+from .throttle import ApiRateLimiter
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 50  # BatchGetQueryExecution limit
+MAX_QUERY_TEXT = 500
+TERMINAL_STATES = {QueryState.SUCCEEDED, QueryState.FAILED, QueryState.CANCELLED}
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parse an ISO 8601 timestamp, assuming UTC when no offset is given."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError as e:
+        raise ValueError(f"Invalid ISO 8601 timestamp: {value}") from e
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+class HistoryFilter:
+    """Filters applied to query history entries."""
+
+    def __init__(
+        self,
+        state: Optional[str] = None,
+        database: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        min_bytes_scanned: int = 0,
+    ):
+        self.state = QueryState(state.upper()) if state else None
+        self.database = database
+        self.since = parse_timestamp(since)
+        self.until = parse_timestamp(until)
+        self.min_bytes_scanned = min_bytes_scanned
+
+    def matches(self, execution: Dict[str, Any]) -> bool:
+        """True if the raw QueryExecution passes every filter."""
+        if self.state and execution.get("Status", {}).get("State") != self.state:
+            return False
+        database = execution.get("QueryExecutionContext", {}).get("Database")
+        if self.database and database != self.database:
+            return False
+        if execution.get("Statistics", {}).get("DataScannedInBytes", 0) < self.min_bytes_scanned:
+            return False
+        submitted = execution.get("Status", {}).get("SubmissionDateTime")
+        if submitted is not None:
+            if self.since and submitted < self.since:
+                return False
+            if self.until and submitted > self.until:
+                return False
+        return True
+
+    def is_older_than_window(self, execution: Dict[str, Any]) -> bool:
+        """True if the execution was submitted before the window starts."""
+        submitted = execution.get("Status", {}).get("SubmissionDateTime")
+        return bool(self.since and submitted is not None and submitted < self.since)
+
+
+def summarize_execution(execution: Dict[str, Any]) -> QueryExecutionSummary:
+    """Compact summary of a raw QueryExecution."""
+    status = execution.get("Status", {})
+    statistics = execution.get("Statistics", {})
+    submitted = status.get("SubmissionDateTime")
+    completed = status.get("CompletionDateTime")
+    query = execution.get("Query", "")
+
+    return QueryExecutionSummary(
+        query_execution_id=execution.get("QueryExecutionId", ""),
+        query=query if len(query) <= MAX_QUERY_TEXT else query[:MAX_QUERY_TEXT] + "...",
+        database=execution.get("QueryExecutionContext", {}).get("Database"),
+        workgroup=execution.get("WorkGroup"),
+        state=status.get("State", "UNKNOWN"),
+        submitted_at=submitted.isoformat() if submitted else None,
+        completed_at=completed.isoformat() if completed else None,
+        bytes_scanned=statistics.get("DataScannedInBytes", 0),
+        execution_time_ms=statistics.get("EngineExecutionTimeInMillis", 0),
+        output_location=execution.get("ResultConfiguration", {}).get("OutputLocation"),
+    )
+
+
+class ExecutionHistory:
+    """Paginated execution lookups with a cache of finished executions."""
+
+    def __init__(self, api: ApiRateLimiter, max_cached: int = 5000):
+        self.api = api
+        self.finished: LRUCache[str, Dict[str, Any]] = LRUCache(max_cached)
+
+    async def get_executions(self, client: Any, execution_ids: List[str]) -> List[Dict[str, Any]]:
+        """Fetch executions by ID, serving finished ones from cache. Preserves order."""
+        found: Dict[str, Dict[str, Any]] = {}
+        missing = []
+        for execution_id in execution_ids:
+            cached = self.finished.get(execution_id)
+            if cached is not None:
+                found[execution_id] = cached
+            else:
+                missing.append(execution_id)
+
+        for start in range(0, len(missing), BATCH_SIZE):
+            response = await self.api.call(
+                client,
+                "batch_get_query_execution",
+                QueryExecutionIds=missing[start : start + BATCH_SIZE],
+            )
+            for execution in response.get("QueryExecutions", []):
+                execution_id = execution.get("QueryExecutionId", "")
+                found[execution_id] = execution
+                if execution.get("Status", {}).get("State") in TERMINAL_STATES:
+                    self.finished.put(execution_id, execution)
+
+        return [found[execution_id] for execution_id in execution_ids if execution_id in found]
+
+    async def search(
+        self,
+        client: Any,
+        workgroup: Optional[str],
+        history_filter: HistoryFilter,
+        limit: int = 20,
+        max_scanned: int = 500,
+        next_token: Optional[str] = None,
+    ) -> QueryHistory:
+        """
+        Scan executions newest first until `limit` matches or `max_scanned` are examined.
+
+        The returned next_token resumes right after the last execution examined, which
+        may be partway through a ListQueryExecutions page.
+
+        Raises:
+            ValueError: If next_token was not returned by an earlier search
+        """
+        matches: List[QueryExecutionSummary] = []
+        scanned = 0
+        page_token: Optional[str] = None
+        offset = 0
+        if next_token:
+            try:
+                page_token, offset = decode_cursor(next_token)
+            except ValueError as e:
+                raise ValueError("Invalid query history token") from e
+
+        resume: Optional[str] = None
+        while len(matches) < limit and scanned < max_scanned:
+            resume = None
+            params: Dict[str, Any] = {"MaxResults": BATCH_SIZE}
+            if workgroup:
+                params["WorkGroup"] = workgroup
+            if page_token:
+                params["NextToken"] = page_token
+
+            response = await self.api.call(client, "list_query_executions", **params)
+            execution_ids = response.get("QueryExecutionIds", [])
+            following = response.get("NextToken")
+
+            executions = await self.get_executions(client, execution_ids[offset:])
+            by_id = {execution.get("QueryExecutionId", ""): execution for execution in executions}
+
+            reached_window_start = False
+            position = offset
+            while position < len(execution_ids) and len(matches) < limit:
+                execution = by_id.get(execution_ids[position])
+                position += 1
+                scanned += 1
+                if execution is None:
+                    continue
+                if history_filter.is_older_than_window(execution):
+                    reached_window_start = True
+                    continue
+                if history_filter.matches(execution):
+                    matches.append(summarize_execution(execution))
+
+            # Executions are listed newest first, so older pages cannot match
+            if reached_window_start:
+                break
+            if position < len(execution_ids):
+                # Limit reached partway through the page; resume within it
+                resume = encode_cursor(page_token, position)
+                break
+            if not following:
+                break
+            page_token, offset = following, 0
+            resume = encode_cursor(page_token, offset)
+
+        logger.info(
+            f"Query history for workgroup {workgroup}: {len(matches)} matches "
+            f"from {scanned} executions ({self.finished.hits} cache hits)"
+        )
+        return QueryHistory(
+            workgroup=workgroup, executions=matches, scanned=scanned, next_token=resume
+        )
@@ -0,0 +1,186 @@
+"""
+Incremental aggregate queries for AWS Athena MCP Server.
+
+A query that reads one partitioned table and groups by one of its partition
+keys produces every output row from a single value of that key, so its result
+can be kept per key value. Later runs of the same query reuse the rows of key
+values whose partitions are unchanged in the catalog, run Athena only over new
+or changed ones (plus the newest, which may still be receiving files), and
+merge the two locally.
+
+Changes are detected from catalog partition metadata, so files added to a
+partition without touching its catalog entry are only picked up for the
+newest value.
+"""
+
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .partitions import NUMERIC_KEY_TYPES, PartitionIndex
+from .results import row_size
+from .rewrite import VOLATILE_FUNCTIONS, tokenize
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Runs over more changed key values than this scan the whole query again
+MAX_DELTA_PARTITIONS = 500
+
+# Outer-level keywords that combine rows across key values
+_CROSS_PARTITION_KEYWORDS = {"union", "intersect", "except", "over", "limit", "offset", "fetch"}
+
+# GROUP BY forms that add rows aggregated across key values
+_GROUPING_EXTENSIONS = {"rollup", "cube", "grouping"}
+
+# Keywords that end a GROUP BY or ORDER BY clause
+_CLAUSE_ENDS = {"having", "order", "window", "limit", "offset", "fetch", ";"}
+
+
+def _name(text: str) -> str:
+    return text.strip('"`').lower()
+
+
+def check_incremental_query(query: str, key: str) -> bool:
+    """
+    Check that a query's result can be assembled per value of a partition key.
+
+    Returns:
+        True if the query orders its result by the key descending, False otherwise
+
+    Raises:
+        ValueError: If output rows may combine key values, or the result depends on
+            when the query runs
+    """
+    key = key.lower()
+    depth = 0
+    clause: Optional[str] = None
+    clauses: Dict[str, List[str]] = {}
+    previous = ""
+    for text, _, _ in tokenize(query):
+        lower = _name(text) if not text.startswith("'") else text
+        if lower in VOLATILE_FUNCTIONS:
+            raise ValueError(f"Incremental queries cannot use {lower}; use literal bounds instead")
+        if text == "(":
+            depth += 1
+        elif text == ")":
+            depth -= 1
+        elif depth == 0:
+            if lower in _CROSS_PARTITION_KEYWORDS:
+                raise ValueError(f"Incremental queries cannot use {lower.upper()}")
+            if lower == "by" and previous in ("group", "order"):
+                clause = previous
+                clauses[clause] = []
+            elif lower in _CLAUSE_ENDS:
+                clause = None
+            elif clause is not None:
+                clauses[clause].append(lower)
+        previous = lower
+
+    group_by = clauses.get("group", [])
+    if _GROUPING_EXTENSIONS.intersection(group_by):
+        raise ValueError("Incremental queries cannot use ROLLUP, CUBE or GROUPING SETS")
+    if key not in group_by:
+        raise ValueError(f"Incremental queries must GROUP BY the partition key {key} by name")
+
+    order_by = clauses.get("order")
+    if order_by is None:
+        return False
+    if len(order_by) >= 3 and order_by[1] == ".":
+        order_by = order_by[2:]
+    if order_by in ([key], [key, "asc"]):
+        return False
+    if order_by == [key, "desc"]:
+        return True
+    raise ValueError(f"Incremental queries can only ORDER BY the partition key {key}")
+
+
+def normalize_value(value: str, key_type: str) -> str:
+    """A key value as both the catalog and query results write it."""
+    if key_type.lower() in NUMERIC_KEY_TYPES:
+        try:
+            return str(int(value))
+        except ValueError:
+            pass
+    return value
+
+
+def key_versions(index: PartitionIndex, position: int) -> Dict[str, str]:
+    """
+    Version of each value of the partition key at position, which changes when any
+    partition with that value is added, rewritten, moved or dropped.
+    """
+    key_type = index.keys[position]["type"]
+    markers: Dict[str, List[str]] = {}
+    for values, entry in index.partitions.items():
+        value = normalize_value(values[position], key_type)
+        markers.setdefault(value, []).append(f"{entry['location']}@{entry['version']}")
+    return {value: "|".join(sorted(marker)) for value, marker in markers.items()}
+
+
+class PendingRun:
+    """An Athena run for an incremental query that had not finished when last waited on."""
+
+    def __init__(self, execution_id: str, versions: Dict[str, str], full: bool):
+        self.execution_id = execution_id
+        self.versions = versions  # Key values it covers, at the versions it read
+        self.full = full
+
+
+class IncrementalAggregate:
+    """Result rows of one incremental query, by partition key value."""
+
+    def __init__(self) -> None:
+        self.columns: List[str] = []
+        self.column_types: Dict[str, str] = {}
+        self.partitions: Dict[str, Tuple[str, List[Dict[str, Any]]]] = {}  # value -> version, rows
+        self.pending: Optional[PendingRun] = None
+        self.size = 500
+
+    def stale(self, versions: Dict[str, str], newest: Optional[str]) -> List[str]:
+        """Key values that are new or changed since cached, plus the newest one."""
+        stale = [
+            value
+            for value, version in versions.items()
+            if value not in self.partitions or self.partitions[value][0] != version
+        ]
+        if newest is not None and newest not in stale:
+            stale.append(newest)
+        return stale
+
+    def prune(self, versions: Dict[str, str]) -> None:
+        """Forget key values that no longer have partitions."""
+        for value in [value for value in self.partitions if value not in versions]:
+            del self.partitions[value]
+
+    def merge(
+        self,
+        columns: List[str],
+        column_types: Dict[str, str],
+        rows: List[Dict[str, Any]],
+        versions: Dict[str, str],
+        key_column: str,
+        key_type: str,
+    ) -> None:
+        """Replace the rows of the key values a run covered with the run's rows."""
+        if columns != self.columns:
+            self.partitions = {}
+            self.columns = columns
+            self.column_types = column_types
+
+        by_value: Dict[str, List[Dict[str, Any]]] = {value: [] for value in versions}
+        for row in rows:
+            value = row.get(key_column)
+            if value is not None:
+                by_value.get(normalize_value(str(value), key_type), []).append(row)
+        for value, version in versions.items():
+            self.partitions[value] = (version, by_value[value])
+
+        self.size = 500 + sum(
+            len(value) + 100 + sum(2 * row_size(row) for row in partition_rows)
+            for value, (_, partition_rows) in self.partitions.items()
+        )
+
+    def rows(self, descending: bool, sort_value: Callable[[str], Any]) -> List[Dict[str, Any]]:
+        """All cached rows, ordered by key value."""
+        values = sorted(self.partitions, key=sort_value, reverse=descending)
+        return [row for value in values for row in self.partitions[value][1]]
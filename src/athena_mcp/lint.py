@@ -0,0 +1,321 @@
+"""
+Cost linting for AWS Athena MCP Server.
+
+Checks SELECT queries against table schemas and partition keys for the two
+most expensive mistakes: `SELECT *` on wide tables, which reads every column
+of columnar data, and no predicate on a partitioned table's partition keys,
+which scans every partition. Findings can be reported, block the query, or
+be rewritten away where a mechanical fix exists.
+"""
+
+import logging
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+from botocore.exceptions import ClientError
+
+from .cache import LRUCache
+from .catalog import SchemaCatalog
+from .models import LintFinding, LintPolicy, LintReport, TableInfo
+from .partitions import PartitionCatalog, PartitionIndex, partition_literal
+from .rewrite import TableReference, is_select, table_references, tokenize
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Tables with at least this many stored columns are worth naming columns for
+WIDE_TABLE_COLUMNS = 20
+
+# Described table schemas are used for linting for this long
+SCHEMA_TTL_SECONDS = 300
+
+# Keywords that end a WHERE or ON clause
+_CLAUSE_KEYWORDS = {
+    "select",
+    "from",
+    "join",
+    "group",
+    "order",
+    "limit",
+    "having",
+    "window",
+    "union",
+    "intersect",
+    "except",
+    "offset",
+    "fetch",
+}
+
+# Tokens that can precede a projection `*` (as opposed to multiplication or count(*))
+_STAR_PREFIXES = {"select", "distinct", "all", ",", "."}
+
+
+def _is_word(text: str) -> bool:
+    return text[:1].isalpha() or text[:1] in '_"`'
+
+
+def predicate_columns(query: str) -> Set[str]:
+    """Lowercase names used anywhere in WHERE or ON clauses, at any depth."""
+    names: Set[str] = set()
+    in_predicate = [False]
+    for text, _, _ in tokenize(query):
+        lower = text.lower()
+        if text == "(":
+            in_predicate.append(in_predicate[-1])
+        elif text == ")":
+            if len(in_predicate) > 1:
+                in_predicate.pop()
+        elif lower in ("where", "on"):
+            in_predicate[-1] = True
+        elif lower in _CLAUSE_KEYWORDS:
+            in_predicate[-1] = False
+        elif in_predicate[-1] and _is_word(text):
+            names.add(text.strip('"`').lower())
+    return names
+
+
+def has_outer_star(query: str) -> bool:
+    """
+    Return True if the outermost SELECT list contains `*` or `alias.*`.
+
+    Stars inside subqueries and CTEs are not counted: Athena prunes the columns
+    an outer query does not use, so only the final projection decides what is read.
+    """
+    depth = 0
+    previous = ""
+    for text, _, _ in tokenize(query):
+        if text == "(":
+            depth += 1
+        elif text == ")":
+            depth -= 1
+        elif text == "*" and depth == 0 and previous.lower() in _STAR_PREFIXES:
+            return True
+        previous = text
+    return False
+
+
+def add_partition_filter(
+    query: str, reference: TableReference, column: str, literal: str
+) -> Optional[str]:
+    """
+    Add `column = literal` to the WHERE clause of the query level reading a table.
+
+    Returns:
+        The rewritten query, or None if the table shares its FROM clause with others
+    """
+    return add_predicate(query, reference, f'"{column}" = {literal}')
+
+
+def add_predicate(query: str, reference: TableReference, predicate: str) -> Optional[str]:
+    """
+    AND a predicate into the WHERE clause of the query level reading a table.
+
+    Returns:
+        The rewritten query, or None if the table shares its FROM clause with others
+    """
+    where_end: Optional[int] = None
+    clause_end = len(query)
+    depth = 0
+    for text, start, end in tokenize(query):
+        if start < reference.end:
+            continue
+        lower = text.lower()
+        if text == "(":
+            depth += 1
+            continue
+        if text == ")":
+            if depth == 0:
+                clause_end = start
+                break
+            depth -= 1
+            continue
+        if depth:
+            continue
+        if where_end is None and lower in ("join", ","):
+            return None
+        if lower == "where" and where_end is None:
+            where_end = end
+        elif lower in _CLAUSE_KEYWORDS or text == ";":
+            clause_end = start
+            break
+
+    if where_end is None:
+        return f"{query[: reference.end]} WHERE {predicate}{query[reference.end :]}"
+    condition = query[where_end:clause_end].strip()
+    tail = query[clause_end:]
+    return f"{query[:where_end]} {predicate} AND ({condition})" + (f" {tail}" if tail else "")
+
+
+def _combined_percent(fractions: List[float]) -> float:
+    """Savings of several independent reductions of one table's scan, as a percentage."""
+    remaining = 1.0
+    for fraction in fractions:
+        remaining *= 1 - fraction
+    return round(100 * (1 - remaining), 1)
+
+
+class QueryLinter:
+    """Cost lint of queries against cached table schemas and partition indexes."""
+
+    def __init__(
+        self,
+        catalog: SchemaCatalog,
+        partitions: PartitionCatalog,
+        wide_columns: int = WIDE_TABLE_COLUMNS,
+    ):
+        self.catalog = catalog
+        self.partitions = partitions
+        self.wide_columns = wide_columns
+        # Schemas seen through describe_table, for databases that are not prefetched
+        self._schemas: LRUCache[Tuple[str, str], Tuple[float, TableInfo]] = LRUCache(
+            max_entries=2000
+        )
+
+    def remember(self, table: TableInfo) -> None:
+        """Keep a described table's schema for linting later queries."""
+        key = (table.database.lower(), table.table_name.lower())
+        self._schemas.put(key, (time.time(), table))
+
+    def table(self, database: str, table_name: str) -> Optional[TableInfo]:
+        """A cached schema (prefetched or recently described), or None."""
+        prefetched = self.catalog.get_table(database, table_name)
+        if prefetched is not None:
+            return prefetched
+        cached = self._schemas.get((database, table_name))
+        if cached is None or time.time() - cached[0] >= SCHEMA_TTL_SECONDS:
+            return None
+        return cached[1]
+
+    async def lint(
+        self, query: str, database: str, policy: LintPolicy
+    ) -> Tuple[Optional[LintReport], str]:
+        """
+        Lint a query. Tables without a cached schema are not checked, so linting
+        never calls AWS, except that REWRITE loads the partition index it needs.
+
+        Args:
+            query: SQL as submitted
+            database: Database unqualified table names resolve in
+            policy: What the caller will do with findings; REWRITE restricts a lone
+                partitioned table without a partition predicate to its newest partition,
+                which changes the result
+
+        Returns:
+            The report (None without findings) and the query to run
+        """
+        if policy == LintPolicy.OFF or not is_select(query):
+            return None, query
+
+        references = table_references(query)
+        findings: List[LintFinding] = []
+        fractions: Dict[str, List[float]] = {}
+        rewritten = query
+        filtered = predicate_columns(query)
+        words = {text.strip('"`').lower() for text, _, _ in tokenize(query) if _is_word(text)}
+        star = has_outer_star(query)
+
+        for reference in references:
+            table = self.table(reference.database or database.lower(), reference.table)
+            if table is None:
+                continue
+            name = f"{table.database}.{table.table_name}"
+            partition_keys = {key.lower() for key in table.partition_keys}
+            stored = [
+                column["name"].lower()
+                for column in table.columns
+                if column["name"].lower() not in partition_keys
+            ]
+
+            if star and reference.depth == 0 and len(stored) >= self.wide_columns:
+                named = len(words.intersection(stored))
+                fraction = 1 - max(named, 1) / len(stored)
+                fractions.setdefault(name, []).append(fraction)
+                findings.append(
+                    LintFinding(
+                        rule="select_star",
+                        table=name,
+                        message=(
+                            f"SELECT * reads all {len(stored)} columns of {name}; "
+                            + (
+                                f"the query names only {named} of them"
+                                if named
+                                else "name only the columns needed"
+                            )
+                        ),
+                        estimated_savings_percent=round(100 * fraction, 1),
+                    )
+                )
+
+            if partition_keys and not partition_keys & filtered:
+                finding, fixed_query = await self._partition_finding(
+                    rewritten, references, reference, table, policy, fractions
+                )
+                findings.append(finding)
+                rewritten = fixed_query or rewritten
+
+        if not findings:
+            return None, query
+
+        report = LintReport(policy=policy, findings=findings)
+        if len(fractions) == 1 and len({reference.table for reference in references}) == 1:
+            report.estimated_savings_percent = _combined_percent(next(iter(fractions.values())))
+        logger.info(f"Cost lint found {len(findings)} issues ({policy.value} policy)")
+        return report, rewritten
+
+    async def _partition_finding(
+        self,
+        query: str,
+        references: List[TableReference],
+        reference: TableReference,
+        table: TableInfo,
+        policy: LintPolicy,
+        fractions: Dict[str, List[float]],
+    ) -> Tuple[LintFinding, Optional[str]]:
+        """
+        Finding for a partitioned table read without a partition predicate, and the
+        query restricted to its newest partition if fixed.
+        """
+        name = f"{table.database}.{table.table_name}"
+        keys = ", ".join(table.partition_keys)
+        finding = LintFinding(
+            rule="missing_partition_filter",
+            table=name,
+            message=f"No predicate on partition keys ({keys}) of {name}; every partition is scanned",
+        )
+
+        # Partition counts are only known for indexes already loaded, unless fixing
+        rewrite = policy == LintPolicy.REWRITE and len(references) == 1 and not reference.sampled
+        index: Optional[PartitionIndex]
+        if rewrite:
+            try:
+                index = await self.partitions.get_index(table.database, table.table_name)
+            except ClientError as e:
+                logger.warning(f"Could not load partitions of {name}: {e}")
+                index = None
+        else:
+            index = self.partitions.cached_index(table.database, table.table_name)
+
+        if index is None or not index.partitions:
+            return finding, None
+        count = len(index.partitions)
+        fraction = 1 - 1 / count
+        fractions.setdefault(name, []).append(fraction)
+        finding.message = (
+            f"No predicate on partition keys ({keys}) of {name}; all {count} partitions are scanned"
+        )
+        finding.estimated_savings_percent = round(100 * fraction, 1)
+
+        newest = index.newest_value()
+        if not rewrite or newest is None:
+            return finding, None
+        key = index.keys[0]
+        fixed = add_partition_filter(
+            query, reference, key["name"], partition_literal(newest, key["type"])
+        )
+        if fixed is not None:
+            finding.fixed = True
+            finding.message += (
+                f" (restricted to the newest partition, {key['name']} = {newest}; "
+                "results cover that partition only)"
+            )
+        return finding, fixed
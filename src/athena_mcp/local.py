@@ -0,0 +1,213 @@
+"""
+Local follow-up queries for AWS Athena MCP Server.
+
+Keeps recent query results as tables in an in-memory SQLite database, named
+by execution ID, so slices, re-sorts, aggregates and joins of earlier results
+run in-process instead of going back to Athena. Loads and queries run in
+worker threads, one at a time, so large inserts and slow queries do not stall
+the event loop.
+"""
+
+import asyncio
+import logging
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, List, Tuple
+
+from .models import LocalQueryResult, QueryResult
+from .results import row_size
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+EXECUTION_ID_PATTERN = re.compile(
+    r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", re.IGNORECASE
+)
+
+# Athena type prefixes mapped to SQLite column affinities
+INTEGER_TYPES = ("tinyint", "smallint", "int", "integer", "bigint")
+REAL_TYPES = ("float", "real", "double", "decimal")
+
+# Statement actions a follow-up query may perform: read tables and call functions
+ALLOWED_ACTIONS = {sqlite3.SQLITE_SELECT, sqlite3.SQLITE_READ, sqlite3.SQLITE_FUNCTION}
+ALLOWED_ACTIONS.add(getattr(sqlite3, "SQLITE_RECURSIVE", 33))
+
+
+def _affinity(athena_type: str) -> str:
+    """SQLite column type for an Athena result column type."""
+    athena_type = athena_type.lower()
+    if athena_type.startswith(INTEGER_TYPES):
+        return "INTEGER"
+    if athena_type.startswith(REAL_TYPES):
+        return "REAL"
+    return "TEXT"
+
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _authorize(action: int, *args: Any) -> int:
+    return sqlite3.SQLITE_OK if action in ALLOWED_ACTIONS else sqlite3.SQLITE_DENY
+
+
+class LocalTable:
+    """A result loaded into the local database."""
+
+    def __init__(
+        self,
+        query_execution_id: str,
+        columns: List[str],
+        row_count: int,
+        partial: bool,
+        size: int,
+    ):
+        self.query_execution_id = query_execution_id
+        self.columns = columns
+        self.row_count = row_count
+        self.partial = partial
+        self.size = size
+
+
+class LocalEngine:
+    """In-memory SQLite tables of recent results, evicted least recently used first."""
+
+    def __init__(self, max_tables: int = 20, timeout_seconds: float = 10.0):
+        self.max_tables = max_tables
+        self.timeout_seconds = timeout_seconds
+        # Used from worker threads, one statement batch at a time under the lock
+        self._connection = sqlite3.connect(":memory:", check_same_thread=False)
+        self._lock = threading.Lock()
+        self._tables: "OrderedDict[str, LocalTable]" = OrderedDict()
+
+    def __contains__(self, query_execution_id: str) -> bool:
+        return query_execution_id.lower() in self._tables
+
+    @staticmethod
+    def referenced_ids(sql: str) -> List[str]:
+        """Execution IDs used as table names in a query, in order of appearance."""
+        ids: List[str] = []
+        for match in EXECUTION_ID_PATTERN.finditer(sql):
+            execution_id = match.group(0).lower()
+            if execution_id not in ids:
+                ids.append(execution_id)
+        return ids
+
+    def tables(self) -> List[LocalTable]:
+        """Loaded tables, most recently used last."""
+        return list(self._tables.values())
+
+    async def load(self, result: QueryResult) -> LocalTable:
+        """Load a result as a table named by its execution ID, replacing any older copy."""
+        execution_id = result.query_execution_id.lower()
+        self._tables.pop(execution_id, None)
+        dropped = [execution_id]
+        while len(self._tables) >= self.max_tables:
+            dropped.append(self._tables.popitem(last=False)[0])
+
+        size = await asyncio.to_thread(self._create_table, execution_id, result, dropped)
+        table = LocalTable(execution_id, result.columns, len(result.rows), result.truncated, size)
+        self._tables[execution_id] = table
+
+        logger.info(f"Loaded {table.row_count} rows of {execution_id} into the local engine")
+        return table
+
+    def _create_table(self, execution_id: str, result: QueryResult, dropped: List[str]) -> int:
+        """Create and fill a result's table; returns the rows' serialized size."""
+        columns = ", ".join(
+            f"{_quote(column)} {_affinity(result.column_types.get(column, ''))}"
+            for column in result.columns
+        )
+        placeholders = ", ".join("?" for _ in result.columns)
+        with self._lock, self._connection:
+            for name in dropped:
+                self._connection.execute(f"DROP TABLE IF EXISTS {_quote(name)}")
+            self._connection.execute(f"CREATE TABLE {_quote(execution_id)} ({columns})")
+            if result.columns:
+                self._connection.executemany(
+                    f"INSERT INTO {_quote(execution_id)} VALUES ({placeholders})",
+                    ([row.get(column) for column in result.columns] for row in result.rows),
+                )
+        # Sized here too, so the event loop does not take a pass over every row
+        return sum(row_size(row) for row in result.rows)
+
+    @property
+    def bytes(self) -> int:
+        """Approximate memory held by loaded tables."""
+        return sum(table.size for table in self._tables.values())
+
+    def evict_bytes(self, size: int) -> int:
+        """
+        Drop least recently used tables until at least size bytes are freed.
+
+        Frees nothing while a load or query holds the database, rather than blocking
+        the event loop until it finishes.
+        """
+        if not self._lock.acquire(blocking=False):
+            return 0
+        freed = 0
+        try:
+            with self._connection:
+                while freed < size and self._tables:
+                    execution_id, table = self._tables.popitem(last=False)
+                    self._connection.execute(f"DROP TABLE IF EXISTS {_quote(execution_id)}")
+                    freed += table.size
+        finally:
+            self._lock.release()
+        return freed
+
+    async def query(self, sql: str, max_rows: int = 1000) -> LocalQueryResult:
+        """
+        Run a read-only query over loaded tables.
+
+        Raises:
+            ValueError: If the query fails, writes, or exceeds the time limit
+        """
+        sources = self.referenced_ids(sql)
+        for execution_id in sources:
+            if execution_id in self._tables:
+                self._tables.move_to_end(execution_id)
+
+        started = time.perf_counter()
+        columns, fetched = await asyncio.to_thread(self._execute, sql, max_rows)
+        rows = [dict(zip(columns, values)) for values in fetched[:max_rows]]
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 2)
+
+        logger.debug(f"Local query returned {len(rows)} rows in {elapsed_ms}ms")
+        return LocalQueryResult(
+            columns=columns,
+            rows=rows,
+            truncated=len(fetched) > max_rows,
+            elapsed_ms=elapsed_ms,
+            sources={
+                execution_id: {
+                    "rows": self._tables[execution_id].row_count,
+                    "partial": self._tables[execution_id].partial,
+                }
+                for execution_id in sources
+                if execution_id in self._tables
+            },
+        )
+
+    def _execute(self, sql: str, max_rows: int) -> Tuple[List[str], List[Tuple[Any, ...]]]:
+        with self._lock:
+            deadline = time.monotonic() + self.timeout_seconds
+            self._connection.set_authorizer(_authorize)
+            self._connection.set_progress_handler(lambda: int(time.monotonic() > deadline), 10000)
+            try:
+                cursor = self._connection.execute(sql)
+                fetched = cursor.fetchmany(max_rows + 1)
+                columns = [description[0] for description in cursor.description or []]
+                # Release the statement so loaded tables can be dropped later
+                cursor.close()
+            except sqlite3.Error as e:
+                if time.monotonic() > deadline:
+                    raise ValueError(f"Local query exceeded {self.timeout_seconds}s") from e
+                raise ValueError(f"Local query failed: {e}") from e
+            finally:
+                self._connection.set_authorizer(None)
+                self._connection.set_progress_handler(None, 0)
+        return columns, fetched
@@ -0,0 +1,267 @@
+"""
+CTAS materialization of reused subqueries for AWS Athena MCP Server.
+
+Counts how often each CTE body (by its exact text, literals included) is
+submitted. Once a body has been seen often enough, it is materialized in the
+background with CREATE TABLE AS SELECT into a scratch database, as Snappy
+compressed Parquet under a managed S3 prefix. Later queries with the same CTE
+read the materialized table instead. Tables expire after a TTL, after which
+no query is rewritten to read them; they are dropped and their S3 objects
+deleted once queries started before then have had time to finish, and all of
+them on shutdown.
+
+Materialized tables are not refreshed when their base tables change, so the
+TTL bounds how stale a rewritten query can be. Bodies calling functions such
+as now() or rand() are never materialized.
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+import uuid
+from collections import OrderedDict, deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set
+
+from .rewrite import VOLATILE_FUNCTIONS, cte_definitions, is_select, tokenize
+from .throttle import ApiRateLimiter
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Runs a statement in a database and waits for it to succeed, raising otherwise
+StatementRunner = Callable[[str, str], Awaitable[Any]]
+
+# CTE bodies whose use counts are kept
+MAX_TRACKED_BODIES = 1000
+
+# Expired tables are dropped this long after the last query that could read them
+# started (Athena's default query timeout)
+DROP_GRACE_SECONDS = 1800
+
+PENDING = "pending"
+READY = "ready"
+FAILED = "failed"
+
+
+def canonical_sql(sql: str) -> str:
+    """SQL with whitespace and the case of keywords and names folded, literals kept."""
+    return " ".join(
+        text if text[:1] in ("'", '"') else text.lower() for text, _, _ in tokenize(sql)
+    )
+
+
+def body_key(database: str, body: str) -> str:
+    """Identifier of a CTE body in the database its unqualified names resolve in."""
+    digest = hashlib.sha1(f"{database.lower()}\n{canonical_sql(body)}".encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+class Materialization:
+    """A CTE body materialized, or being materialized, as a scratch table."""
+
+    def __init__(self, key: str, database: str, table: str, location: str):
+        self.key = key
+        self.database = database  # Database the body was written against
+        self.table = table  # Scratch table name
+        self.location = location  # S3 prefix holding the table's data
+        self.state = PENDING
+        self.created_at = time.time()
+        self.expired_at: Optional[float] = None
+        self.hits = 0
+        self.error: Optional[str] = None
+
+
+class MaterializationCache:
+    """Hot CTE bodies materialized with CTAS, and the rewrites that read them."""
+
+    def __init__(
+        self,
+        run_statement: StatementRunner,
+        s3_client: Any,
+        api: ApiRateLimiter,
+        scratch_database: str,
+        location: str,
+        min_uses: int = 3,
+        ttl_seconds: int = 3600,
+        drop_grace_seconds: int = DROP_GRACE_SECONDS,
+    ):
+        self.run_statement = run_statement
+        self.s3 = s3_client
+        self.api = api
+        self.scratch_database = scratch_database
+        self.location = location.rstrip("/") + "/"
+        self.min_uses = min_uses
+        self.ttl_seconds = ttl_seconds
+        self.drop_grace_seconds = drop_grace_seconds
+        self._uses: "OrderedDict[str, Deque[float]]" = OrderedDict()
+        self._entries: Dict[str, Materialization] = {}
+        self._expired: List[Materialization] = []  # Expired tables not dropped yet
+        self._tasks: Set["asyncio.Task[None]"] = set()
+        self._stats = {"materialized": 0, "failed": 0, "expired": 0, "rewrites": 0}
+
+    def apply(self, query: str, database: str) -> str:
+        """
+        Count the CTE bodies of a query, start materializing hot ones, and point
+        CTEs with a ready materialization at it.
+
+        Returns:
+            The query to run (unchanged if no CTE is materialized yet)
+        """
+        self._expire()
+        definitions = cte_definitions(query)
+        names = {name for name, _, _ in definitions}
+        rewritten = query
+
+        # Replace from the end so earlier offsets stay valid
+        for name, start, end in reversed(definitions):
+            body = query[start:end]
+            words = {text.strip('"`').lower() for text, _, _ in tokenize(body)}
+            if not is_select(body) or words & names:
+                # Bodies reading other CTEs cannot run on their own
+                continue
+            if words & VOLATILE_FUNCTIONS:
+                # A stored result would be stale as soon as it is written
+                continue
+
+            key = body_key(database, body)
+            entry = self._entries.get(key)
+            if entry is not None and entry.state == READY:
+                entry.hits += 1
+                self._stats["rewrites"] += 1
+                replacement = f"SELECT * FROM {self.scratch_database}.{entry.table}"
+                rewritten = rewritten[:start] + replacement + rewritten[end:]
+                logger.debug(f"Reading CTE {name} from materialized table {entry.table}")
+            elif entry is None and self._count_use(key) >= self.min_uses:
+                self._start(key, database, body)
+        return rewritten
+
+    def _count_use(self, key: str) -> int:
+        """Record a use of a body; returns its uses within the TTL window."""
+        now = time.time()
+        uses = self._uses.get(key)
+        if uses is None:
+            uses = self._uses[key] = deque()
+            while len(self._uses) > MAX_TRACKED_BODIES:
+                self._uses.popitem(last=False)
+        self._uses.move_to_end(key)
+        uses.append(now)
+        while uses and now - uses[0] > self.ttl_seconds:
+            uses.popleft()
+        return len(uses)
+
+    def _start(self, key: str, database: str, body: str) -> None:
+        table = f"mv_{key}_{int(time.time())}"
+        location = f"{self.location}{key}/{uuid.uuid4().hex}/"
+        entry = self._entries[key] = Materialization(key, database, table, location)
+        self._uses.pop(key, None)
+        self._spawn(self._materialize(entry, body))
+
+    def _spawn(self, work: Awaitable[None]) -> None:
+        task = asyncio.ensure_future(work)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _materialize(self, entry: Materialization, body: str) -> None:
+        statement = (
+            f"CREATE TABLE {self.scratch_database}.{entry.table} "
+            f"WITH (format = 'PARQUET', write_compression = 'SNAPPY', "
+            f"external_location = '{entry.location}') AS {body}"
+        )
+        logger.info(f"Materializing hot subquery {entry.key} as {entry.table}")
+        try:
+            await self.run_statement(statement, entry.database)
+        except Exception as e:
+            # Failed bodies are not retried until the entry expires
+            entry.state = FAILED
+            entry.error = str(e)
+            self._stats["failed"] += 1
+            logger.warning(f"Could not materialize subquery {entry.key}: {e}")
+            try:
+                # A failed CTAS can leave partial output behind
+                await self._delete_objects(entry.location)
+            except Exception as cleanup_error:
+                logger.warning(f"Could not delete {entry.location}: {cleanup_error}")
+            return
+        entry.state = READY
+        entry.created_at = time.time()
+        self._stats["materialized"] += 1
+
+    def _expire(self) -> None:
+        """
+        Stop rewriting to entries older than the TTL, and start dropping expired
+        tables no query can still be reading.
+        """
+        now = time.time()
+        expired = [
+            entry
+            for entry in self._entries.values()
+            if entry.state != PENDING and now - entry.created_at > self.ttl_seconds
+        ]
+        for entry in expired:
+            del self._entries[entry.key]
+            self._stats["expired"] += 1
+            if entry.state == READY:
+                entry.expired_at = now
+                self._expired.append(entry)
+
+        while self._expired:
+            entry = self._expired[0]
+            if entry.expired_at is not None and now - entry.expired_at <= self.drop_grace_seconds:
+                break
+            self._spawn(self._drop(self._expired.pop(0)))
+
+    async def _drop(self, entry: Materialization) -> None:
+        """Drop a materialized table and delete its data."""
+        try:
+            await self.run_statement(
+                f"DROP TABLE IF EXISTS {self.scratch_database}.{entry.table}",
+                self.scratch_database,
+            )
+            await self._delete_objects(entry.location)
+            logger.info(f"Dropped materialized table {entry.table}")
+        except Exception as e:
+            logger.warning(f"Could not clean up materialized table {entry.table}: {e}")
+
+    async def _delete_objects(self, location: str) -> None:
+        """Delete every S3 object under a prefix."""
+        bucket, _, prefix = location[len("s3://") :].partition("/")
+        params: Dict[str, Any] = {"Bucket": bucket, "Prefix": prefix}
+        while True:
+            response = await self.api.call_in_thread(self.s3, "list_objects_v2", **params)
+            objects = [{"Key": item["Key"]} for item in response.get("Contents", [])]
+            if objects:
+                await self.api.call_in_thread(
+                    self.s3,
+                    "delete_objects",
+                    Bucket=bucket,
+                    Delete={"Objects": objects, "Quiet": True},
+                )
+            if not response.get("IsTruncated"):
+                break
+            params["ContinuationToken"] = response["NextContinuationToken"]
+
+    async def close(self) -> None:
+        """Stop pending work and drop every materialized table."""
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        ready = [entry for entry in self._entries.values() if entry.state == READY]
+        ready.extend(self._expired)
+        self._entries.clear()
+        self._expired = []
+        await asyncio.gather(*(self._drop(entry) for entry in ready))
+
+    def entries(self) -> List[Materialization]:
+        """Current materializations."""
+        return list(self._entries.values())
+
+    def stats(self) -> Dict[str, int]:
+        """Materialization and rewrite counters."""
+        states = [entry.state for entry in self._entries.values()]
+        return {
+            "ready": states.count(READY),
+            "pending": states.count(PENDING),
+            "expired_pending_drop": len(self._expired),
+            **self._stats,
+        }
@@ -0,0 +1,149 @@
+"""
+Memory accounting for AWS Athena MCP Server.
+
+Tracks approximate memory held by caches and by in-flight result fetches and
+responses against one ceiling. Reservations that would exceed it first evict
+from caches, in registration order, then wait for in-flight work to finish.
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+
+class MemoryManager:
+    """Global memory ceiling shared by caches and in-flight work."""
+
+    def __init__(self, limit_bytes: int, wait_seconds: float = 5.0):
+        self.limit_bytes = limit_bytes
+        self.wait_seconds = wait_seconds
+        self._caches: List[Tuple[str, Callable[[], int], Optional[Callable[[int], int]]]] = []
+        self._reserved: Dict[str, int] = {}
+        self._released: Optional[asyncio.Event] = None
+        self._stats = {"waits": 0, "wait_seconds": 0.0, "evicted_bytes": 0, "denied": 0}
+
+    def register_cache(
+        self,
+        name: str,
+        usage: Callable[[], int],
+        evict: Optional[Callable[[int], int]] = None,
+    ) -> None:
+        """
+        Account a cache's memory. Caches with an evict callback are shrunk, in
+        registration order, when a reservation needs room.
+
+        Args:
+            name: Category name in usage reports
+            usage: Returns the cache's approximate size in bytes
+            evict: Frees at least the given number of bytes if it can; returns bytes freed
+        """
+        self._caches.append((name, usage, evict))
+
+    def used_bytes(self) -> int:
+        """Approximate bytes held by caches and reservations."""
+        return sum(usage() for _, usage, _ in self._caches) + sum(self._reserved.values())
+
+    def _evict(self, needed: int) -> int:
+        freed = 0
+        for name, _, evict in self._caches:
+            if evict is None or freed >= needed:
+                continue
+            released = evict(needed - freed)
+            if released:
+                logger.info(
+                    f"Evicted {released} bytes from {name} cache to stay under memory limit"
+                )
+            freed += released
+        self._stats["evicted_bytes"] += freed
+        return freed
+
+    def try_reserve(self, category: str, size: int) -> bool:
+        """Reserve memory without waiting, evicting from caches if needed."""
+        overflow = self.used_bytes() + size - self.limit_bytes
+        if overflow > 0 and self._evict(overflow) < overflow:
+            return False
+        self._reserved[category] = self._reserved.get(category, 0) + size
+        return True
+
+    async def reserve(self, category: str, size: int, wait_seconds: Optional[float] = None) -> bool:
+        """
+        Reserve memory for in-flight work, waiting up to wait_seconds (by default
+        the manager's) for room.
+
+        Returns:
+            True if reserved; False if the limit would still be exceeded (the caller
+            should shrink or stop the work, or proceed with force_reserve)
+        """
+        if self.try_reserve(category, size):
+            return True
+
+        self._stats["waits"] += 1
+        if self._released is None:
+            self._released = asyncio.Event()
+        if wait_seconds is None:
+            wait_seconds = self.wait_seconds
+        started = time.monotonic()
+        try:
+            while True:
+                # Cleared before the check, so a release in between cannot be missed
+                self._released.clear()
+                if self.try_reserve(category, size):
+                    return True
+                remaining = wait_seconds - (time.monotonic() - started)
+                if remaining <= 0:
+                    self._stats["denied"] += 1
+                    logger.warning(f"Memory limit reached; could not reserve {size} bytes")
+                    return False
+                try:
+                    await asyncio.wait_for(self._released.wait(), remaining)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._stats["wait_seconds"] += time.monotonic() - started
+
+    def force_reserve(self, category: str, size: int) -> None:
+        """Reserve memory even past the limit (for the minimum work that must proceed)."""
+        self._reserved[category] = self._reserved.get(category, 0) + size
+
+    def release(self, category: str, size: int) -> None:
+        """Return reserved memory and wake waiting reservations."""
+        remaining = self._reserved.get(category, 0) - size
+        if remaining > 0:
+            self._reserved[category] = remaining
+        else:
+            self._reserved.pop(category, None)
+        if self._released is not None:
+            self._released.set()
+
+    @asynccontextmanager
+    async def hold(self, category: str, size: int) -> AsyncIterator[None]:
+        """Account memory for the duration of a block, waiting briefly for room."""
+        if not await self.reserve(category, size, wait_seconds=min(self.wait_seconds, 1.0)):
+            self.force_reserve(category, size)
+        try:
+            yield
+        finally:
+            self.release(category, size)
+
+    def usage(self) -> Dict[str, object]:
+        """Current usage by category."""
+        categories = {name: usage() for name, usage, _ in self._caches}
+        categories.update(self._reserved)
+        used = sum(categories.values())
+        return {
+            "limit_bytes": self.limit_bytes,
+            "used_bytes": used,
+            "available_bytes": max(self.limit_bytes - used, 0),
+            "categories": categories,
+            **{
+                name: round(value, 3) if isinstance(value, float) else value
+                for name, value in self._stats.items()
+            },
+        }
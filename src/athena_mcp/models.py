@@ -20,12 +20,78 @@ class QueryState(str, Enum):
     CANCELLED = "CANCELLED"
 
 
+class SampleMethod(str, Enum):
+    """Athena TABLESAMPLE methods."""
+
+    BERNOULLI = "BERNOULLI"
+    SYSTEM = "SYSTEM"
+
+
+class LintPolicy(str, Enum):
+    """What to do about cost lint findings."""
+
+    OFF = "off"
+    WARN = "warn"  # Run the query and report findings
+    BLOCK = "block"  # Refuse queries with findings
+    # Restrict a query's lone partitioned table to its newest partition when it has no
+    # partition predicate (changes the result, so only accepted per request), warn otherwise
+    REWRITE = "rewrite"
+
+
 class QueryRequest(BaseModel):
     """Request to execute a query."""
 
     database: str = Field(..., description="The Athena database to query")
     query: str = Field(..., description="SQL query to execute")
     max_rows: int = Field(1000, ge=1, le=10000, description="Maximum rows to return")
+    exploratory: bool = Field(default=False, description="Add LIMIT max_rows if none")
+    sample_percent: Optional[float] = Field(
+        default=None, gt=0, le=100, description="Apply TABLESAMPLE at this percentage"
+    )
+    sample_method: SampleMethod = Field(default=SampleMethod.BERNOULLI, description="Sampling")
+    parameters: Optional[List[str]] = Field(
+        default=None, description="SQL literals bound to `?` placeholders via a prepared statement"
+    )
+    max_bytes: Optional[int] = Field(
+        default=None, ge=1, description="Approximate serialized size budget for returned rows"
+    )
+    lint_policy: Optional[LintPolicy] = Field(
+        default=None, description="Cost lint policy (the server default if not set)"
+    )
+    incremental_key: Optional[str] = Field(
+        default=None,
+        description="Partition key the query groups by; reuse per-partition results cached "
+        "from earlier runs and query only new or changed partitions",
+    )
+
+
+class LintFinding(BaseModel):
+    """A likely avoidable cost in a query."""
+
+    rule: str  # "select_star" or "missing_partition_filter"
+    table: str  # database.table
+    message: str
+    estimated_savings_percent: Optional[float] = None  # Share of the table's scan avoidable
+    fixed: bool = False  # Rewritten away under the rewrite policy
+
+
+class LintReport(BaseModel):
+    """Cost lint findings for a query."""
+
+    policy: LintPolicy
+    findings: List[LintFinding]
+    estimated_savings_percent: Optional[float] = None  # Of the whole query's scan, if known
+    estimated_bytes_saved: Optional[int] = None  # From earlier runs of the query shape
+
+
+class IncrementalInfo(BaseModel):
+    """How an incremental query's result was assembled."""
+
+    key: str  # Partition key the result is grouped by
+    partitions: int  # Values of the key in the table
+    partitions_reused: int  # Served from results cached by earlier runs
+    partitions_queried: int  # Run in Athena for this result
+    full_refresh: bool = False  # The query ran over every partition
 
 
 class QueryResult(BaseModel):
@@ -36,6 +102,23 @@ class QueryResult(BaseModel):
     rows: List[Dict[str, Any]]
     bytes_scanned: int = 0
     execution_time_ms: int = 0
+    executed_query: Optional[str] = None  # Set when the submitted SQL was rewritten
+    truncated: bool = False  # More rows exist beyond the row or byte budget
+    next_cursor: Optional[str] = None  # Pass to get_result to continue after a truncation
+    result_bytes: int = 0  # Approximate serialized size of the returned rows
+    lint: Optional[LintReport] = None  # Cost lint findings, if any
+    incremental: Optional[IncrementalInfo] = None  # Set for incremental queries
+    column_types: Dict[str, str] = Field(default_factory=dict, exclude=True)
+
+
+class LocalQueryResult(BaseModel):
+    """Result of a follow-up query run locally over earlier results."""
+
+    columns: List[str]
+    rows: List[Dict[str, Any]]
+    truncated: bool = False
+    elapsed_ms: float = 0.0
+    sources: Dict[str, Dict[str, Any]] = {}  # Execution ID -> {"rows": n, "partial": bool}
 
 
 class QueryStatus(BaseModel):
@@ -54,6 +137,40 @@ class TableInfo(BaseModel):
     database: str
     table_name: str
     columns: List[Dict[str, str]]  # [{"name": "col1", "type": "string", "comment": "..."}]
+    partition_keys: List[str] = []
+
+
+class SchemaDigest(BaseModel):
+    """Compact schemas of many tables in one database."""
+
+    database: str
+    table_count: int
+    shared_columns: Dict[str, str]  # Column name -> type, for columns in several tables
+    tables: Dict[str, Dict[str, str]]  # Table -> "columns"/"partitioned_by" or "same_as"
+    missing: List[str] = []
+
+
+class SchemaMatch(BaseModel):
+    """A table matching a schema search."""
+
+    database: str
+    table_name: str
+    score: float
+    matched_terms: List[str]
+    matched_columns: List[Dict[str, str]]  # [{"name": "customer_id", "type": "bigint"}]
+
+
+class PartitionList(BaseModel):
+    """Partition keys and known partition values of a table."""
+
+    database: str
+    table_name: str
+    partition_keys: List[Dict[str, str]]  # [{"name": "dt", "type": "string"}]
+    partition_count: int
+    key_ranges: Dict[str, Dict[str, Any]]  # {"dt": {"min": "...", "max": "...", "distinct": 3}}
+    partitions: List[Dict[str, str]]  # [{"dt": "2024-01-01"}]
+    truncated: bool = False
+    refreshed_at: float = 0.0
 
 
 class DatabaseInfo(BaseModel):
@@ -64,6 +181,97 @@ class DatabaseInfo(BaseModel):
     table_count: int
 
 
+class ColumnProfile(BaseModel):
+    """Summary statistics for a single result column."""
+
+    name: str
+    count: int = 0
+    nulls: int = 0
+    non_finite: int = 0  # NaN and Infinity values of a numeric column
+    distinct_estimate: int = 0
+    min: Optional[Any] = None
+    max: Optional[Any] = None
+    mean: Optional[float] = None
+    top_values: List[Dict[str, Any]] = []  # [{"value": "a", "count": 10}]
+    histogram: List[Dict[str, Any]] = []  # [{"low": 0.0, "high": 1.0, "count": 5}]
+
+
+class ResultProfile(BaseModel):
+    """Per-column profile of a query result."""
+
+    query_execution_id: str
+    row_count: int  # Rows profiled
+    columns: List[ColumnProfile]
+    truncated: bool = False  # The result has more rows than were profiled
+
+
+class StageProfile(BaseModel):
+    """Runtime statistics of one query stage."""
+
+    stage_id: int
+    depth: int = 0
+    state: str = ""
+    execution_time_ms: int = 0
+    input_rows: int = 0
+    input_bytes: int = 0
+    output_rows: int = 0
+    output_bytes: int = 0
+    operators: List[str] = []  # Plan operators, outermost first
+
+
+class QueryProfile(BaseModel):
+    """Execution profile of a query."""
+
+    query_execution_id: str
+    state: str
+    bytes_scanned: int = 0
+    result_reused: bool = False
+    timeline: Dict[str, int]  # queue_ms, planning_ms, engine_ms, service_processing_ms, total_ms
+    rows: Dict[str, int] = {}
+    stages: List[StageProfile] = []
+    findings: List[str] = []
+
+
+class QueryExecutionSummary(BaseModel):
+    """A past query execution."""
+
+    query_execution_id: str
+    query: str
+    database: Optional[str] = None
+    workgroup: Optional[str] = None
+    state: str
+    submitted_at: Optional[str] = None
+    completed_at: Optional[str] = None
+    bytes_scanned: int = 0
+    execution_time_ms: int = 0
+    output_location: Optional[str] = None
+
+
+class QueryHistory(BaseModel):
+    """A page of recent query executions matching the history filters."""
+
+    workgroup: Optional[str] = None
+    executions: List[QueryExecutionSummary]
+    scanned: int  # Executions examined to produce this page
+    next_token: Optional[str] = None  # Pass back to continue scanning older executions
+
+
+class QueryShapeStats(BaseModel):
+    """Rolling statistics of one normalized query shape."""
+
+    fingerprint: str
+    query: str  # Normalized text, literals as ?
+    executions: int
+    failed: int = 0
+    bytes_scanned: int = 0
+    mean_bytes_scanned: int = 0
+    total_execution_ms: int = 0
+    mean_execution_ms: int = 0
+    p95_execution_ms: int = 0
+    reuse_hit_rate: float = 0.0  # Share of executions answered from Athena's result reuse
+    last_seen: float = 0.0
+
+
 class ErrorResponse(BaseModel):
     """Standard error response."""
 
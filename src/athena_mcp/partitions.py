@@ -0,0 +1,238 @@
+"""
+Partition discovery for AWS Athena MCP Server.
+
+Keeps an in-memory index of each table's partitions, built from paginated
+Glue Data Catalog calls and refreshed incrementally.
+"""
+
+import logging
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from .models import PartitionList
+from .throttle import ApiRateLimiter
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+NUMERIC_KEY_TYPES = {"tinyint", "smallint", "int", "integer", "bigint"}
+
+
+def _partition_version(partition: Dict[str, Any]) -> str:
+    """Return a marker that changes whenever the partition is rewritten."""
+    parameters = partition.get("Parameters", {})
+    marker = (
+        parameters.get("transient_lastDdlTime")
+        or partition.get("LastAnalyzedTime")
+        or partition.get("CreationTime")
+        or ""
+    )
+    return str(marker)
+
+
+def _partition_entry(partition: Dict[str, Any]) -> Tuple[Tuple[str, ...], Dict[str, str]]:
+    """Index key and entry of a Glue partition."""
+    values = tuple(partition.get("Values", []))
+    entry = {
+        "location": partition.get("StorageDescriptor", {}).get("Location", ""),
+        "version": _partition_version(partition),
+    }
+    return values, entry
+
+
+def partition_literal(value: str, key_type: str) -> str:
+    """SQL literal for a partition value of the given key type."""
+    key_type = key_type.lower()
+    if key_type in NUMERIC_KEY_TYPES and value.lstrip("-").isdigit():
+        return value
+    escaped = value.replace("'", "''")
+    if key_type == "date":
+        return f"DATE '{escaped}'"
+    return f"'{escaped}'"
+
+
+class PartitionIndex:
+    """Partition values and versions for a single table."""
+
+    def __init__(self, database: str, table_name: str, keys: List[Dict[str, str]]):
+        self.database = database
+        self.table_name = table_name
+        self.keys = keys
+        self.partitions: Dict[Tuple[str, ...], Dict[str, str]] = {}
+        self.refreshed_at = 0.0
+        self.full_refreshed_at = 0.0
+
+    @property
+    def key_names(self) -> List[str]:
+        """Partition key names in declaration order."""
+        return [key["name"] for key in self.keys]
+
+    def sort_value(self, position: int, value: str) -> Any:
+        """Sort key of a value of the partition key at position (numeric keys by number)."""
+        if self.keys[position]["type"].lower() in NUMERIC_KEY_TYPES:
+            try:
+                return (0, int(value))
+            except ValueError:
+                pass
+        return (1, value)
+
+    def upsert(self, partition: Dict[str, Any]) -> bool:
+        """Add or update a partition. Returns True if it is new or changed."""
+        values, entry = _partition_entry(partition)
+        changed = self.partitions.get(values) != entry
+        self.partitions[values] = entry
+        return changed
+
+    def newest_value(self) -> Optional[str]:
+        """Largest value of the leading partition key."""
+        if not self.partitions or not self.keys:
+            return None
+        return max((values[0] for values in self.partitions), key=lambda v: self.sort_value(0, v))
+
+    def key_ranges(self) -> Dict[str, Dict[str, Any]]:
+        """Min, max and distinct count of each partition key."""
+        ranges: Dict[str, Dict[str, Any]] = {}
+        for position, name in enumerate(self.key_names):
+            values = {partition[position] for partition in self.partitions}
+            if not values:
+                ranges[name] = {"min": None, "max": None, "distinct": 0}
+                continue
+            ordered = sorted(values, key=lambda v: self.sort_value(position, v))
+            ranges[name] = {"min": ordered[0], "max": ordered[-1], "distinct": len(values)}
+        return ranges
+
+    def to_model(self, max_partitions: int) -> PartitionList:
+        """Summarize the index, listing the newest partitions first."""
+        names = self.key_names
+        ordered = sorted(
+            self.partitions,
+            key=lambda values: [self.sort_value(i, v) for i, v in enumerate(values)],
+            reverse=True,
+        )
+        return PartitionList(
+            database=self.database,
+            table_name=self.table_name,
+            partition_keys=self.keys,
+            partition_count=len(self.partitions),
+            key_ranges=self.key_ranges(),
+            partitions=[dict(zip(names, values)) for values in ordered[:max_partitions]],
+            truncated=len(ordered) > max_partitions,
+            refreshed_at=self.refreshed_at,
+        )
+
+
+class PartitionCatalog:
+    """Per-table partition indexes backed by the Glue Data Catalog."""
+
+    def __init__(self, glue_client: Any, api: ApiRateLimiter, refresh_seconds: int = 300):
+        self.glue = glue_client
+        self.api = api
+        self.refresh_seconds = refresh_seconds
+        self._indexes: Dict[Tuple[str, str], PartitionIndex] = {}
+
+    async def get_index(
+        self, database: str, table_name: str, refresh: bool = False
+    ) -> PartitionIndex:
+        """
+        Return the partition index for a table, loading or refreshing it as needed.
+
+        A missing index triggers a full load; a stale index is refreshed
+        incrementally; refresh=True forces a full reload to pick up deletions.
+        Callers sharing an index never see it partially loaded: a new index is
+        cached once loaded, and a full reload replaces the partitions at once.
+        """
+        cache_key = (database, table_name)
+        index = self._indexes.get(cache_key)
+
+        if index is None:
+            keys = await self._partition_keys(database, table_name)
+            index = PartitionIndex(database, table_name, keys)
+            await self._full_refresh(index)
+            self._indexes[cache_key] = index
+        elif refresh:
+            await self._full_refresh(index)
+        elif time.time() - index.refreshed_at >= self.refresh_seconds:
+            await self._incremental_refresh(index)
+
+        return index
+
+    def cached_index(self, database: str, table_name: str) -> Optional[PartitionIndex]:
+        """Return a table's partition index if already loaded, without calling Glue."""
+        return self._indexes.get((database, table_name))
+
+    def invalidate(self, database: str, table_name: str) -> None:
+        """Drop a cached index."""
+        self._indexes.pop((database, table_name), None)
+
+    async def _partition_keys(self, database: str, table_name: str) -> List[Dict[str, str]]:
+        response = await self.api.call(
+            self.glue, "get_table", DatabaseName=database, Name=table_name
+        )
+        keys = response.get("Table", {}).get("PartitionKeys", [])
+        return [{"name": key.get("Name", ""), "type": key.get("Type", "")} for key in keys]
+
+    async def _iter_partitions(
+        self, database: str, table_name: str, expression: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        params: Dict[str, Any] = {
+            "DatabaseName": database,
+            "TableName": table_name,
+            "ExcludeColumnSchema": True,
+        }
+        if expression:
+            params["Expression"] = expression
+
+        pages = 0
+        while True:
+            response = await self.api.call(self.glue, "get_partitions", **params)
+            pages += 1
+            for partition in response.get("Partitions", []):
+                yield partition
+
+            next_token = response.get("NextToken")
+            if not next_token:
+                break
+            params["NextToken"] = next_token
+
+        logger.debug(f"Fetched {pages} partition pages for {database}.{table_name}")
+
+    async def _full_refresh(self, index: PartitionIndex) -> None:
+        if not index.keys:
+            index.refreshed_at = index.full_refreshed_at = time.time()
+            return
+
+        # Listed into a new dict, so readers keep the previous partitions until it is done
+        partitions: Dict[Tuple[str, ...], Dict[str, str]] = {}
+        async for partition in self._iter_partitions(index.database, index.table_name):
+            values, entry = _partition_entry(partition)
+            partitions[values] = entry
+
+        index.partitions = partitions
+        index.refreshed_at = index.full_refreshed_at = time.time()
+        logger.info(
+            f"Indexed {len(index.partitions)} partitions for {index.database}.{index.table_name}"
+        )
+
+    async def _incremental_refresh(self, index: PartitionIndex) -> None:
+        newest = index.newest_value()
+        if newest is None:
+            await self._full_refresh(index)
+            return
+
+        # Only fetch partitions at or after the newest known leading key value
+        key = index.keys[0]
+        if key["type"].lower() in NUMERIC_KEY_TYPES and newest.lstrip("-").isdigit():
+            expression = f"{key['name']} >= {newest}"
+        else:
+            escaped = newest.replace("'", "''")
+            expression = f"{key['name']} >= '{escaped}'"
+
+        changed = 0
+        async for partition in self._iter_partitions(index.database, index.table_name, expression):
+            changed += index.upsert(partition)
+
+        index.refreshed_at = time.time()
+        logger.info(
+            f"Incrementally refreshed {index.database}.{index.table_name}: "
+            f"{changed} new or changed partitions"
+        )
@@ -0,0 +1,65 @@
+"""
+Prepared statement registry for AWS Athena MCP Server.
+
+Tracks which query shapes already exist as Athena prepared statements so that
+parameterized queries are validated and prepared only once per shape.
+"""
+
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from .rewrite import tokenize
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+def statement_name(query: str) -> str:
+    """Deterministic prepared statement name for a query shape."""
+    digest = hashlib.sha256(query.encode("utf-8")).hexdigest()[:24]
+    return f"mcp_{digest}"
+
+
+def count_placeholders(query: str) -> int:
+    """Count `?` parameter placeholders outside string literals."""
+    return sum(1 for text, _, _ in tokenize(query) if text == "?")
+
+
+class PreparedStatementRegistry:
+    """Bounded LRU registry of prepared statements per workgroup (keyed by scope)."""
+
+    def __init__(self, max_statements: int = 500):
+        self.max_statements = max_statements
+        self._statements: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._statements)
+
+    def get(self, workgroup: str, query: str) -> Optional[str]:
+        """Return the statement name if this shape is already prepared."""
+        key = (workgroup, query)
+        name = self._statements.get(key)
+        if name is not None:
+            self._statements.move_to_end(key)
+        return name
+
+    def register(self, workgroup: str, query: str, name: str) -> List[Tuple[str, str]]:
+        """
+        Record a prepared statement.
+
+        Returns:
+            (workgroup, statement_name) pairs evicted to stay within the bound
+        """
+        self._statements[(workgroup, query)] = name
+        self._statements.move_to_end((workgroup, query))
+
+        evicted = []
+        while len(self._statements) > self.max_statements:
+            (evicted_workgroup, _), evicted_name = self._statements.popitem(last=False)
+            evicted.append((evicted_workgroup, evicted_name))
+
+        if evicted:
+            logger.debug(f"Evicted {len(evicted)} prepared statements from registry")
+        return evicted
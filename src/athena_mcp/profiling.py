@@ -0,0 +1,226 @@
+"""
+Result profiling for AWS Athena MCP Server.
+
+Computes compact per-column statistics over query results in a single pass,
+so agents can inspect value distributions without pulling raw rows.
+"""
+
+import hashlib
+import logging
+import math
+import random
+from typing import Any, Dict, Iterable, List, Optional
+
+from .models import ColumnProfile, QueryResult, ResultProfile
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+class DistinctSketch:
+    """Approximate distinct counter (exact for small sets, HyperLogLog beyond)."""
+
+    EXACT_LIMIT = 4096
+    PRECISION = 10  # 2^10 registers, ~3% standard error
+
+    def __init__(self) -> None:
+        self._exact: Optional[set] = set()
+        self._registers: List[int] = []
+
+    def add(self, value: str) -> None:
+        """Add a value to the sketch."""
+        if self._exact is not None:
+            self._exact.add(value)
+            if len(self._exact) > self.EXACT_LIMIT:
+                self._registers = [0] * (1 << self.PRECISION)
+                for item in self._exact:
+                    self._add_hashed(item)
+                self._exact = None
+            return
+        self._add_hashed(value)
+
+    def _add_hashed(self, value: str) -> None:
+        hashed = int.from_bytes(
+            hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big"
+        )
+        index = hashed >> (64 - self.PRECISION)
+        remainder = hashed & ((1 << (64 - self.PRECISION)) - 1)
+        rank = (64 - self.PRECISION) - remainder.bit_length() + 1
+        if rank > self._registers[index]:
+            self._registers[index] = rank
+
+    def estimate(self) -> int:
+        """Return the estimated number of distinct values."""
+        if self._exact is not None:
+            return len(self._exact)
+
+        m = len(self._registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / sum(2.0**-r for r in self._registers)
+        zeros = self._registers.count(0)
+        if raw <= 2.5 * m and zeros:
+            # Small-range correction (linear counting)
+            return int(round(m * math.log(m / zeros)))
+        return int(round(raw))
+
+
+class ColumnProfiler:
+    """Single-pass accumulator for one column's statistics."""
+
+    RESERVOIR_SIZE = 1024
+
+    def __init__(self, name: str, top_k: int = 5, bins: int = 10):
+        self.name = name
+        self.top_k = top_k
+        self.bins = bins
+
+        self.count = 0
+        self.nulls = 0
+        self.non_finite = 0  # NaN and infinities in a numeric column, outside min/max/mean
+        self._numbers = 0  # Finite numeric values
+        self.numeric = True
+        self._min: Optional[Any] = None
+        self._max: Optional[Any] = None
+        self._str_min: Optional[str] = None
+        self._str_max: Optional[str] = None
+        self._sum = 0.0
+        self._distinct = DistinctSketch()
+        # Space-saving heavy hitters bounded to a small multiple of top_k
+        self._capacity = max(top_k * 10, 64)
+        self._counts: Dict[str, int] = {}
+        self._reservoir: List[float] = []
+        self._random = random.Random(0)
+
+    def update(self, values: Iterable[Optional[str]]) -> None:
+        """Fold a batch of column values into the profile."""
+        for value in values:
+            if value is None:
+                self.nulls += 1
+                continue
+
+            self.count += 1
+            self._distinct.add(value)
+            self._track_frequency(value)
+
+            if self._str_min is None or value < self._str_min:
+                self._str_min = value
+            if self._str_max is None or value > self._str_max:
+                self._str_max = value
+
+            if self.numeric:
+                try:
+                    number = float(value)
+                except ValueError:
+                    self.numeric = False
+                    self._reservoir = []
+                    continue
+                if not math.isfinite(number):
+                    self.non_finite += 1
+                    continue
+                self._numbers += 1
+                self._sum += number
+                if self._min is None or number < self._min:
+                    self._min = number
+                if self._max is None or number > self._max:
+                    self._max = number
+                self._sample(number)
+
+    def _track_frequency(self, value: str) -> None:
+        counts = self._counts
+        if value in counts:
+            counts[value] += 1
+        elif len(counts) < self._capacity:
+            counts[value] = 1
+        else:
+            # Replace the least frequent entry, inheriting its count
+            victim = min(counts, key=counts.__getitem__)
+            counts[value] = counts.pop(victim) + 1
+
+    def _sample(self, number: float) -> None:
+        seen = self._numbers
+        if len(self._reservoir) < self.RESERVOIR_SIZE:
+            self._reservoir.append(number)
+            return
+        slot = self._random.randrange(seen)
+        if slot < self.RESERVOIR_SIZE:
+            self._reservoir[slot] = number
+
+    def _histogram(self) -> List[Dict[str, Any]]:
+        if not self.numeric or not self._reservoir or self._min is None or self._max is None:
+            return []
+
+        low, high = self._min, self._max
+        if low == high:
+            return [{"low": low, "high": high, "count": self._numbers}]
+
+        width = (high - low) / self.bins
+        buckets = [0] * self.bins
+        for number in self._reservoir:
+            buckets[min(int((number - low) / width), self.bins - 1)] += 1
+
+        # Scale sampled counts back up to the full column size
+        scale = self._numbers / len(self._reservoir)
+        return [
+            {
+                "low": low + i * width,
+                "high": low + (i + 1) * width,
+                "count": int(round(bucket * scale)),
+            }
+            for i, bucket in enumerate(buckets)
+        ]
+
+    def summary(self) -> ColumnProfile:
+        """Build the column profile from accumulated state."""
+        numeric = self.numeric and self.count > 0
+        top = sorted(self._counts.items(), key=lambda item: (-item[1], item[0]))[: self.top_k]
+
+        return ColumnProfile(
+            name=self.name,
+            count=self.count,
+            nulls=self.nulls,
+            non_finite=self.non_finite if numeric else 0,
+            distinct_estimate=self._distinct.estimate(),
+            min=self._min if numeric else self._str_min,
+            max=self._max if numeric else self._str_max,
+            mean=self._sum / self._numbers if numeric and self._numbers else None,
+            top_values=[{"value": value, "count": count} for value, count in top],
+            histogram=self._histogram() if numeric else [],
+        )
+
+
+class ResultProfiler:
+    """Accumulates column profiles over one or more pages of rows."""
+
+    def __init__(self, columns: List[str], top_k: int = 5, bins: int = 10):
+        self.columns = columns
+        self.row_count = 0
+        self._profilers = [ColumnProfiler(name, top_k, bins) for name in columns]
+
+    def update(self, rows: List[Dict[str, Any]]) -> None:
+        """Fold a page of rows into the profile, one column at a time."""
+        self.row_count += len(rows)
+        for profiler in self._profilers:
+            name = profiler.name
+            profiler.update([row.get(name) for row in rows])
+
+    def finish(self, query_execution_id: str) -> ResultProfile:
+        """Return the completed result profile."""
+        return ResultProfile(
+            query_execution_id=query_execution_id,
+            row_count=self.row_count,
+            columns=[profiler.summary() for profiler in self._profilers],
+        )
+
+
+def profile_result(result: QueryResult, top_k: int = 5, bins: int = 10) -> ResultProfile:
+    """Profile every column of a query result."""
+    profiler = ResultProfiler(result.columns, top_k, bins)
+    profiler.update(result.rows)
+    profile = profiler.finish(result.query_execution_id)
+    profile.truncated = result.truncated
+
+    logger.debug(
+        f"Profiled {profile.row_count} rows across {len(profile.columns)} columns "
+        f"for query: {result.query_execution_id}"
+    )
+    return profile
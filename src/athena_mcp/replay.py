@@ -0,0 +1,264 @@
+"""
+Record and replay of AWS traffic for AWS Athena MCP Server.
+
+Recording wraps the boto3 clients so every request and response is appended,
+with its timing, to a JSON Lines session file, with result data, literals,
+credentials and S3 locations redacted. Replay serves a session file back in
+place of the AWS clients, at the recorded pace (optionally sped up, waiting
+without blocking the event loop) or as fast as possible, so real sessions become repeatable offline benchmarks and
+regression tests.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from botocore.exceptions import ClientError
+
+from .fingerprint import normalize_query
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+REDACTED = "redacted"
+
+# Values replaced by a same-length mask, so replayed result sizes stay realistic
+MASKED_KEYS = {"VarCharValue"}
+# SQL whose literals are replaced by ?
+SQL_KEYS = {"Query", "QueryString", "QueryStatement"}
+# Values dropped entirely
+SECRET_KEYS = {
+    "AccessKeyId",
+    "SecretAccessKey",
+    "SessionToken",
+    "ClientRequestToken",
+    "ExpectedBucketOwner",
+    "KmsKey",
+}
+# S3 locations, reduced to a placeholder bucket
+LOCATION_KEYS = {"OutputLocation", "Location", "DataManifestLocation"}
+
+
+def redact(value: Any, key: Optional[str] = None) -> Any:
+    """Copy of a request or response with sensitive values redacted."""
+    if isinstance(value, dict):
+        return {name: redact(item, name) for name, item in value.items()}
+    if isinstance(value, list):
+        if key == "ExecutionParameters":
+            return ["?" for _ in value]
+        return [redact(item, key) for item in value]
+    if not isinstance(value, str):
+        return value
+    if key in MASKED_KEYS:
+        return "x" * len(value)
+    if key in SQL_KEYS:
+        return normalize_query(value)
+    if key in SECRET_KEYS:
+        return REDACTED
+    if key in LOCATION_KEYS and value.startswith("s3://"):
+        return f"s3://{REDACTED}/"
+    return value
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"$datetime": value.isoformat()}
+    raise TypeError(f"Cannot record value of type {type(value).__name__}")
+
+
+def _decode(value: Dict[str, Any]) -> Any:
+    if set(value) == {"$datetime"}:
+        return datetime.fromisoformat(value["$datetime"])
+    return value
+
+
+class SessionRecorder:
+    """Appends AWS calls to a JSON Lines session file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.calls = 0
+        self._started = time.monotonic()
+        self._lock = threading.Lock()
+        # Line buffered, so a session survives the server being stopped
+        self._file = open(path, "a", encoding="utf-8", buffering=1)
+        logger.info(f"Recording AWS calls to {path}")
+
+    def record(
+        self,
+        service: str,
+        region: str,
+        operation: str,
+        params: Dict[str, Any],
+        started: float,
+        duration: float,
+        response: Any = None,
+        error: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Append one call (safe to call from worker threads)."""
+        event = {
+            "t": round(started - self._started, 6),
+            "duration": round(duration, 6),
+            "service": service,
+            "region": region,
+            "operation": operation,
+            "params": redact(params),
+            "response": redact(response),
+            "error": error,
+        }
+        line = json.dumps(event, default=_encode)
+        with self._lock:
+            if self._file.closed:
+                # Calls still finishing while the server shuts down
+                return
+            self._file.write(line + "\n")
+            self.calls += 1
+
+    def close(self) -> None:
+        """Flush and close the session file (later calls are not recorded)."""
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+                logger.info(f"Recorded {self.calls} AWS calls to {self.path}")
+
+
+class RecordingClient:
+    """Proxy for a boto3 client that records every operation call."""
+
+    def __init__(self, client: Any, service: str, recorder: SessionRecorder):
+        self._client = client
+        self._service = service
+        self._recorder = recorder
+        self.meta = client.meta
+
+    def __getattr__(self, operation: str) -> Any:
+        method = getattr(self._client, operation)
+        if operation.startswith("_") or not callable(method):
+            return method
+
+        def call(**params: Any) -> Any:
+            started = time.monotonic()
+            try:
+                response = method(**params)
+            except ClientError as e:
+                self._recorder.record(
+                    self._service,
+                    self.meta.region_name,
+                    operation,
+                    params,
+                    started,
+                    time.monotonic() - started,
+                    error=dict(e.response.get("Error", {})),
+                )
+                raise
+            self._recorder.record(
+                self._service,
+                self.meta.region_name,
+                operation,
+                params,
+                started,
+                time.monotonic() - started,
+                response=response,
+            )
+            return response
+
+        return call
+
+
+class ReplayError(Exception):
+    """A replayed session has no recorded call left for a request."""
+
+
+class ReplayMeta:
+    """Stands in for a boto3 client's `meta` (the rate limiter reads the region)."""
+
+    def __init__(self, region_name: str):
+        self.region_name = region_name
+
+
+class ReplaySession:
+    """
+    Recorded calls served back per (service, region, operation), in recorded order.
+
+    With speed set, each call returns an awaitable that takes its recorded duration
+    divided by speed (ApiRateLimiter awaits it); without it, calls return immediately.
+    """
+
+    def __init__(self, events: List[Dict[str, Any]], speed: Optional[float] = None):
+        if speed is not None and speed <= 0:
+            raise ValueError("Replay speed must be positive")
+        self.speed = speed
+        self.replayed = 0
+        self._queues: Dict[Tuple[str, str, str], Deque[Dict[str, Any]]] = defaultdict(deque)
+        self._lock = threading.Lock()
+        for event in events:
+            self._queues[(event["service"], event["region"], event["operation"])].append(event)
+
+    @classmethod
+    def load(cls, path: str, speed: Optional[float] = None) -> "ReplaySession":
+        """Read a session file written by SessionRecorder."""
+        with open(path, encoding="utf-8") as session_file:
+            events = [
+                json.loads(line, object_hook=_decode) for line in session_file if line.strip()
+            ]
+        logger.info(f"Loaded {len(events)} recorded AWS calls from {path}")
+        return cls(events, speed)
+
+    @property
+    def remaining(self) -> int:
+        """Recorded calls not replayed yet."""
+        return sum(len(queue) for queue in self._queues.values())
+
+    def client(self, service: str, region: str) -> "ReplayClient":
+        """A client serving this session's calls for one service and region."""
+        return ReplayClient(self, service, region)
+
+    def next_call(self, service: str, region: str, operation: str) -> Dict[str, Any]:
+        """
+        Take the next recorded call of an operation.
+
+        Raises:
+            ReplayError: If the session has no such call left
+        """
+        with self._lock:
+            queue = self._queues.get((service, region, operation))
+            if not queue:
+                raise ReplayError(f"No recorded {service} {operation} call left in {region}")
+            self.replayed += 1
+            return queue.popleft()
+
+
+class ReplayClient:
+    """Serves recorded responses in place of a boto3 client."""
+
+    def __init__(self, session: ReplaySession, service: str, region: str):
+        self._session = session
+        self._service = service
+        self.meta = ReplayMeta(region)
+
+    def __getattr__(self, operation: str) -> Callable[..., Any]:
+        if operation.startswith("_"):
+            raise AttributeError(operation)
+
+        def respond(event: Dict[str, Any]) -> Any:
+            if event["error"] is not None:
+                raise ClientError({"Error": event["error"]}, operation)
+            return event["response"]
+
+        async def paced(event: Dict[str, Any], delay: float) -> Any:
+            await asyncio.sleep(delay)
+            return respond(event)
+
+        def call(**params: Any) -> Any:
+            event = self._session.next_call(self._service, self.meta.region_name, operation)
+            if self._session.speed:
+                # Waited out by the caller, so other calls proceed meanwhile
+                return paced(event, event["duration"] / self._session.speed)
+            return respond(event)
+
+        return call
@@ -0,0 +1,285 @@
+"""
+Result paging for AWS Athena MCP Server.
+
+Buffers decoded GetQueryResults pages, hands out rows under row-count and
+serialized-size budgets, and encodes resumable cursors into the result.
+"""
+
+import asyncio
+import base64
+import json
+import logging
+import math
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .spill import SpillFile, SpillStore
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# GetQueryResults returns at most this many rows per call
+MAX_PAGE_ROWS = 1000
+
+# Rough conversion used for token budgets (JSON averages ~4 bytes per token)
+BYTES_PER_TOKEN = 4
+
+# Assumed serialized row size before any rows of a result have been seen
+DEFAULT_ROW_BYTES = 200
+
+
+def byte_budget(max_bytes: Optional[int], max_tokens: Optional[int]) -> Optional[int]:
+    """Combine a byte budget and an approximate token budget into one byte budget."""
+    limits = []
+    if max_bytes is not None:
+        limits.append(max_bytes)
+    if max_tokens is not None:
+        limits.append(max_tokens * BYTES_PER_TOKEN)
+    return min(limits) if limits else None
+
+
+def row_size(row: Dict[str, Any]) -> int:
+    """Approximate size of a row once serialized in an indented JSON response."""
+    # Compact JSON plus the indentation and newlines json.dumps(indent=2) adds per field
+    return len(json.dumps(row)) + 8 * len(row) + 8
+
+
+def decode_rows(
+    rows_data: Sequence[Dict[str, Any]], columns: List[str]
+) -> Tuple[List[Dict[str, Any]], List[int]]:
+    """Decode GetQueryResults rows into dicts, with their serialized sizes."""
+    rows = []
+    sizes = []
+    for row_data in rows_data:
+        row = {}
+        for i, data in enumerate(row_data.get("Data", [])):
+            if i < len(columns):
+                row[columns[i]] = data.get("VarCharValue")
+        rows.append(row)
+        sizes.append(row_size(row))
+    return rows, sizes
+
+
+def encode_cursor(next_token: Optional[str], offset: int) -> str:
+    """Encode a position as an Athena page token plus a row offset within that page."""
+    payload = json.dumps({"t": next_token, "o": offset}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[str], int]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        next_token, offset = payload["t"], int(payload["o"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError("Invalid result cursor") from e
+    if offset < 0 or not (next_token is None or isinstance(next_token, str)):
+        raise ValueError("Invalid result cursor")
+    return next_token, offset
+
+
+class ResultBuffer:
+    """Decoded result rows of one execution, fetched page by page from a start token."""
+
+    def __init__(
+        self,
+        start_token: Optional[str] = None,
+        bytes_scanned: int = 0,
+        execution_time_ms: int = 0,
+    ):
+        self.start_token = start_token
+        self.bytes_scanned = bytes_scanned
+        self.execution_time_ms = execution_time_ms
+        self.columns: List[str] = []
+        self.column_types: Dict[str, str] = {}
+        self._rows: List[Dict[str, Any]] = []
+        self._row_sizes: List[int] = []
+        self.pages: List[Tuple[int, Optional[str]]] = []  # (first row index, page token)
+        self.next_token: Optional[str] = start_token
+        self.complete = False
+        self.size = 500
+        self.spilled: Optional[SpillFile] = None
+        # Held while pages are fetched and appended, or the buffer is spilled
+        self.lock = asyncio.Lock()
+
+    @classmethod
+    def from_spill(cls, spill_file: SpillFile) -> "ResultBuffer":
+        """A complete buffer serving the rows of a spill file."""
+        metadata = spill_file.metadata
+        buffer = cls(None, metadata.get("bytes_scanned", 0), metadata.get("execution_time_ms", 0))
+        buffer.columns = spill_file.columns
+        buffer.column_types = spill_file.column_types
+        buffer.pages = [(first_row, token) for first_row, token in metadata.get("pages", [])]
+        buffer.next_token = None
+        buffer.complete = True
+        buffer._attach(spill_file)
+        return buffer
+
+    @property
+    def rows(self) -> Sequence[Dict[str, Any]]:
+        """Buffered rows, in memory or decoded from the spill file on access."""
+        return self.spilled.rows if self.spilled is not None else self._rows
+
+    @property
+    def row_sizes(self) -> Sequence[int]:
+        """Serialized size of each buffered row."""
+        return self.spilled.row_sizes if self.spilled is not None else self._row_sizes
+
+    def spill(self, store: SpillStore, key: str) -> bool:
+        """
+        Move the rows of a complete buffer that starts at the first row to a spill file.
+
+        Returns:
+            True if the rows are now served from disk
+        """
+        if not self.spillable:
+            return False
+        spill_file = store.spill(
+            key, self.columns, self.column_types, self._rows, self._row_sizes, self._metadata()
+        )
+        if spill_file is None:
+            return False
+        self._attach(spill_file)
+        return True
+
+    async def spill_cooperatively(self, store: SpillStore, key: str, chunk_rows: int) -> bool:
+        """spill(), yielding to the event loop after each chunk of rows written."""
+        if not self.spillable:
+            return False
+        spill_file = await store.spill_cooperatively(
+            key,
+            self.columns,
+            self.column_types,
+            self._rows,
+            self._row_sizes,
+            self._metadata(),
+            chunk_rows,
+        )
+        if spill_file is None:
+            return False
+        self._attach(spill_file)
+        return True
+
+    @property
+    def spillable(self) -> bool:
+        """True if the buffer is complete from the first row and still in memory."""
+        return self.complete and self.from_start and self.spilled is None
+
+    def _metadata(self) -> Dict[str, Any]:
+        return {
+            "bytes_scanned": self.bytes_scanned,
+            "execution_time_ms": self.execution_time_ms,
+            "pages": self.pages,
+        }
+
+    def _attach(self, spill_file: SpillFile) -> None:
+        self.spilled = spill_file
+        self._rows = []
+        self._row_sizes = []
+        self.size = (
+            500
+            + sum(len(column) + 50 for column in self.columns)
+            + 100 * len(self.pages)
+            + spill_file.index_bytes
+        )
+
+    @property
+    def from_start(self) -> bool:
+        """True if the buffer holds the result from its first row."""
+        return self.start_token is None
+
+    def add_page(self, response: Dict[str, Any]) -> None:
+        """Decode a GetQueryResults response and append its rows."""
+        rows, sizes = decode_rows(self.page_rows(response), self.columns)
+        self.append_page(response, rows, sizes)
+
+    def page_rows(self, response: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Raw data rows of a GetQueryResults response, without the header row, taking
+        the column names from the first page.
+        """
+        if self.spilled is not None:
+            raise ValueError("Cannot add pages to a spilled result")
+        result_set = response.get("ResultSet", {})
+        if not self.columns:
+            column_info = result_set.get("ResultSetMetadata", {}).get("ColumnInfo", [])
+            self.columns = [col.get("Name", "") for col in column_info]
+            self.column_types = {col.get("Name", ""): col.get("Type", "") for col in column_info}
+            self.size += sum(len(column) + 50 for column in self.columns)
+
+        # The first page of a SELECT starts with a header row
+        rows_data: List[Dict[str, Any]] = result_set.get("Rows", [])
+        first_page = not self.pages and self.from_start
+        start_index = 1 if first_page and rows_data and self.columns else 0
+        return rows_data[start_index:]
+
+    def append_page(
+        self, response: Dict[str, Any], rows: List[Dict[str, Any]], sizes: List[int]
+    ) -> None:
+        """Append the rows decoded from a response's page_rows."""
+        self.pages.append((len(self._rows), self.next_token))
+        self._rows.extend(rows)
+        self._row_sizes.extend(sizes)
+        self.size += 2 * sum(sizes)
+
+        self.next_token = response.get("NextToken")
+        self.complete = not self.next_token
+
+    def position(self, page_token: Optional[str], offset: int) -> Optional[int]:
+        """Row index of a cursor position, or None if that page is not buffered."""
+        for first_row, token in self.pages:
+            if token == page_token:
+                return first_row + offset
+        if page_token == self.next_token and not self.complete:
+            return len(self.rows) + offset
+        return None
+
+    def cursor_at(self, index: int) -> str:
+        """Cursor that resumes the result at a buffered row index."""
+        if index >= len(self.rows):
+            return encode_cursor(self.next_token, index - len(self.rows))
+        first_row, token = max(page for page in self.pages if page[0] <= index)
+        return encode_cursor(token, index - first_row)
+
+    def take(self, start: int, max_rows: int, max_bytes: Optional[int]) -> Tuple[int, int, bool]:
+        """
+        Count buffered rows from start that fit the budgets.
+
+        At least one row is taken so a single oversized row cannot stall paging.
+
+        Returns:
+            (rows taken, their serialized bytes, whether a budget was reached)
+        """
+        count = used = 0
+        for size in self.row_sizes[start:]:
+            if count >= max_rows:
+                return count, used, True
+            if max_bytes is not None and count and used + size > max_bytes:
+                return count, used, True
+            count += 1
+            used += size
+        return count, used, count >= max_rows
+
+    def mean_row_size(self) -> float:
+        """Mean serialized size of the buffered rows."""
+        return sum(self.row_sizes) / len(self.row_sizes) if self.row_sizes else 0.0
+
+    def next_page_size(
+        self, wanted_rows: int, remaining_bytes: Optional[int], skip_rows: int = 0
+    ) -> int:
+        """
+        Rows to request next, sized from the observed row width to avoid over-fetching.
+
+        skip_rows counts rows still to be fetched before the wanted ones, when resuming
+        at an offset within a page that is not buffered.
+        """
+        size = min(MAX_PAGE_ROWS, wanted_rows + skip_rows)
+        if remaining_bytes is not None and self.row_sizes:
+            size = min(size, math.ceil(remaining_bytes / self.mean_row_size()) + 1 + skip_rows)
+        if not self.pages and self.from_start:
+            size += 1  # Header row
+        return max(1, min(MAX_PAGE_ROWS, size))
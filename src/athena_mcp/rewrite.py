@@ -0,0 +1,321 @@
+"""
+SQL rewriting helpers for AWS Athena MCP Server.
+
+Lightweight, tokenizer-based rewrites for exploratory queries: LIMIT pushdown
+and TABLESAMPLE on table references. Only SELECT/WITH statements are rewritten.
+"""
+
+import logging
+import re
+from typing import List, Optional, Set, Tuple
+
+from .models import QueryRequest, SampleMethod
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+_TOKEN_PATTERN = re.compile(
+    r"""
+    '(?:[^']|'')*'            # string literal
+    |"(?:[^"]|"")*"           # quoted identifier
+    |`[^`]*`                  # backtick identifier
+    |[A-Za-z_][A-Za-z0-9_$]*  # word
+    |\d+(?:\.\d*)?            # number
+    |\S                       # any other single character
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+# Functions whose value depends on when the query runs, so results cannot be reused
+VOLATILE_FUNCTIONS = {
+    "current_date",
+    "current_time",
+    "current_timestamp",
+    "current_timezone",
+    "localtime",
+    "localtimestamp",
+    "now",
+    "rand",
+    "random",
+    "uuid",
+}
+
+# Words that can follow a relation but are never an alias
+_RELATION_TERMINATORS = {
+    "where",
+    "group",
+    "order",
+    "limit",
+    "having",
+    "join",
+    "inner",
+    "left",
+    "right",
+    "full",
+    "cross",
+    "natural",
+    "on",
+    "using",
+    "union",
+    "intersect",
+    "except",
+    "window",
+    "offset",
+    "fetch",
+    "tablesample",
+    "for",
+    "as",
+}
+
+# Words that end a comma-separated FROM list
+_FROM_LIST_TERMINATORS = {
+    "where",
+    "group",
+    "order",
+    "having",
+    "limit",
+    "on",
+    "union",
+    "intersect",
+    "except",
+    "window",
+}
+
+Token = Tuple[str, int, int]  # (text, start, end)
+
+
+def tokenize(query: str) -> List[Token]:
+    """Split a query into (text, start, end) tokens."""
+    return [(m.group(0), m.start(), m.end()) for m in _TOKEN_PATTERN.finditer(query)]
+
+
+def _is_identifier(text: str) -> bool:
+    return bool(text) and (text[0].isalpha() or text[0] in '_"`')
+
+
+def is_select(query: str) -> bool:
+    """Return True if the statement is a SELECT (or WITH ... SELECT) query."""
+    tokens = tokenize(query)
+    return bool(tokens) and tokens[0][0].lower() in ("select", "with", "values")
+
+
+def has_limit(query: str) -> bool:
+    """Return True if the outermost query already limits its rows."""
+    depth = 0
+    for text, _, _ in tokenize(query):
+        if text == "(":
+            depth += 1
+        elif text == ")":
+            depth -= 1
+        elif depth == 0 and text.lower() in ("limit", "fetch"):
+            return True
+    return False
+
+
+def add_limit(query: str, max_rows: int) -> str:
+    """Append a LIMIT clause to a query that has none."""
+    if has_limit(query):
+        return query
+    return f"{query.rstrip().rstrip(';').rstrip()}\nLIMIT {max_rows}"
+
+
+def _cte_names(tokens: List[Token]) -> Set[str]:
+    """Collect names defined in a leading WITH clause."""
+    names: Set[str] = set()
+    depth = 0
+    expect_name = False
+    for text, _, _ in tokens:
+        lower = text.lower()
+        if text == "(":
+            depth += 1
+        elif text == ")":
+            depth -= 1
+        elif depth == 0 and (lower in ("with", "recursive") or text == ","):
+            expect_name = True
+            continue
+        elif expect_name and _is_identifier(text) and depth == 0:
+            names.add(text.strip('"`').lower())
+        elif depth == 0 and lower == "select":
+            break
+        expect_name = False
+    return names
+
+
+def _closing(tokens: List[Token], i: int) -> Optional[int]:
+    """Index of the parenthesis closing the one at token i."""
+    depth = 0
+    for j in range(i, len(tokens)):
+        if tokens[j][0] == "(":
+            depth += 1
+        elif tokens[j][0] == ")":
+            depth -= 1
+            if depth == 0:
+                return j
+    return None
+
+
+def cte_definitions(query: str) -> List[Tuple[str, int, int]]:
+    """
+    CTEs of a leading, non-recursive WITH clause.
+
+    Returns:
+        (lowercase name, body start, body end) per CTE, the body being the text
+        between the parentheses after AS
+    """
+    tokens = tokenize(query)
+    if len(tokens) < 2 or tokens[0][0].lower() != "with" or tokens[1][0].lower() == "recursive":
+        return []
+
+    definitions: List[Tuple[str, int, int]] = []
+    i = 1
+    while i < len(tokens) and _is_identifier(tokens[i][0]):
+        name = tokens[i][0].strip('"`').lower()
+        j = i + 1
+        if j < len(tokens) and tokens[j][0] == "(":
+            # Column list
+            column_list_end = _closing(tokens, j)
+            if column_list_end is None:
+                break
+            j = column_list_end + 1
+        if j + 1 >= len(tokens) or tokens[j][0].lower() != "as":
+            break
+        if tokens[j + 1][0] != "(":
+            break
+        close = _closing(tokens, j + 1)
+        if close is None:
+            break
+        definitions.append((name, tokens[j + 1][2], tokens[close][1]))
+        if close + 1 >= len(tokens) or tokens[close + 1][0] != ",":
+            break
+        i = close + 2
+    return definitions
+
+
+class TableReference:
+    """A base table named in a FROM or JOIN clause."""
+
+    def __init__(self, parts: List[str], depth: int, end: int, sampled: bool):
+        self.parts = parts  # Name parts as written, e.g. ["db", "orders"]
+        self.depth = depth  # Parenthesis depth of the clause naming it
+        self.end = end  # Offset after the name and alias
+        self.sampled = sampled  # Already followed by TABLESAMPLE
+
+    @property
+    def table(self) -> str:
+        """Unquoted, lowercase table name."""
+        return self.parts[-1].strip('"`').lower()
+
+    @property
+    def database(self) -> Optional[str]:
+        """Unquoted, lowercase database name, if the reference is qualified."""
+        return self.parts[-2].strip('"`').lower() if len(self.parts) > 1 else None
+
+
+def table_references(query: str) -> List[TableReference]:
+    """Base tables referenced in FROM/JOIN clauses (CTEs, subqueries and UNNEST excluded)."""
+    tokens = tokenize(query)
+    ctes = _cte_names(tokens)
+    references: List[TableReference] = []
+
+    # Depths at which we are inside a comma-separated FROM list
+    from_depths: Set[int] = set()
+    # Whether each open parenthesis holds a query; FROM inside function calls such as
+    # extract(year FROM ts) or trim(both ' ' FROM name) does not name a relation
+    in_query = [True]
+    depth = 0
+    for i, (text, _, _) in enumerate(tokens):
+        lower = text.lower()
+
+        if text == "(":
+            # A parenthesized join (FROM (a JOIN b ON ...)) holds relations without a SELECT
+            in_query.append(i > 0 and tokens[i - 1][0].lower() in ("from", "join"))
+            depth += 1
+            continue
+        if text == ")":
+            from_depths.discard(depth)
+            depth -= 1
+            if len(in_query) > 1:
+                in_query.pop()
+            continue
+        if lower in ("select", "with", "values"):
+            in_query[-1] = True
+        if not in_query[-1]:
+            continue
+
+        starts_relation = lower in ("from", "join") or (text == "," and depth in from_depths)
+        if lower == "from":
+            from_depths.add(depth)
+        elif lower in _FROM_LIST_TERMINATORS:
+            from_depths.discard(depth)
+
+        if starts_relation:
+            reference = _relation(tokens, i + 1, ctes, depth)
+            if reference is not None:
+                references.append(reference)
+    return references
+
+
+def add_tablesample(query: str, method: SampleMethod, percent: float) -> str:
+    """Add TABLESAMPLE to every base table referenced in FROM/JOIN clauses."""
+    clause = f" TABLESAMPLE {method.value} ({percent:g})"
+    rewritten = query
+    for reference in reversed(table_references(query)):
+        if not reference.sampled:
+            rewritten = rewritten[: reference.end] + clause + rewritten[reference.end :]
+    return rewritten
+
+
+def _relation(tokens: List[Token], i: int, ctes: Set[str], depth: int) -> Optional[TableReference]:
+    """Return the table reference starting at token i, if it names a base table."""
+    if i >= len(tokens) or not _is_identifier(tokens[i][0]):
+        return None
+
+    # Dotted name: catalog.schema.table
+    name_parts = [tokens[i][0]]
+    j = i + 1
+    while j + 1 < len(tokens) and tokens[j][0] == "." and _is_identifier(tokens[j + 1][0]):
+        name_parts.append(tokens[j + 1][0])
+        j += 2
+
+    # Function calls (UNNEST(...), table functions) and CTE references are not tables
+    if j < len(tokens) and tokens[j][0] == "(":
+        return None
+    if len(name_parts) == 1 and name_parts[0].strip('"`').lower() in ctes | {"unnest", "lateral"}:
+        return None
+
+    end = tokens[j - 1][2]
+
+    # Optional alias, with or without AS
+    if j < len(tokens) and tokens[j][0].lower() == "as":
+        j += 1
+    if (
+        j < len(tokens)
+        and _is_identifier(tokens[j][0])
+        and tokens[j][0].lower() not in _RELATION_TERMINATORS
+    ):
+        end = tokens[j][2]
+        j += 1
+
+    sampled = j < len(tokens) and tokens[j][0].lower() == "tablesample"
+    return TableReference(name_parts, depth, end, sampled)
+
+
+def rewrite_query(request: QueryRequest) -> str:
+    """
+    Apply the exploratory rewrites requested for a query.
+
+    Returns:
+        The SQL that should actually be executed (unchanged if no rewrite applies)
+    """
+    query = request.query
+    if not is_select(query):
+        return query
+
+    if request.sample_percent is not None:
+        query = add_tablesample(query, request.sample_method, request.sample_percent)
+    if request.exploratory:
+        query = add_limit(query, request.max_rows)
+
+    if query != request.query:
+        logger.debug(f"Rewrote exploratory query: {query[:200]}...")
+    return query
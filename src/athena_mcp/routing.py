@@ -0,0 +1,122 @@
+"""
+Workgroup routing for AWS Athena MCP Server.
+
+Dispatches queries across a pool of workgroups (optionally in several regions)
+by current load, and remembers which workgroup ran each execution.
+"""
+
+import logging
+import time
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List, Optional
+
+from .config import WorkgroupConfig
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+class WorkgroupRoute:
+    """Runtime state of one workgroup in the pool."""
+
+    # In-flight executions that were never polled to completion are dropped after this
+    STALE_AFTER_SECONDS = 3600
+
+    def __init__(self, workgroup: WorkgroupConfig, client: Any):
+        self.workgroup = workgroup
+        self.client = client
+        self._in_flight: Dict[str, float] = {}  # execution ID -> start time
+        self._queue_times_ms: Deque[int] = deque(maxlen=20)
+
+    @property
+    def name(self) -> Optional[str]:
+        """Workgroup name (None for the account default)."""
+        return self.workgroup.name
+
+    @property
+    def key(self) -> str:
+        """Unique identifier of this workgroup across regions."""
+        return f"{self.workgroup.region}/{self.name or 'primary'}"
+
+    @property
+    def in_flight(self) -> int:
+        """Number of executions started here that have not finished."""
+        cutoff = time.time() - self.STALE_AFTER_SECONDS
+        for execution_id in [i for i, started in self._in_flight.items() if started < cutoff]:
+            del self._in_flight[execution_id]
+        return len(self._in_flight)
+
+    @property
+    def mean_queue_ms(self) -> float:
+        """Mean queue time of recently finished executions."""
+        if not self._queue_times_ms:
+            return 0.0
+        return sum(self._queue_times_ms) / len(self._queue_times_ms)
+
+    def has_capacity(self) -> bool:
+        """True if the workgroup is below its concurrency limit."""
+        limit = self.workgroup.max_concurrent
+        return limit is None or self.in_flight < limit
+
+    def load(self) -> float:
+        """Load score: in-flight share of capacity plus recent queueing (seconds)."""
+        limit = self.workgroup.max_concurrent or 1
+        return self.in_flight / limit + self.mean_queue_ms / 1000
+
+    def started(self, execution_id: str) -> None:
+        """Record an execution dispatched to this workgroup."""
+        self._in_flight[execution_id] = time.time()
+
+    def finished(self, execution_id: str, queue_time_ms: Optional[int]) -> None:
+        """Record an execution reaching a terminal state (idempotent)."""
+        if self._in_flight.pop(execution_id, None) is not None and queue_time_ms is not None:
+            self._queue_times_ms.append(queue_time_ms)
+
+
+class WorkgroupRouter:
+    """Least-loaded workgroup selection with execution affinity."""
+
+    MAX_AFFINITY_ENTRIES = 10000
+
+    def __init__(self, routes: List[WorkgroupRoute]):
+        if not routes:
+            raise ValueError("At least one workgroup route is required")
+        self.routes = routes
+        self._affinity: "OrderedDict[str, WorkgroupRoute]" = OrderedDict()
+
+    @property
+    def default(self) -> WorkgroupRoute:
+        """The first configured workgroup."""
+        return self.routes[0]
+
+    def select(self) -> WorkgroupRoute:
+        """Pick the least-loaded workgroup, preferring ones below their limit."""
+        eligible = [route for route in self.routes if route.has_capacity()] or self.routes
+        route = min(eligible, key=lambda r: r.load())
+        logger.debug(f"Routing query to workgroup {route.name} (load {route.load():.2f})")
+        return route
+
+    def get(self, key: str) -> WorkgroupRoute:
+        """Return the route with the given key (default if unknown)."""
+        for route in self.routes:
+            if route.key == key:
+                return route
+        return self.default
+
+    def bind(self, execution_id: str, route: WorkgroupRoute) -> None:
+        """Remember which workgroup an execution was started in."""
+        route.started(execution_id)
+        self._affinity[execution_id] = route
+        self._affinity.move_to_end(execution_id)
+        while len(self._affinity) > self.MAX_AFFINITY_ENTRIES:
+            self._affinity.popitem(last=False)
+
+    def route_for(self, execution_id: str) -> WorkgroupRoute:
+        """Return the workgroup that ran an execution (default if unknown)."""
+        return self._affinity.get(execution_id, self.default)
+
+    def finished(self, execution_id: str, queue_time_ms: Optional[int] = None) -> None:
+        """Record that an execution reached a terminal state."""
+        route = self._affinity.get(execution_id)
+        if route is not None:
+            route.finished(execution_id, queue_time_ms)
@@ -0,0 +1,142 @@
+"""
+Query execution profiling for AWS Athena MCP Server.
+
+Condenses Athena execution statistics and runtime statistics (the stage tree
+with rows and bytes per stage) into a compact profile with a short diagnosis.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+from .models import QueryProfile, StageProfile
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+MAX_PLAN_OPERATORS = 6
+
+
+def _plan_operators(plan: Dict[str, Any]) -> List[str]:
+    """Operator names of a stage plan in pre-order, truncated."""
+    operators: List[str] = []
+    stack = [plan]
+    while stack and len(operators) < MAX_PLAN_OPERATORS:
+        node = stack.pop()
+        if node.get("Name"):
+            operators.append(node["Name"])
+        stack.extend(reversed(node.get("Children", [])))
+    return operators
+
+
+def _flatten_stages(stage: Dict[str, Any], depth: int = 0) -> List[StageProfile]:
+    """Flatten the stage tree depth-first, recording each stage's depth."""
+    stages = [
+        StageProfile(
+            stage_id=stage.get("StageId", 0),
+            depth=depth,
+            state=stage.get("State", ""),
+            execution_time_ms=stage.get("ExecutionTime", 0),
+            input_rows=stage.get("InputRows", 0),
+            input_bytes=stage.get("InputBytes", 0),
+            output_rows=stage.get("OutputRows", 0),
+            output_bytes=stage.get("OutputBytes", 0),
+            operators=_plan_operators(stage.get("QueryStagePlan", {})),
+        )
+    ]
+    for sub_stage in stage.get("SubStages", []):
+        stages.extend(_flatten_stages(sub_stage, depth + 1))
+    return stages
+
+
+def _diagnose(
+    timeline: Dict[str, int], bytes_scanned: int, stages: List[StageProfile]
+) -> List[str]:
+    """Short, heuristic explanations of where the time went."""
+    findings: List[str] = []
+    total = timeline.get("total_ms") or 0
+    if not total:
+        return findings
+
+    queue = timeline.get("queue_ms", 0)
+    planning = timeline.get("planning_ms", 0)
+    engine = timeline.get("engine_ms", 0)
+
+    if queue / total > 0.3:
+        findings.append(
+            f"queued: {queue}ms of {total}ms waiting for capacity; consider another workgroup"
+        )
+    if planning / total > 0.3:
+        findings.append(
+            f"planning: {planning}ms spent planning; many partitions or files may need pruning"
+        )
+
+    leaves = [stage for stage in stages if stage.input_bytes and "TableScan" in stage.operators]
+    leaves = leaves or [stage for stage in stages if stage.depth == max(s.depth for s in stages)]
+    if engine / total > 0.5 and leaves:
+        scan = max(leaves, key=lambda stage: stage.execution_time_ms)
+        slowest = max(stages, key=lambda stage: stage.execution_time_ms)
+        if scan is slowest or scan.execution_time_ms >= 0.5 * slowest.execution_time_ms:
+            findings.append(
+                f"scan-bound: stage {scan.stage_id} read {bytes_scanned} bytes; "
+                "add partition filters, project fewer columns or use columnar formats"
+            )
+        else:
+            findings.append(
+                f"compute-bound: stage {slowest.stage_id} dominates execution "
+                f"({slowest.execution_time_ms}ms); check joins and aggregations"
+            )
+
+    return findings
+
+
+def build_query_profile(
+    query_execution_id: str,
+    execution: Dict[str, Any],
+    runtime_statistics: Optional[Dict[str, Any]],
+) -> QueryProfile:
+    """
+    Build a compact profile from GetQueryExecution and GetQueryRuntimeStatistics responses.
+
+    Args:
+        query_execution_id: The query execution ID
+        execution: The QueryExecution object
+        runtime_statistics: The QueryRuntimeStatistics object, if available
+    """
+    statistics = execution.get("Statistics", {})
+    timeline = {
+        "queue_ms": statistics.get("QueryQueueTimeInMillis", 0),
+        "planning_ms": statistics.get("QueryPlanningTimeInMillis", 0),
+        "engine_ms": statistics.get("EngineExecutionTimeInMillis", 0),
+        "service_processing_ms": statistics.get("ServiceProcessingTimeInMillis", 0),
+        "total_ms": statistics.get("TotalExecutionTimeInMillis", 0),
+    }
+    bytes_scanned = statistics.get("DataScannedInBytes", 0)
+
+    rows: Dict[str, int] = {}
+    stages: List[StageProfile] = []
+    if runtime_statistics:
+        rows = {
+            "input_rows": runtime_statistics.get("Rows", {}).get("InputRows", 0),
+            "input_bytes": runtime_statistics.get("Rows", {}).get("InputBytes", 0),
+            "output_rows": runtime_statistics.get("Rows", {}).get("OutputRows", 0),
+            "output_bytes": runtime_statistics.get("Rows", {}).get("OutputBytes", 0),
+        }
+        output_stage = runtime_statistics.get("OutputStage")
+        if output_stage:
+            stages = _flatten_stages(output_stage)
+
+    profile = QueryProfile(
+        query_execution_id=query_execution_id,
+        state=execution.get("Status", {}).get("State", "UNKNOWN"),
+        bytes_scanned=bytes_scanned,
+        result_reused=statistics.get("ResultReuseInformation", {}).get(
+            "ReusedPreviousResult", False
+        ),
+        timeline=timeline,
+        rows=rows,
+        stages=stages,
+        findings=_diagnose(timeline, bytes_scanned, stages),
+    )
+
+    logger.debug(f"Built profile for query {query_execution_id} with {len(stages)} stages")
+    return profile
@@ -0,0 +1,182 @@
+"""
+Schema search for AWS Athena MCP Server.
+
+Simple inverted index over database, table and column names, types and
+comments, kept up to date table by table as the schema catalog loads pages.
+"""
+
+import bisect
+import hashlib
+import heapq
+import logging
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .models import SchemaMatch, TableInfo
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# (database, table)
+TableKey = Tuple[str, str]
+
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+CAMEL_BOUNDARY = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
+MIN_PREFIX_LENGTH = 2
+
+# Words in natural-language queries that never identify a table or column
+STOP_WORDS = {"a", "an", "and", "by", "for", "in", "of", "on", "or", "the", "to", "with"}
+
+
+def tokenize(text: str) -> Set[str]:
+    """Lowercase tokens of an identifier or phrase: the whole name and its parts."""
+    tokens: Set[str] = set()
+    for word in text.split():
+        word = word.strip(".,;:()\"'`")
+        if not word:
+            continue
+        tokens.add(word.lower())
+        tokens.update(WORD_PATTERN.findall(CAMEL_BOUNDARY.sub("_", word).lower()))
+    return tokens
+
+
+def _signature(table: TableInfo) -> str:
+    """Digest of a table's schema, to skip reindexing unchanged tables."""
+    parts = [f"{c['name']}:{c.get('type', '')}:{c.get('comment', '')}" for c in table.columns]
+    return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()
+
+
+class SchemaIndex:
+    """Inverted index from tokens to tables, and to the columns of each table."""
+
+    def __init__(self) -> None:
+        # token -> table -> matching columns (None when the table name itself matches)
+        self._postings: Dict[str, Dict[TableKey, Set[Optional[str]]]] = defaultdict(dict)
+        self._table_tokens: Dict[TableKey, Set[str]] = {}
+        self._signatures: Dict[TableKey, str] = {}
+        self._columns: Dict[TableKey, Dict[str, str]] = {}
+        self._sorted_tokens: List[str] = []
+        self._dirty = False
+
+    def __len__(self) -> int:
+        return len(self._table_tokens)
+
+    def update_table(self, table: TableInfo) -> bool:
+        """Index a table, replacing its previous entries. Returns False if unchanged."""
+        key = (table.database.lower(), table.table_name.lower())
+        signature = _signature(table)
+        if self._signatures.get(key) == signature:
+            return False
+
+        self.remove_table(*key)
+        entries: Dict[str, Set[Optional[str]]] = defaultdict(set)
+        for token in tokenize(table.table_name) | tokenize(table.database):
+            entries[token].add(None)
+        for column in table.columns:
+            text = f"{column['name']} {column.get('type', '')} {column.get('comment', '')}"
+            for token in tokenize(text):
+                entries[token].add(column["name"])
+
+        for token, columns in entries.items():
+            self._postings[token][key] = columns
+        self._table_tokens[key] = set(entries)
+        self._signatures[key] = signature
+        self._columns[key] = {column["name"]: column.get("type", "") for column in table.columns}
+        self._dirty = True
+        return True
+
+    def remove_table(self, database: str, table_name: str) -> None:
+        """Drop a table from the index."""
+        key = (database.lower(), table_name.lower())
+        tokens = self._table_tokens.pop(key, None)
+        if tokens is None:
+            return
+        for token in tokens:
+            tables = self._postings[token]
+            tables.pop(key, None)
+            if not tables:
+                del self._postings[token]
+        self._signatures.pop(key, None)
+        self._columns.pop(key, None)
+        self._dirty = True
+
+    def retain_tables(self, database: str, table_names: Iterable[str]) -> int:
+        """Drop tables of a database that are no longer in the catalog. Returns the count."""
+        keep = {name.lower() for name in table_names}
+        stale = [key for key in self._table_tokens if key[0] == database and key[1] not in keep]
+        for key in stale:
+            self.remove_table(*key)
+        return len(stale)
+
+    def _matching_tokens(self, term: str) -> List[Tuple[str, float]]:
+        """Index tokens matching a term exactly (weight 1) or by prefix (weight 0.5)."""
+        matches = [(term, 1.0)] if term in self._postings else []
+        if len(term) < MIN_PREFIX_LENGTH:
+            return matches
+        if self._dirty:
+            self._sorted_tokens = sorted(self._postings)
+            self._dirty = False
+        start = bisect.bisect_left(self._sorted_tokens, term)
+        for token in self._sorted_tokens[start:]:
+            if not token.startswith(term):
+                break
+            if token != term:
+                matches.append((token, 0.5))
+        return matches
+
+    def search(
+        self, query: str, database: Optional[str] = None, limit: int = 20
+    ) -> List[SchemaMatch]:
+        """
+        Find tables whose names, columns, types or comments match the query words.
+
+        Each word scores 1 for an exact token match, 0.5 for a prefix match and 0.25
+        when only one of its parts matches (e.g. "id" of "customer_id"); tables are
+        ranked by their total score.
+        """
+        database = database.lower() if database else None
+        # table -> word -> (best weight, tokens matched at that weight)
+        best: Dict[TableKey, Dict[str, Tuple[float, List[str]]]] = defaultdict(dict)
+
+        for word in query.split():
+            term = word.strip(".,;:()\"'`").lower()
+            if not term or term in STOP_WORDS:
+                continue
+            candidates = self._matching_tokens(term)
+            candidates += [
+                (part, 0.25) for part in tokenize(term) - {term} if part in self._postings
+            ]
+
+            for token, weight in candidates:
+                for key in self._postings[token]:
+                    if database and key[0] != database:
+                        continue
+                    current = best[key].get(term)
+                    if current is None or weight > current[0]:
+                        best[key][term] = (weight, [token])
+                    elif weight == current[0]:
+                        current[1].append(token)
+
+        def score(key: TableKey) -> float:
+            return sum(weight for weight, _ in best[key].values())
+
+        ranked = heapq.nsmallest(limit, best, key=lambda key: (-score(key), key))
+        return [self._match(key, score(key), best[key]) for key in ranked]
+
+    def _match(
+        self, key: TableKey, score: float, terms: Dict[str, Tuple[float, List[str]]]
+    ) -> SchemaMatch:
+        matched: Set[str] = set()
+        for _, tokens in terms.values():
+            for token in tokens:
+                matched.update(name for name in self._postings[token][key] if name is not None)
+        return SchemaMatch(
+            database=key[0],
+            table_name=key[1],
+            score=round(score, 2),
+            matched_terms=sorted(terms),
+            matched_columns=[
+                {"name": name, "type": self._columns[key].get(name, "")} for name in sorted(matched)
+            ],
+        )
@@ -5,12 +5,14 @@ Simple, clean MCP server for AWS Athena integration.
 """
 
 import sys
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 
 from fastmcp import FastMCP
 
 from .athena import AthenaClient
 from .config import Config
-from .tools import register_query_tools, register_schema_tools
+from .tools import register_metrics_tools, register_query_tools, register_schema_tools
 
 
 def create_server() -> FastMCP:
@@ -32,22 +34,48 @@ def create_server() -> FastMCP:
         print(f"❌ AWS credentials error: {e}")
         sys.exit(1)
 
-    # Create MCP server
-    mcp: FastMCP = FastMCP(name="aws-athena-mcp", version="1.0.0")
-
     # Create Athena client
     athena_client = AthenaClient(config)
 
+    @asynccontextmanager
+    async def lifespan(server: FastMCP) -> AsyncIterator[None]:
+        # Prefetch schemas in the background; startup does not wait for it
+        athena_client.catalog.start()
+        try:
+            yield
+        finally:
+            await athena_client.catalog.stop()
+            if athena_client.materialized is not None:
+                await athena_client.materialized.close()
+            if athena_client.spill is not None:
+                athena_client.spill.close()
+            if athena_client.recorder is not None:
+                athena_client.recorder.close()
+
+    # Create MCP server
+    mcp: FastMCP = FastMCP(name="aws-athena-mcp", version="1.0.0", lifespan=lifespan)
+
     # Register tools
     register_query_tools(mcp, athena_client)
     register_schema_tools(mcp, athena_client)
+    register_metrics_tools(mcp, athena_client)
 
     print("✅ MCP server created with tools:")
     print("   • run_query - Execute SQL queries")
     print("   • get_status - Check query status")
     print("   • get_result - Get query results")
+    print("   • query_local - SQL over earlier results, in-process")
+    print("   • profile_result - Summarize result columns")
+    print("   • profile_query - Query execution profile")
+    print("   • query_history - Recent query executions")
     print("   • list_tables - List database tables")
     print("   • describe_table - Get table schema")
+    print("   • describe_tables - Schema digest of many tables")
+    print("   • list_partitions - List table partitions")
+    print("   • search_schema - Search tables and columns")
+    print("   • get_metrics - Server operational metrics")
+    print("   • get_memory_usage - Memory usage by category")
+    print("   • query_stats - Heaviest query shapes by cost or latency")
 
     return mcp
 
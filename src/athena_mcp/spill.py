@@ -0,0 +1,318 @@
+"""
+On-disk result spilling for AWS Athena MCP Server.
+
+Complete results that are large in memory are written to local spill files
+and read back through `mmap`, so a cached result costs a small row index in
+memory and each page served decodes only its own rows. Spill files are
+evicted least recently used first once their total size passes a limit.
+
+File layout (native byte order; files never leave the machine that wrote them):
+    magic, header length (uint32), JSON header (columns, column types, row count,
+    caller metadata),
+    row offsets ((row count + 1) x uint64), serialized row sizes (row count x uint32),
+    rows as compact JSON arrays
+"""
+
+import asyncio
+import json
+import logging
+import mmap
+import os
+import re
+import shutil
+import struct
+import tempfile
+from array import array
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Union, overload
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+MAGIC = b"ATHSPL1\n"
+_HEADER_LENGTH = struct.Struct("=I")
+
+
+class SpilledRows(Sequence[Dict[str, Any]]):
+    """Read-only rows of a spill file, decoded on access."""
+
+    def __init__(self, spill_file: "SpillFile"):
+        self._file = spill_file
+
+    def __len__(self) -> int:
+        return self._file.row_count
+
+    @overload
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[Dict[str, Any]]:
+        ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+        if isinstance(index, slice):
+            return [self._file.row(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("row index out of range")
+        return self._file.row(index)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return (self._file.row(i) for i in range(len(self)))
+
+
+class SpillFile:
+    """A memory-mapped spill file of one result."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as spill:
+            self._map = mmap.mmap(spill.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._map[: len(MAGIC)] != MAGIC:
+            self._map.close()
+            raise ValueError(f"Not a spill file: {path}")
+        position = len(MAGIC)
+        (header_length,) = _HEADER_LENGTH.unpack_from(self._map, position)
+        position += _HEADER_LENGTH.size
+        header = json.loads(self._map[position : position + header_length])
+        position += header_length
+
+        self.columns: List[str] = header["columns"]
+        self.column_types: Dict[str, str] = header["column_types"]
+        self.row_count: int = header["row_count"]
+        self.metadata: Dict[str, Any] = header.get("metadata", {})
+
+        # The index is small next to the rows, so it is copied out of the map
+        self.offsets = array("Q")
+        self.offsets.frombytes(self._map[position : position + 8 * (self.row_count + 1)])
+        position += 8 * (self.row_count + 1)
+        self.row_sizes = array("I")
+        self.row_sizes.frombytes(self._map[position : position + 4 * self.row_count])
+        self._data_start = position + 4 * self.row_count
+
+        self.rows = SpilledRows(self)
+        self.reads = 0
+
+    @property
+    def file_bytes(self) -> int:
+        """Size of the file on disk."""
+        return len(self._map)
+
+    @property
+    def index_bytes(self) -> int:
+        """Memory held by the row index."""
+        return self.offsets.itemsize * len(self.offsets) + self.row_sizes.itemsize * len(
+            self.row_sizes
+        )
+
+    def row(self, index: int) -> Dict[str, Any]:
+        """Decode one row."""
+        start = self._data_start + self.offsets[index]
+        end = self._data_start + self.offsets[index + 1]
+        self.reads += 1
+        return dict(zip(self.columns, json.loads(self._map[start:end])))
+
+    def close(self) -> None:
+        """Unmap the file."""
+        self._map.close()
+
+    @staticmethod
+    def write(
+        path: str,
+        columns: List[str],
+        column_types: Dict[str, str],
+        rows: Sequence[Dict[str, Any]],
+        row_sizes: Sequence[int],
+        metadata: Dict[str, Any],
+    ) -> None:
+        """Write rows in spill file format, encoding one row at a time."""
+        for _ in SpillFile.write_chunks(
+            path, columns, column_types, rows, row_sizes, metadata, max(len(rows), 1)
+        ):
+            pass
+
+    @staticmethod
+    def write_chunks(
+        path: str,
+        columns: List[str],
+        column_types: Dict[str, str],
+        rows: Sequence[Dict[str, Any]],
+        row_sizes: Sequence[int],
+        metadata: Dict[str, Any],
+        chunk_rows: int,
+    ) -> Iterator[int]:
+        """write(), pausing after each chunk of rows; yields the rows written so far."""
+        header = json.dumps(
+            {
+                "columns": columns,
+                "column_types": column_types,
+                "row_count": len(rows),
+                "metadata": metadata,
+            }
+        ).encode("utf-8")
+        offsets = array("Q", [0])
+        with open(path, "wb") as spill:
+            spill.write(MAGIC)
+            spill.write(_HEADER_LENGTH.pack(len(header)))
+            spill.write(header)
+            index_start = spill.tell()
+            # Offsets are known only once the rows are written; leave room and come back
+            spill.seek(offsets.itemsize * (len(rows) + 1), os.SEEK_CUR)
+            spill.write(array("I", row_sizes).tobytes())
+            for start in range(0, len(rows), chunk_rows):
+                for row in rows[start : start + chunk_rows]:
+                    data = json.dumps(
+                        [row.get(column) for column in columns], separators=(",", ":")
+                    )
+                    encoded = data.encode("utf-8")
+                    spill.write(encoded)
+                    offsets.append(offsets[-1] + len(encoded))
+                if start + chunk_rows < len(rows):
+                    yield start + chunk_rows
+            spill.seek(index_start)
+            spill.write(offsets.tobytes())
+
+
+class SpillStore:
+    """Spill files of results, bounded by total size on disk."""
+
+    def __init__(
+        self,
+        max_bytes: int,
+        directory: Optional[str] = None,
+        on_evict: Optional[Callable[[str], None]] = None,
+    ):
+        self.max_bytes = max_bytes
+        # Created on first spill; a temporary directory is removed again by close()
+        self.directory = directory
+        self._owns_directory = directory is None
+        self.on_evict = on_evict
+        self.bytes = 0
+        self.writes = 0
+        self.evictions = 0
+        self._files: "OrderedDict[str, SpillFile]" = OrderedDict()
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._files
+
+    def spill(
+        self,
+        key: str,
+        columns: List[str],
+        column_types: Dict[str, str],
+        rows: Sequence[Dict[str, Any]],
+        row_sizes: Sequence[int],
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Optional[SpillFile]:
+        """
+        Write rows to a spill file and map it, evicting older files if over the limit.
+
+        Returns:
+            The mapped file, or None if it could not be written or exceeds the limit
+        """
+        try:
+            path = self._path(key)
+            SpillFile.write(path, columns, column_types, rows, row_sizes, metadata or {})
+            spill_file = SpillFile(path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not spill result {key}: {e}")
+            return None
+        return self._add(key, path, spill_file)
+
+    async def spill_cooperatively(
+        self,
+        key: str,
+        columns: List[str],
+        column_types: Dict[str, str],
+        rows: Sequence[Dict[str, Any]],
+        row_sizes: Sequence[int],
+        metadata: Optional[Dict[str, Any]] = None,
+        chunk_rows: int = 1000,
+    ) -> Optional[SpillFile]:
+        """spill(), yielding to the event loop after each chunk of rows written."""
+        try:
+            path = self._path(key)
+            for _ in SpillFile.write_chunks(
+                path, columns, column_types, rows, row_sizes, metadata or {}, chunk_rows
+            ):
+                await asyncio.sleep(0)
+            spill_file = SpillFile(path)
+        except asyncio.CancelledError:
+            # Nothing tracks a partly written file
+            os.remove(path)
+            raise
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not spill result {key}: {e}")
+            return None
+        return self._add(key, path, spill_file)
+
+    def _path(self, key: str) -> str:
+        """Drop any older spill file of a key, and return the path to write it to."""
+        self.discard(key)
+        if self.directory is None:
+            self.directory = tempfile.mkdtemp(prefix="athena-mcp-spill-")
+        os.makedirs(self.directory, exist_ok=True)
+        return os.path.join(self.directory, re.sub(r"[^A-Za-z0-9_-]", "_", key) + ".spill")
+
+    def _add(self, key: str, path: str, spill_file: SpillFile) -> Optional[SpillFile]:
+        """Track a written spill file, unless it exceeds the limit on its own."""
+        if spill_file.file_bytes > self.max_bytes:
+            logger.debug(f"Not spilling {key}: {spill_file.file_bytes} bytes exceeds the limit")
+            spill_file.close()
+            os.remove(path)
+            return None
+
+        self._files[key] = spill_file
+        self.bytes += spill_file.file_bytes
+        self.writes += 1
+        while self.bytes > self.max_bytes:
+            evicted_key = next(iter(self._files))
+            self.discard(evicted_key)
+            self.evictions += 1
+            if self.on_evict is not None:
+                self.on_evict(evicted_key)
+
+        logger.debug(
+            f"Spilled {spill_file.row_count} rows of {key} ({spill_file.file_bytes} bytes)"
+        )
+        return spill_file
+
+    def get(self, key: str) -> Optional[SpillFile]:
+        """Return a spill file and mark it recently used."""
+        spill_file = self._files.get(key)
+        if spill_file is not None:
+            self._files.move_to_end(key)
+        return spill_file
+
+    def discard(self, key: str) -> None:
+        """Unmap and delete a spill file if present."""
+        spill_file = self._files.pop(key, None)
+        if spill_file is None:
+            return
+        self.bytes -= spill_file.file_bytes
+        spill_file.close()
+        try:
+            os.remove(spill_file.path)
+        except OSError as e:
+            logger.warning(f"Could not remove spill file {spill_file.path}: {e}")
+
+    def close(self) -> None:
+        """Delete all spill files (and the directory, if this store created it)."""
+        for key in list(self._files):
+            self.discard(key)
+        if self._owns_directory and self.directory is not None:
+            shutil.rmtree(self.directory, ignore_errors=True)
+            self.directory = None
+
+    def stats(self) -> Dict[str, int]:
+        """File, size and eviction counters."""
+        return {
+            "files": len(self._files),
+            "bytes": self.bytes,
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "rows_read": sum(spill_file.reads for spill_file in self._files.values()),
+        }
@@ -0,0 +1,198 @@
+"""
+API rate limiting and retries for AWS Athena MCP Server.
+
+A token bucket per (region, API operation) keeps calls under AWS request-rate
+quotas, and throttled or transient failures are retried with jittered
+exponential backoff when it is safe to do so.
+"""
+
+import asyncio
+import inspect
+import logging
+import random
+import time
+from typing import Any, Dict, Tuple
+
+from botocore.exceptions import ClientError, ConnectionClosedError, EndpointConnectionError
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Sustained rate (calls/second) and burst capacity per operation, from AWS default quotas
+DEFAULT_RATES: Dict[str, Tuple[float, float]] = {
+    "start_query_execution": (20, 80),
+    "get_query_execution": (100, 200),
+    "get_query_results": (100, 100),
+    "get_query_runtime_statistics": (100, 100),
+    "list_query_executions": (5, 10),
+    "batch_get_query_execution": (20, 40),
+    "create_prepared_statement": (10, 20),
+    "delete_prepared_statement": (10, 20),
+    "get_table": (10, 20),
+    "get_partitions": (10, 20),
+    "get_databases": (10, 20),
+    "get_tables": (10, 20),
+}
+FALLBACK_RATE: Tuple[float, float] = (10, 20)
+
+# Error codes that indicate throttling or a transient service fault
+RETRYABLE_CODES = {
+    "ThrottlingException",
+    "TooManyRequestsException",
+    "Throttling",
+    "RequestLimitExceeded",
+    "SlowDown",
+    "InternalServerException",
+    "InternalFailure",
+    "ServiceUnavailable",
+    "ServiceUnavailableException",
+}
+THROTTLING_CODES = {
+    "ThrottlingException",
+    "TooManyRequestsException",
+    "Throttling",
+    "RequestLimitExceeded",
+    "SlowDown",
+}
+
+# Operations that may only be retried when the caller supplied an idempotency token
+NON_IDEMPOTENT_OPERATIONS = {"start_query_execution"}
+
+
+class TokenBucket:
+    """Classic token bucket; acquire() waits until a token is available."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self) -> float:
+        """Take one token, waiting if the bucket is empty. Returns seconds waited."""
+        waited = 0.0
+        while True:
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return waited
+            delay = (1 - self.tokens) / self.rate
+            await asyncio.sleep(delay)
+            waited += delay
+
+
+class ApiRateLimiter:
+    """Shared rate limiter and retry policy for boto3 client calls."""
+
+    def __init__(self, max_retries: int = 5, base_delay: float = 0.1, max_delay: float = 5.0):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self._metrics: Dict[str, Dict[str, float]] = {}
+
+    def _bucket(self, client: Any, operation: str) -> TokenBucket:
+        region = str(getattr(getattr(client, "meta", None), "region_name", ""))
+        key = (region, operation)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = TokenBucket(*DEFAULT_RATES.get(operation, FALLBACK_RATE))
+            self._buckets[key] = bucket
+        return bucket
+
+    def _record(self, operation: str, name: str, amount: float = 1) -> None:
+        stats = self._metrics.setdefault(
+            operation,
+            {
+                "calls": 0,
+                "throttled": 0,
+                "retries": 0,
+                "failures": 0,
+                "rate_limit_wait_seconds": 0.0,
+                "backoff_seconds": 0.0,
+            },
+        )
+        stats[name] += amount
+
+    def _retryable(self, operation: str, params: Dict[str, Any], error: Exception) -> bool:
+        if operation in NON_IDEMPOTENT_OPERATIONS and not params.get("ClientRequestToken"):
+            return False
+        if isinstance(error, (EndpointConnectionError, ConnectionClosedError)):
+            return True
+        if isinstance(error, ClientError):
+            return error.response.get("Error", {}).get("Code") in RETRYABLE_CODES
+        return False
+
+    def _backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+    async def call(self, client: Any, operation: str, **params: Any) -> Any:
+        """
+        Call a boto3 client operation under the rate limit, retrying when safe.
+
+        Raises:
+            ClientError: The last error once retries are exhausted or not allowed
+        """
+        return await self._call(client, operation, params, offload=False)
+
+    async def call_in_thread(self, client: Any, operation: str, **params: Any) -> Any:
+        """Like call(), but runs the blocking request in a worker thread (for background work)."""
+        return await self._call(client, operation, params, offload=True)
+
+    async def _call(
+        self, client: Any, operation: str, params: Dict[str, Any], offload: bool
+    ) -> Any:
+        bucket = self._bucket(client, operation)
+        attempt = 0
+
+        while True:
+            waited = await bucket.acquire()
+            self._record(operation, "calls")
+            if waited:
+                self._record(operation, "rate_limit_wait_seconds", waited)
+
+            try:
+                method = getattr(client, operation)
+                if offload:
+                    response = await asyncio.to_thread(method, **params)
+                else:
+                    response = method(**params)
+                if inspect.isawaitable(response):
+                    # Replayed sessions pace their calls without blocking the event loop
+                    response = await response
+                return response
+            except (ClientError, EndpointConnectionError, ConnectionClosedError) as e:
+                code = e.response.get("Error", {}).get("Code") if isinstance(e, ClientError) else ""
+                if code in THROTTLING_CODES:
+                    self._record(operation, "throttled")
+
+                if attempt >= self.max_retries or not self._retryable(operation, params, e):
+                    if code in RETRYABLE_CODES:
+                        self._record(operation, "failures")
+                    raise
+
+                delay = self._backoff(attempt)
+                attempt += 1
+                self._record(operation, "retries")
+                self._record(operation, "backoff_seconds", delay)
+                logger.warning(
+                    f"Retrying {operation} after {code or type(e).__name__} "
+                    f"(attempt {attempt}/{self.max_retries}, backoff {delay:.2f}s)"
+                )
+                await asyncio.sleep(delay)
+
+    def metrics(self) -> Dict[str, Dict[str, float]]:
+        """Per-operation call, throttling and retry counters."""
+        return {
+            operation: {
+                name: round(value, 3) if isinstance(value, float) else value
+                for name, value in stats.items()
+            }
+            for operation, stats in self._metrics.items()
+        }
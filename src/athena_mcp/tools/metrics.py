@@ -0,0 +1,102 @@
+"""
+Operational metrics tools for AWS Athena MCP Server.
+
+Simple tools for inspecting the server's own behaviour.
+"""
+
+import json
+from typing import TYPE_CHECKING
+
+from ..athena import AthenaClient
+
+if TYPE_CHECKING:
+    from fastmcp import FastMCP
+
+
+def register_metrics_tools(mcp: "FastMCP", athena_client: AthenaClient) -> None:
+    """Register metrics-related MCP tools."""
+
+    @mcp.tool()
+    async def get_metrics() -> str:
+        """
+        Get server operational metrics.
+
+        Reports per-API-operation call counts, throttling errors absorbed by retries,
+        retries, failures after retries and time spent waiting on rate limits, plus
+        entries, size and hit rates of the status and result caches, files and bytes
+        of spilled results, schema prefetch progress and staleness, and materialized
+        subquery tables and the queries rewritten to read them.
+
+        Returns:
+            JSON string with metrics
+        """
+        try:
+            metrics = {
+                "api": athena_client.api.metrics(),
+                "cache": {
+                    "statuses": athena_client.statuses.stats(),
+                    "results": athena_client.results.stats(),
+                    "spill": athena_client.spill.stats() if athena_client.spill else None,
+                },
+                "catalog": athena_client.catalog.metrics(),
+                "materialized": (
+                    athena_client.materialized.stats() if athena_client.materialized else None
+                ),
+            }
+            return json.dumps(metrics, indent=2)
+
+        except Exception as e:
+            return json.dumps({"error": str(e), "code": "INVALID_REQUEST"}, indent=2)
+
+    @mcp.tool()
+    async def get_memory_usage() -> str:
+        """
+        Get the server's approximate memory usage by category.
+
+        Covers cached result pages, local query tables, cached statuses, query history
+        and schemas, plus memory reserved by in-flight result fetches and responses,
+        against the ATHENA_MEMORY_LIMIT_MB ceiling.
+
+        Returns:
+            JSON string with usage by category, the limit, and backpressure counters
+        """
+        try:
+            return json.dumps(athena_client.memory.usage(), indent=2)
+
+        except Exception as e:
+            return json.dumps({"error": str(e), "code": "INVALID_REQUEST"}, indent=2)
+
+    @mcp.tool()
+    async def query_stats(order_by: str = "cost", limit: int = 10) -> str:
+        """
+        Get the query shapes that drive data scanned or latency.
+
+        Queries are grouped by fingerprint: literals replaced by ?, comments dropped,
+        whitespace and case folded and IN-lists collapsed. Covers executions started
+        by this server since it started, for the most recently seen 500 shapes.
+
+        Args:
+            order_by: "cost" (total bytes scanned), "latency" (p95 execution time) or
+                "count" (executions)
+            limit: Maximum number of shapes to return (1-100)
+
+        Returns:
+            JSON string with per-shape executions, failures, bytes scanned, mean and
+            p95 execution time, and the share answered by Athena result reuse
+        """
+        try:
+            if limit < 1 or limit > 100:
+                raise ValueError("limit must be between 1 and 100")
+
+            shapes = athena_client.query_stats.top(limit, order_by)
+            return json.dumps(
+                {
+                    "order_by": order_by,
+                    "shapes_tracked": len(athena_client.query_stats),
+                    "shapes": [shape.dict() for shape in shapes],
+                },
+                indent=2,
+            )
+
+        except Exception as e:
+            return json.dumps({"error": str(e), "code": "INVALID_REQUEST"}, indent=2)
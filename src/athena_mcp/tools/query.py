@@ -5,30 +5,125 @@ Simple tools for executing queries and getting results.
 """
 
 import json
-from typing import TYPE_CHECKING
+import logging
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
 
-from ..athena import AthenaClient, AthenaError
-from ..models import QueryRequest, QueryResult
+from fastmcp import Context
+
+from ..athena import AthenaClient, AthenaError, ProgressCallback
+from ..cooperative import dumps_cooperatively, size_rows_cooperatively
+from ..history import HistoryFilter
+from ..models import LintPolicy, LocalQueryResult, QueryRequest, QueryResult, SampleMethod
+from ..profiling import profile_result as build_profile
+from ..results import byte_budget
 
 if TYPE_CHECKING:
     from fastmcp import FastMCP
 
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+def _validate_budgets(max_bytes: Optional[int], max_tokens: Optional[int]) -> None:
+    """Reject non-positive size budgets."""
+    if max_bytes is not None and max_bytes < 1:
+        raise ValueError("max_bytes must be positive")
+    if max_tokens is not None and max_tokens < 1:
+        raise ValueError("max_tokens must be positive")
+
+
+def _progress(ctx: Optional[Context]) -> Optional[ProgressCallback]:
+    """Forward progress updates as MCP progress notifications (sent if the client asked)."""
+    if ctx is None:
+        return None
+    step = 0
+
+    async def report(message: str) -> None:
+        nonlocal step
+        step += 1
+        try:
+            await ctx.report_progress(step, None, message)
+        except Exception as e:
+            # A client that cannot take notifications should not fail the query
+            logger.debug(f"Could not send progress notification: {e}")
+
+    return report
+
+
+async def _serialize(
+    athena_client: AthenaClient, result: Union[QueryResult, LocalQueryResult]
+) -> str:
+    """
+    Serialize a result, accounting for the memory its response takes meanwhile.
+
+    Large results are encoded a chunk of rows at a time, so other tool calls run
+    in between.
+    """
+    if isinstance(result, QueryResult):
+        rows_bytes = result.result_bytes
+    else:
+        rows_bytes = await size_rows_cooperatively(
+            result.rows, athena_client.config.cpu_chunk_cells
+        )
+    # The JSON text and its chunks each take about the rows' serialized size
+    async with athena_client.memory.hold("responses", 2 * rows_bytes):
+        # The rows are encoded as they are rather than copied by .dict()
+        payload = result.copy(update={"rows": []}).dict()
+        payload["rows"] = result.rows
+        return await dumps_cooperatively(payload, "rows", athena_client.config.cpu_chunk_cells)
+
 
 def register_query_tools(mcp: "FastMCP", athena_client: AthenaClient) -> None:
     """Register query-related MCP tools."""
 
     @mcp.tool()
-    async def run_query(database: str, query: str, max_rows: int = 1000) -> str:
+    async def run_query(
+        database: str,
+        query: str,
+        max_rows: int = 1000,
+        profile: bool = False,
+        exploratory: bool = False,
+        sample_percent: Optional[float] = None,
+        sample_method: str = "BERNOULLI",
+        parameters: Optional[List[str]] = None,
+        max_bytes: Optional[int] = None,
+        max_tokens: Optional[int] = None,
+        lint_policy: Optional[str] = None,
+        incremental_key: Optional[str] = None,
+        ctx: Optional[Context] = None,
+    ) -> str:
         """
         Execute a SQL query against AWS Athena.
 
+        Sends progress notifications while the query runs (state changes and bytes
+        scanned) and as result pages are fetched.
+
         Args:
             database: The Athena database to query
             query: SQL query to execute
             max_rows: Maximum number of rows to return (1-10000)
+            profile: Return per-column statistics of the first max_rows rows instead of
+                raw rows (marked truncated when the result has more)
+            exploratory: Add LIMIT max_rows to SELECT queries that have no LIMIT
+            sample_percent: Sample table references with TABLESAMPLE at this percentage
+            sample_method: TABLESAMPLE method, BERNOULLI or SYSTEM
+            parameters: SQL literals (e.g. "'abc'", "42") bound to `?` placeholders; the
+                query shape is prepared once and reused across parameter sets
+            max_bytes: Stop returning rows once about this many bytes of rows are serialized
+            max_tokens: Like max_bytes, as an approximate token count (~4 bytes per token)
+            lint_policy: Cost lint policy for this query: off, warn, block, or rewrite
+                (restricts a lone partitioned table with no partition predicate to its
+                newest partition, which changes the result); the server default if unset
+            incremental_key: Partition key the query groups by; later runs of the same
+                query reuse cached rows of unchanged partitions and query only new or
+                changed ones (the query must read one partitioned table, GROUP BY this
+                key and select it, and have no LIMIT)
 
         Returns:
-            JSON string with query results or execution ID if timeout
+            JSON string with query results and any cost lint findings, or the execution
+            ID if it timed out (with
+            an ETA when earlier runs of the query shape predict one). Shapes that
+            usually run past the timeout return their execution ID right away.
         """
         try:
             # Validate inputs
@@ -38,23 +133,48 @@ def register_query_tools(mcp: "FastMCP", athena_client: AthenaClient) -> None:
                 raise ValueError("Query cannot be empty")
             if max_rows < 1 or max_rows > 10000:
                 raise ValueError("max_rows must be between 1 and 10000")
+            _validate_budgets(max_bytes, max_tokens)
 
-            request = QueryRequest(database=database, query=query, max_rows=max_rows)
+            request = QueryRequest(
+                database=database,
+                query=query,
+                max_rows=max_rows,
+                exploratory=exploratory,
+                sample_percent=sample_percent,
+                sample_method=SampleMethod(sample_method.upper()),
+                parameters=parameters,
+                max_bytes=byte_budget(max_bytes, max_tokens),
+                lint_policy=LintPolicy(lint_policy.lower()) if lint_policy else None,
+                incremental_key=incremental_key.strip() if incremental_key else None,
+            )
 
-            result = await athena_client.execute_query(request)
+            result = await athena_client.execute_query(request, _progress(ctx))
 
             if isinstance(result, QueryResult):
-                return json.dumps(result.dict(), indent=2)
+                if profile:
+                    return json.dumps(build_profile(result).dict(), indent=2)
+                return await _serialize(athena_client, result)
             else:
                 # Timeout - return execution ID
-                return json.dumps(
-                    {
-                        "query_execution_id": result,
-                        "status": "timeout",
-                        "message": "Query timed out, use get_status to check progress",
-                    },
-                    indent=2,
-                )
+                response: Dict[str, Any] = {
+                    "query_execution_id": result,
+                    "status": "timeout",
+                    "message": "Query timed out, use get_status to check progress",
+                }
+                eta = athena_client.query_stats.eta(result)
+                if eta is not None:
+                    response.update(eta)
+                    response["message"] = (
+                        f"Query usually takes about {eta['expected_runtime_seconds']}s; "
+                        f"check back with get_status in about {eta['eta_seconds']}s"
+                    )
+                executed_query = athena_client.executed_queries.get(result)
+                if executed_query is not None:
+                    response["executed_query"] = executed_query
+                lint = athena_client.lint_reports.get(result)
+                if lint is not None:
+                    response["lint"] = lint.dict()
+                return json.dumps(response, indent=2)
 
         except AthenaError as e:
             return json.dumps(
@@ -73,14 +193,19 @@ def register_query_tools(mcp: "FastMCP", athena_client: AthenaClient) -> None:
             query_execution_id: The query execution ID
 
         Returns:
-            JSON string with status information
+            JSON string with status information, and an ETA for running queries whose
+            shape has run here before
         """
         try:
             if not query_execution_id.strip():
                 raise ValueError("Query execution ID cannot be empty")
 
             status = await athena_client.get_query_status(query_execution_id)
-            return json.dumps(status.dict(), indent=2)
+            response = status.dict()
+            eta = athena_client.query_stats.eta(query_execution_id)
+            if eta is not None:
+                response.update(eta)
+            return json.dumps(response, indent=2)
 
         except AthenaError as e:
             return json.dumps(
@@ -91,13 +216,27 @@ def register_query_tools(mcp: "FastMCP", athena_client: AthenaClient) -> None:
             return json.dumps({"error": str(e), "code": "INVALID_REQUEST"}, indent=2)
 
     @mcp.tool()
-    async def get_result(query_execution_id: str, max_rows: int = 1000) -> str:
+    async def get_result(
+        query_execution_id: str,
+        max_rows: int = 1000,
+        max_bytes: Optional[int] = None,
+        max_tokens: Optional[int] = None,
+        cursor: Optional[str] = None,
+        ctx: Optional[Context] = None,
+    ) -> str:
         """
         Get results for a completed query.
 
+        When a row or size budget cuts the result short, the response has
+        `truncated: true` and a `next_cursor` to pass back here for the next rows.
+        Sends a progress notification after each page fetched.
+
         Args:
             query_execution_id: The query execution ID
             max_rows: Maximum number of rows to return (1-10000)
+            max_bytes: Stop returning rows once about this many bytes of rows are serialized
+            max_tokens: Like max_bytes, as an approximate token count (~4 bytes per token)
+            cursor: next_cursor from a previous truncated result, to continue from there
 
         Returns:
             JSON string with query results
@@ -107,9 +246,168 @@ def register_query_tools(mcp: "FastMCP", athena_client: AthenaClient) -> None:
                 raise ValueError("Query execution ID cannot be empty")
             if max_rows < 1 or max_rows > 10000:
                 raise ValueError("max_rows must be between 1 and 10000")
+            _validate_budgets(max_bytes, max_tokens)
+
+            result = await athena_client.get_query_results(
+                query_execution_id,
+                max_rows,
+                byte_budget(max_bytes, max_tokens),
+                cursor,
+                progress=_progress(ctx),
+            )
+            return await _serialize(athena_client, result)
+
+        except AthenaError as e:
+            return json.dumps(
+                {"error": e.message, "code": e.code, "query_execution_id": e.query_execution_id},
+                indent=2,
+            )
+        except Exception as e:
+            return json.dumps({"error": str(e), "code": "INVALID_REQUEST"}, indent=2)
+
+    @mcp.tool()
+    async def query_local(sql: str, max_rows: int = 1000) -> str:
+        """
+        Run SQL in-process over earlier query results, without going back to Athena.
+
+        Reference results by execution ID as table names, e.g.
+        SELECT region, sum(total) FROM "<execution_id>" GROUP BY region ORDER BY 2 DESC.
+        Joins across several results work too. The SQLite dialect is used and only
+        reads are allowed.
+
+        Args:
+            sql: Read-only SQL over earlier results
+            max_rows: Maximum number of rows to return (1-10000)
+
+        Returns:
+            JSON string with rows, elapsed time and the rows loaded from each result
+            (`partial` when only the first ATHENA_LOCAL_MAX_ROWS rows were loaded)
+        """
+        try:
+            if not sql.strip():
+                raise ValueError("SQL cannot be empty")
+            if max_rows < 1 or max_rows > 10000:
+                raise ValueError("max_rows must be between 1 and 10000")
+
+            result = await athena_client.query_local(sql, max_rows)
+            return await _serialize(athena_client, result)
+
+        except AthenaError as e:
+            return json.dumps(
+                {"error": e.message, "code": e.code, "query_execution_id": e.query_execution_id},
+                indent=2,
+            )
+        except Exception as e:
+            return json.dumps({"error": str(e), "code": "INVALID_REQUEST"}, indent=2)
+
+    @mcp.tool()
+    async def profile_result(
+        query_execution_id: str, max_rows: int = 10000, top_k: int = 5, bins: int = 10
+    ) -> str:
+        """
+        Summarize a completed query's results with per-column statistics.
+
+        Reports count, nulls, min/max, mean, approximate distinct count, top values
+        and a histogram per column instead of returning raw rows.
+
+        Args:
+            query_execution_id: The query execution ID
+            max_rows: Maximum number of rows to profile (1-10000)
+            top_k: Number of most frequent values to report per column (1-50)
+            bins: Number of histogram buckets for numeric columns (1-50)
+
+        Returns:
+            JSON string with the result profile; `truncated` is true when the result has
+            more rows than were profiled
+        """
+        try:
+            if not query_execution_id.strip():
+                raise ValueError("Query execution ID cannot be empty")
+            if max_rows < 1 or max_rows > 10000:
+                raise ValueError("max_rows must be between 1 and 10000")
+            if top_k < 1 or top_k > 50:
+                raise ValueError("top_k must be between 1 and 50")
+            if bins < 1 or bins > 50:
+                raise ValueError("bins must be between 1 and 50")
 
             result = await athena_client.get_query_results(query_execution_id, max_rows)
-            return json.dumps(result.dict(), indent=2)
+            return json.dumps(build_profile(result, top_k, bins).dict(), indent=2)
+
+        except AthenaError as e:
+            return json.dumps(
+                {"error": e.message, "code": e.code, "query_execution_id": e.query_execution_id},
+                indent=2,
+            )
+        except Exception as e:
+            return json.dumps({"error": str(e), "code": "INVALID_REQUEST"}, indent=2)
+
+    @mcp.tool()
+    async def profile_query(query_execution_id: str) -> str:
+        """
+        Get an execution profile of a query: where the time went and how much data moved.
+
+        Reports queue, planning, engine and service time, rows and bytes per stage with
+        their plan operators, and findings such as queued, planning-heavy or scan-bound.
+
+        Args:
+            query_execution_id: The query execution ID
+
+        Returns:
+            JSON string with the query execution profile
+        """
+        try:
+            if not query_execution_id.strip():
+                raise ValueError("Query execution ID cannot be empty")
+
+            profile = await athena_client.profile_query(query_execution_id)
+            return json.dumps(profile.dict(), indent=2)
+
+        except AthenaError as e:
+            return json.dumps(
+                {"error": e.message, "code": e.code, "query_execution_id": e.query_execution_id},
+                indent=2,
+            )
+        except Exception as e:
+            return json.dumps({"error": str(e), "code": "INVALID_REQUEST"}, indent=2)
+
+    @mcp.tool()
+    async def query_history(
+        state: Optional[str] = None,
+        database: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        min_bytes_scanned: int = 0,
+        workgroup: Optional[str] = None,
+        limit: int = 20,
+        next_token: Optional[str] = None,
+    ) -> str:
+        """
+        List recent query executions, newest first, to find and reuse earlier results.
+
+        Args:
+            state: Only executions in this state (SUCCEEDED, FAILED, CANCELLED, RUNNING, QUEUED)
+            database: Only executions against this database
+            since: Only executions submitted at or after this ISO 8601 time
+            until: Only executions submitted at or before this ISO 8601 time
+            min_bytes_scanned: Only executions that scanned at least this many bytes
+            workgroup: Workgroup to search (defaults to the first configured workgroup)
+            limit: Maximum number of executions to return (1-100)
+            next_token: Token from a previous call to continue with older executions
+
+        Returns:
+            JSON string with matching executions and a continuation token
+        """
+        try:
+            if limit < 1 or limit > 100:
+                raise ValueError("limit must be between 1 and 100")
+            if min_bytes_scanned < 0:
+                raise ValueError("min_bytes_scanned cannot be negative")
+
+            history_filter = HistoryFilter(state, database, since, until, min_bytes_scanned)
+            history = await athena_client.query_history(
+                history_filter, workgroup, limit, next_token=next_token
+            )
+            return json.dumps(history.dict(), indent=2)
 
         except AthenaError as e:
             return json.dumps(
@@ -5,7 +5,7 @@ Simple tools for discovering database and table schemas.
 """
 
 import json
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, List, Optional
 
 from ..athena import AthenaClient, AthenaError
 
@@ -70,3 +70,115 @@ def register_schema_tools(mcp: "FastMCP", athena_client: AthenaClient) -> None:
             )
         except Exception as e:
             return json.dumps({"error": str(e), "code": "INVALID_REQUEST"}, indent=2)
+
+    @mcp.tool()
+    async def list_partitions(
+        database: str, table_name: str, max_partitions: int = 100, refresh: bool = False
+    ) -> str:
+        """
+        List the partition keys and partition values of a table.
+
+        Use the key ranges to write partition-pruning predicates that reduce bytes scanned.
+
+        Args:
+            database: The Athena database containing the table
+            table_name: The name of the table
+            max_partitions: Maximum number of partitions to list, newest first (1-1000)
+            refresh: Force a full reload of the cached partition index
+
+        Returns:
+            JSON string with partition keys, per-key value ranges and partitions
+        """
+        try:
+            if not database.strip():
+                raise ValueError("Database name cannot be empty")
+            if not table_name.strip():
+                raise ValueError("Table name cannot be empty")
+            if max_partitions < 1 or max_partitions > 1000:
+                raise ValueError("max_partitions must be between 1 and 1000")
+
+            partitions = await athena_client.list_partitions(
+                database, table_name, max_partitions, refresh
+            )
+            return json.dumps(partitions.dict(), indent=2)
+
+        except AthenaError as e:
+            return json.dumps(
+                {"error": e.message, "code": e.code, "query_execution_id": e.query_execution_id},
+                indent=2,
+            )
+        except Exception as e:
+            return json.dumps({"error": str(e), "code": "INVALID_REQUEST"}, indent=2)
+
+    @mcp.tool()
+    async def search_schema(query: str, database: Optional[str] = None, limit: int = 20) -> str:
+        """
+        Find tables by table and column names, types or comments.
+
+        Matches whole names (e.g. "customer_id"), their parts ("customer") and prefixes
+        ("cust"); tables matching more of the terms rank first.
+
+        Args:
+            query: Words or column names to look for, e.g. "customer_id order_total"
+            database: Only search this database (loaded on demand if not prefetched)
+            limit: Maximum number of tables to return (1-100)
+
+        Returns:
+            JSON string with matching tables and their matching columns
+        """
+        try:
+            if not query.strip():
+                raise ValueError("Query cannot be empty")
+            if limit < 1 or limit > 100:
+                raise ValueError("limit must be between 1 and 100")
+
+            matches = await athena_client.search_schema(query, database, limit)
+            return json.dumps(
+                {
+                    "query": query,
+                    "matches": [match.dict() for match in matches],
+                    "indexed_tables": len(athena_client.catalog.index),
+                },
+                indent=2,
+            )
+
+        except AthenaError as e:
+            return json.dumps(
+                {"error": e.message, "code": e.code, "query_execution_id": e.query_execution_id},
+                indent=2,
+            )
+        except Exception as e:
+            return json.dumps({"error": str(e), "code": "INVALID_REQUEST"}, indent=2)
+
+    @mcp.tool()
+    async def describe_tables(database: str, table_names: Optional[List[str]] = None) -> str:
+        """
+        Describe many tables, or every table in a database, in one compact digest.
+
+        Columns with the same name and type in several tables are typed once under
+        `shared_columns` and listed by name only; tables with identical schemas are
+        reported as `same_as` another table.
+
+        Args:
+            database: The Athena database containing the tables
+            table_names: Tables to describe (1-500); all tables in the database if omitted
+
+        Returns:
+            JSON string with the schema digest
+        """
+        try:
+            if not database.strip():
+                raise ValueError("Database name cannot be empty")
+            if table_names is not None and not 1 <= len(table_names) <= 500:
+                raise ValueError("table_names must list between 1 and 500 tables")
+
+            digest = await athena_client.describe_tables(database, table_names)
+            return json.dumps(digest.dict(), indent=2)
+
+        except AthenaError as e:
+            return json.dumps(
+                {"error": e.message, "code": e.code, "query_execution_id": e.query_execution_id},
+                indent=2,
+            )
+        except Exception as e:
+            return json.dumps({"error": str(e), "code": "INVALID_REQUEST"}, indent=2)
@@ -8,12 +8,15 @@ import sys
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from botocore.exceptions import ClientError
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
 
 from athena_mcp.athena import AthenaClient, AthenaError, QueryValidator
 from athena_mcp.config import Config
-from athena_mcp.models import QueryRequest, QueryState
+from athena_mcp.materialize import canonical_sql
+from athena_mcp.models import LintPolicy, QueryRequest, QueryState, TableInfo
+from athena_mcp.results import encode_cursor
 
 
 class TestQueryValidator:
@@ -161,6 +164,80 @@ class TestAthenaClient:
         assert result.rows[0]["col1"] == "value1"
         assert result.rows[0]["col2"] == "value2"
 
+    @pytest.mark.asyncio
+    async def test_execute_query_exploratory(self, config, mock_boto3_client):
+        """Test exploratory mode pushes a LIMIT down and reports the rewritten SQL."""
+        mock_boto3_client.start_query_execution.return_value = {
+            "QueryExecutionId": "test-execution-id"
+        }
+        mock_boto3_client.get_query_execution.return_value = {
+            "QueryExecution": {"Status": {"State": "SUCCEEDED"}, "Statistics": {}}
+        }
+        mock_boto3_client.get_query_results.return_value = {
+            "ResultSet": {"ResultSetMetadata": {"ColumnInfo": []}, "Rows": []}
+        }
+
+        client = AthenaClient(config)
+        request = QueryRequest(
+            database="test_db", query="SELECT * FROM test_table", max_rows=10, exploratory=True
+        )
+
+        result = await client.execute_query(request)
+
+        query_string = mock_boto3_client.start_query_execution.call_args.kwargs["QueryString"]
+        assert query_string == "SELECT * FROM test_table\nLIMIT 10"
+        assert result.executed_query == query_string
+
+    @pytest.mark.asyncio
+    async def test_execute_query_parameters(self, config, mock_boto3_client):
+        """Test parameterized queries prepare each shape once and bind parameters."""
+        mock_boto3_client.start_query_execution.return_value = {
+            "QueryExecutionId": "test-execution-id"
+        }
+        mock_boto3_client.get_query_execution.return_value = {
+            "QueryExecution": {"Status": {"State": "SUCCEEDED"}, "Statistics": {}}
+        }
+        mock_boto3_client.get_query_results.return_value = {
+            "ResultSet": {"ResultSetMetadata": {"ColumnInfo": []}, "Rows": []}
+        }
+
+        client = AthenaClient(config)
+        query = "SELECT * FROM orders WHERE customer_id = ?"
+
+        with patch.object(
+            QueryValidator, "validate_query", wraps=QueryValidator.validate_query
+        ) as validate:
+            for customer in ("'a'", "'b'"):
+                request = QueryRequest(
+                    database="test_db", query=query, max_rows=10, parameters=[customer]
+                )
+                result = await client.execute_query(request)
+
+        assert validate.call_count == 1
+        mock_boto3_client.create_prepared_statement.assert_called_once()
+        start_params = mock_boto3_client.start_query_execution.call_args.kwargs
+        assert start_params["QueryString"].startswith("EXECUTE mcp_")
+        assert start_params["ExecutionParameters"] == ["'b'"]
+        assert start_params["WorkGroup"] == "test-workgroup"
+        assert result.executed_query.endswith("USING 'b'")
+
+    @pytest.mark.asyncio
+    async def test_execute_query_invalid_parameters(self, config, mock_boto3_client):
+        """Test parameters must be single literals matching the placeholders."""
+        client = AthenaClient(config)
+
+        request = QueryRequest(
+            database="test_db", query="SELECT * FROM t WHERE a = ?", parameters=["1 OR 1=1"]
+        )
+        with pytest.raises(ValueError, match="single SQL literal"):
+            await client.execute_query(request)
+
+        request = QueryRequest(
+            database="test_db", query="SELECT * FROM t WHERE a = ?", parameters=["1", "2"]
+        )
+        with pytest.raises(ValueError, match="placeholders"):
+            await client.execute_query(request)
+
     @pytest.mark.asyncio
     async def test_execute_query_timeout(self, config, mock_boto3_client):
         """Test query execution timeout."""
@@ -200,6 +277,28 @@ class TestAthenaClient:
         with pytest.raises(ValueError, match="dangerous pattern"):
             await client.execute_query(request)
 
+    @pytest.mark.asyncio
+    async def test_cost_lint_block_policy(self, config, mock_boto3_client):
+        """Test a blocking lint policy refuses a partitioned table scan before it starts."""
+        client = AthenaClient(config)
+        client.linter.remember(
+            TableInfo(
+                database="test_db",
+                table_name="events",
+                columns=[{"name": "id", "type": "bigint"}, {"name": "dt", "type": "string"}],
+                partition_keys=["dt"],
+            )
+        )
+        request = QueryRequest(
+            database="test_db", query="SELECT id FROM events", lint_policy=LintPolicy.BLOCK
+        )
+
+        with pytest.raises(AthenaError) as error:
+            await client.execute_query(request)
+
+        assert error.value.code == "LINT_BLOCKED"
+        mock_boto3_client.start_query_execution.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_get_query_status(self, config, mock_boto3_client):
         """Test getting query status."""
@@ -305,3 +404,530 @@ class TestAthenaClient:
         assert table_info.columns[0]["type"] == "bigint"
         assert table_info.columns[1]["name"] == "name"
         assert table_info.columns[1]["type"] == "string"
+
+    @pytest.mark.asyncio
+    async def test_describe_table_partition_keys(self, config, mock_boto3_client):
+        """Test partition keys are parsed from the DESCRIBE partition section."""
+        mock_boto3_client.start_query_execution.return_value = {
+            "QueryExecutionId": "test-execution-id"
+        }
+        mock_boto3_client.get_query_execution.return_value = {
+            "QueryExecution": {"Status": {"State": "SUCCEEDED"}, "Statistics": {}}
+        }
+
+        names = ["col_name", "id", "dt", "", "# Partition Information", "# col_name", "dt"]
+        mock_boto3_client.get_query_results.return_value = {
+            "ResultSet": {
+                "ResultSetMetadata": {"ColumnInfo": [{"Name": "col_name"}, {"Name": "data_type"}]},
+                "Rows": [
+                    {"Data": [{"VarCharValue": name}, {"VarCharValue": "string"}]} for name in names
+                ],
+            }
+        }
+
+        client = AthenaClient(config)
+        table_info = await client.describe_table("test_db", "test_table")
+
+        assert [column["name"] for column in table_info.columns] == ["id", "dt"]
+        assert table_info.partition_keys == ["dt"]
+
+    @pytest.mark.asyncio
+    async def test_wait_absorbs_throttling(self, config, mock_boto3_client):
+        """Test a throttled status poll does not fail a healthy query."""
+        mock_boto3_client.start_query_execution.return_value = {
+            "QueryExecutionId": "test-execution-id"
+        }
+        mock_boto3_client.get_query_execution.side_effect = [
+            ClientError({"Error": {"Code": "ThrottlingException"}}, "GetQueryExecution"),
+            {"QueryExecution": {"Status": {"State": "SUCCEEDED"}, "Statistics": {}}},
+            {"QueryExecution": {"Status": {"State": "SUCCEEDED"}, "Statistics": {}}},
+        ]
+        mock_boto3_client.get_query_results.return_value = {
+            "ResultSet": {"ResultSetMetadata": {"ColumnInfo": []}, "Rows": []}
+        }
+
+        client = AthenaClient(config)
+        request = QueryRequest(database="test_db", query="SELECT 1", max_rows=10)
+
+        with patch("asyncio.sleep", return_value=None):
+            result = await client.execute_query(request)
+
+        assert result.query_execution_id == "test-execution-id"
+        assert "ClientRequestToken" in mock_boto3_client.start_query_execution.call_args.kwargs
+        assert client.api.metrics()["get_query_execution"]["throttled"] == 1
+
+    @pytest.mark.asyncio
+    async def test_execute_query_reports_progress(self, config, mock_boto3_client):
+        """Test progress is reported on state changes, bytes scanned and pages fetched."""
+        mock_boto3_client.start_query_execution.return_value = {"QueryExecutionId": "progress-id"}
+
+        def execution(state, bytes_scanned):
+            return {
+                "QueryExecution": {
+                    "Status": {"State": state},
+                    "Statistics": {"DataScannedInBytes": bytes_scanned},
+                }
+            }
+
+        mock_boto3_client.get_query_execution.side_effect = [
+            execution("QUEUED", 0),
+            execution("RUNNING", 0),
+            execution("RUNNING", 0),
+            execution("RUNNING", 2048),
+            execution("SUCCEEDED", 4096),
+        ]
+        mock_boto3_client.get_query_results.return_value = {
+            "ResultSet": {
+                "ResultSetMetadata": {"ColumnInfo": [{"Name": "n"}]},
+                "Rows": [{"Data": [{"VarCharValue": "n"}]}, {"Data": [{"VarCharValue": "1"}]}],
+            }
+        }
+        messages = []
+
+        async def progress(message):
+            messages.append(message)
+
+        client = AthenaClient(config)
+        with patch("asyncio.sleep", return_value=None) as sleep:
+            await client.execute_query(
+                QueryRequest(database="test_db", query="SELECT n FROM t"), progress
+            )
+
+        assert [message.split(" bytes")[0] for message in messages[1:5]] == [
+            "QUEUED: 0",
+            "RUNNING: 0",
+            "RUNNING: 2048",
+            "SUCCEEDED: 4096",
+        ]
+        assert messages[0] == "Started query execution progress-id"
+        assert messages[5] == "Fetched 1 rows (columns: n)"
+        # Polling starts fast and backs off
+        assert [call.args[0] for call in sleep.call_args_list] == [0.25, 0.5, 1.0, 1.0]
+
+    @pytest.mark.asyncio
+    async def test_terminal_status_and_results_cached(self, config, mock_boto3_client):
+        """Test finished queries are served from cache after the first lookup."""
+        mock_boto3_client.get_query_execution.return_value = {
+            "QueryExecution": {"Status": {"State": "SUCCEEDED"}, "Statistics": {}}
+        }
+        mock_boto3_client.get_query_results.return_value = {
+            "ResultSet": {
+                "ResultSetMetadata": {"ColumnInfo": [{"Name": "n"}]},
+                "Rows": [{"Data": [{"VarCharValue": "n"}]}]
+                + [{"Data": [{"VarCharValue": str(i)}]} for i in range(5)],
+            }
+        }
+
+        client = AthenaClient(config)
+        await client.get_query_status("done-id")
+        first = await client.get_query_results("done-id", max_rows=10)
+        second = await client.get_query_results("done-id", max_rows=3)
+        third = await client.get_query_results("done-id", max_rows=100)
+
+        assert mock_boto3_client.get_query_execution.call_count == 1
+        assert mock_boto3_client.get_query_results.call_count == 1
+        assert len(first.rows) == 5
+        assert [row["n"] for row in second.rows] == ["0", "1", "2"]
+        assert len(third.rows) == 5
+
+    @pytest.mark.asyncio
+    async def test_running_status_not_cached(self, config, mock_boto3_client):
+        """Test non-terminal statuses are always fetched again."""
+        mock_boto3_client.get_query_execution.return_value = {
+            "QueryExecution": {"Status": {"State": "RUNNING"}, "Statistics": {}}
+        }
+
+        client = AthenaClient(config)
+        await client.get_query_status("busy-id")
+        await client.get_query_status("busy-id")
+
+        assert mock_boto3_client.get_query_execution.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_results_byte_budget_and_cursor(self, config, mock_boto3_client):
+        """Test a byte budget truncates results and the cursor resumes after them."""
+        mock_boto3_client.get_query_execution.return_value = {
+            "QueryExecution": {"Status": {"State": "SUCCEEDED"}, "Statistics": {}}
+        }
+        header = {"Data": [{"VarCharValue": "n"}]}
+        pages = {
+            None: {
+                "ResultSet": {
+                    "ResultSetMetadata": {"ColumnInfo": [{"Name": "n"}]},
+                    "Rows": [header] + [{"Data": [{"VarCharValue": str(i)}]} for i in range(3)],
+                },
+                "NextToken": "page-2",
+            },
+            "page-2": {
+                "ResultSet": {
+                    "ResultSetMetadata": {"ColumnInfo": [{"Name": "n"}]},
+                    "Rows": [{"Data": [{"VarCharValue": str(i)}]} for i in range(3, 6)],
+                },
+            },
+        }
+        mock_boto3_client.get_query_results.side_effect = lambda **kwargs: pages[
+            kwargs.get("NextToken")
+        ]
+
+        client = AthenaClient(config)
+        first = await client.get_query_results("paged-id", max_rows=100, max_bytes=80)
+
+        assert [row["n"] for row in first.rows] == ["0", "1", "2"]
+        assert first.truncated
+        assert mock_boto3_client.get_query_results.call_count == 1
+
+        second = await client.get_query_results(
+            "paged-id", max_rows=100, max_bytes=1000, cursor=first.next_cursor
+        )
+
+        assert [row["n"] for row in second.rows] == ["3", "4", "5"]
+        assert not second.truncated
+        assert second.next_cursor is None
+        assert mock_boto3_client.get_query_results.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_cursor_into_uncached_page(self, config, mock_boto3_client):
+        """Test resuming deep inside an uncached page fetches past the offset in one call."""
+        mock_boto3_client.get_query_execution.return_value = {
+            "QueryExecution": {"Status": {"State": "SUCCEEDED"}, "Statistics": {}}
+        }
+
+        def get_query_results(QueryExecutionId, MaxResults, NextToken=None):
+            rows = [{"Data": [{"VarCharValue": str(i)}]} for i in range(MaxResults)]
+            return {
+                "ResultSet": {"ResultSetMetadata": {"ColumnInfo": [{"Name": "n"}]}, "Rows": rows}
+            }
+
+        mock_boto3_client.get_query_results.side_effect = get_query_results
+
+        client = AthenaClient(config)
+        result = await client.get_query_results(
+            "deep-id", max_rows=10, cursor=encode_cursor("page-2", 900)
+        )
+
+        assert [row["n"] for row in result.rows] == [str(i) for i in range(900, 910)]
+        assert mock_boto3_client.get_query_results.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_fetches_append_each_page_once(self, config, mock_boto3_client):
+        """Test concurrent calls continuing a cached buffer fetch its next page once."""
+        mock_boto3_client.get_query_execution.return_value = {
+            "QueryExecution": {"Status": {"State": "SUCCEEDED"}, "Statistics": {}}
+        }
+        # Decoding a page yields to the event loop, letting the other call start its fetch
+        config.cpu_chunk_cells = 100
+        tokens = []
+
+        def get_query_results(QueryExecutionId, MaxResults, NextToken=None):
+            tokens.append(NextToken)
+            first = 0 if NextToken is None else 1000
+            rows = [{"Data": [{"VarCharValue": str(i)}]} for i in range(first, first + 1000)]
+            if NextToken is None:
+                rows.insert(0, {"Data": [{"VarCharValue": "n"}]})
+            response = {
+                "ResultSet": {"ResultSetMetadata": {"ColumnInfo": [{"Name": "n"}]}, "Rows": rows}
+            }
+            if NextToken is None:
+                response["NextToken"] = "p2"
+            return response
+
+        mock_boto3_client.get_query_results.side_effect = get_query_results
+
+        client = AthenaClient(config)
+        await client.get_query_results("shared-id", max_rows=1000)
+        first, second = await asyncio.gather(
+            client.get_query_results("shared-id", max_rows=5000),
+            client.get_query_results("shared-id", max_rows=5000),
+        )
+
+        assert tokens == [None, "p2"]
+        assert len(first.rows) == len(second.rows) == 2000
+        assert [row["n"] for row in second.rows] == [str(i) for i in range(2000)]
+        assert len(client.results.get("shared-id").rows) == 2000
+
+    @pytest.mark.asyncio
+    async def test_incremental_query_reuses_unchanged_partitions(self, config, mock_boto3_client):
+        """Test later runs query only changed and newest partitions and merge cached rows."""
+        config.partition_refresh_seconds = 0
+        partitions = {"d1": "100", "d2": "100", "d3": "100"}
+        totals = {"d1": "10", "d2": "20", "d3": "30"}
+        mock_boto3_client.get_table.return_value = {
+            "Table": {"PartitionKeys": [{"Name": "dt", "Type": "string"}]}
+        }
+        mock_boto3_client.get_partitions.side_effect = lambda **params: {
+            "Partitions": [
+                {"Values": [dt], "Parameters": {"transient_lastDdlTime": version}}
+                for dt, version in partitions.items()
+            ]
+        }
+        mock_boto3_client.get_query_execution.return_value = {
+            "QueryExecution": {"Status": {"State": "SUCCEEDED"}, "Statistics": {}}
+        }
+        started = []
+
+        def start_query_execution(QueryString, **params):
+            started.append(QueryString)
+            return {"QueryExecutionId": f"run-{len(started)}"}
+
+        def get_query_results(QueryExecutionId, MaxResults, NextToken=None):
+            query = started[int(QueryExecutionId.split("-")[1]) - 1]
+            rows = [
+                {"Data": [{"VarCharValue": dt}, {"VarCharValue": total}]}
+                for dt, total in totals.items()
+                if " IN (" not in query or f"'{dt}'" in query
+            ]
+            header = {"Data": [{"VarCharValue": "dt"}, {"VarCharValue": "total"}]}
+            return {
+                "ResultSet": {
+                    "ResultSetMetadata": {"ColumnInfo": [{"Name": "dt"}, {"Name": "total"}]},
+                    "Rows": [header] + rows,
+                }
+            }
+
+        mock_boto3_client.start_query_execution.side_effect = start_query_execution
+        mock_boto3_client.get_query_results.side_effect = get_query_results
+
+        client = AthenaClient(config)
+        request = QueryRequest(
+            database="test_db",
+            query="SELECT dt, sum(amount) AS total FROM events GROUP BY dt ORDER BY dt DESC",
+            incremental_key="dt",
+        )
+
+        first = await client.execute_query(request)
+        assert first.incremental.full_refresh
+        assert [row["dt"] for row in first.rows] == ["d3", "d2", "d1"]
+
+        # d1 is rewritten, d4 is added (and is the newest), d3 is unchanged
+        partitions.update({"d1": "200", "d4": "100"})
+        totals.update({"d1": "11", "d3": "31", "d4": "40"})
+        second = await client.execute_query(request)
+
+        assert started[1] == (
+            "SELECT dt, sum(amount) AS total FROM events WHERE \"dt\" IN ('d1', 'd4') "
+            "GROUP BY dt ORDER BY dt DESC"
+        )
+        assert second.executed_query == started[1]
+        assert [(row["dt"], row["total"]) for row in second.rows] == [
+            ("d4", "40"),
+            ("d3", "30"),
+            ("d2", "20"),
+            ("d1", "11"),
+        ]
+        assert second.incremental.partitions_reused == 2
+        assert second.incremental.partitions_queried == 2
+
+    @pytest.mark.asyncio
+    async def test_incremental_query_rejects_rewrite_lint_policy(self, config, mock_boto3_client):
+        """Test incremental runs cannot be narrowed to one partition by the linter."""
+        client = AthenaClient(config)
+        request = QueryRequest(
+            database="test_db",
+            query="SELECT dt, count(*) AS n FROM events GROUP BY dt",
+            incremental_key="dt",
+            lint_policy=LintPolicy.REWRITE,
+        )
+
+        with pytest.raises(ValueError, match="rewrite lint policy"):
+            await client.execute_query(request)
+
+        mock_boto3_client.start_query_execution.assert_not_called()
+        assert client.incremental.get(("test_db", canonical_sql(request.query), "dt")) is None
+
+    @pytest.mark.asyncio
+    async def test_incremental_query_skips_materialized_ctes(self, config, mock_boto3_client):
+        """Test the Athena run behind an incremental query reads CTE bodies from base data."""
+        client = AthenaClient(config)
+        client.materialized = MagicMock()
+        mock_boto3_client.get_table.return_value = {
+            "Table": {"PartitionKeys": [{"Name": "dt", "Type": "string"}]}
+        }
+        mock_boto3_client.get_partitions.return_value = {
+            "Partitions": [{"Values": ["d1"], "Parameters": {"transient_lastDdlTime": "100"}}]
+        }
+        mock_boto3_client.start_query_execution.return_value = {"QueryExecutionId": "run-1"}
+        mock_boto3_client.get_query_execution.return_value = {
+            "QueryExecution": {"Status": {"State": "SUCCEEDED"}, "Statistics": {}}
+        }
+        mock_boto3_client.get_query_results.return_value = {
+            "ResultSet": {
+                "ResultSetMetadata": {"ColumnInfo": [{"Name": "dt"}, {"Name": "n"}]},
+                "Rows": [
+                    {"Data": [{"VarCharValue": "dt"}, {"VarCharValue": "n"}]},
+                    {"Data": [{"VarCharValue": "d1"}, {"VarCharValue": "1"}]},
+                ],
+            }
+        }
+        query = (
+            "WITH k AS (SELECT 'd1' AS dt) "
+            "SELECT dt, count(*) AS n FROM events WHERE dt IN (SELECT dt FROM k) GROUP BY dt"
+        )
+
+        result = await client.execute_query(
+            QueryRequest(database="test_db", query=query, incremental_key="dt")
+        )
+
+        client.materialized.apply.assert_not_called()
+        assert result.incremental.full_refresh
+
+    @pytest.mark.asyncio
+    async def test_query_stats_recorded_once_terminal(self, config, mock_boto3_client):
+        """Test executions are aggregated by shape when their status becomes terminal."""
+        mock_boto3_client.start_query_execution.side_effect = [
+            {"QueryExecutionId": "shape-1"},
+            {"QueryExecutionId": "shape-2"},
+        ]
+        mock_boto3_client.get_query_execution.return_value = {
+            "QueryExecution": {
+                "Status": {"State": "SUCCEEDED"},
+                "Statistics": {"DataScannedInBytes": 500, "TotalExecutionTimeInMillis": 40},
+            }
+        }
+        mock_boto3_client.get_query_results.return_value = {
+            "ResultSet": {"ResultSetMetadata": {"ColumnInfo": []}, "Rows": []}
+        }
+
+        client = AthenaClient(config)
+        for user_id in (1, 2):
+            await client.execute_query(
+                QueryRequest(database="test_db", query=f"SELECT * FROM users WHERE id = {user_id}")
+            )
+        await client.get_query_status("shape-1")
+
+        [shape] = client.query_stats.top()
+        assert shape.query == "select * from users where id = ?"
+        assert shape.executions == 2
+        assert shape.bytes_scanned == 1000
+
+    @pytest.mark.asyncio
+    async def test_predicted_long_query_not_waited_for(self, config, mock_boto3_client):
+        """Test shapes that usually outlast the timeout return their ID without polling."""
+        mock_boto3_client.start_query_execution.return_value = {"QueryExecutionId": "long-id"}
+
+        client = AthenaClient(config)
+        query = "SELECT * FROM events WHERE day = '2024-01-01'"
+        workgroup = client.router.default.key
+        for i in range(3):
+            client.query_stats.started(f"old-{i}", query, workgroup)
+            client.query_stats.finished(
+                f"old-{i}", "SUCCEEDED", {"TotalExecutionTimeInMillis": 300000}
+            )
+
+        result = await client.execute_query(QueryRequest(database="test_db", query=query))
+
+        assert result == "long-id"
+        assert mock_boto3_client.get_query_execution.call_count == 0
+        assert client.query_stats.eta("long-id")["expected_runtime_seconds"] == 300.0
+
+    def test_wait_budget_covers_predicted_runtime(self, config, mock_boto3_client):
+        """Test quick shapes wait for their p95 runtime, within twice the timeout."""
+        client = AthenaClient(config)
+        workgroup = client.router.default.key
+        for i, total_ms in enumerate([20000, 25000, 32000]):
+            client.query_stats.started(f"old-{i}", "SELECT 1", workgroup)
+            client.query_stats.finished(
+                f"old-{i}", "SUCCEEDED", {"TotalExecutionTimeInMillis": total_ms}
+            )
+
+        assert client._wait_budget("SELECT 1", workgroup) == 41.0
+        assert client._wait_budget("SELECT 2", "other") == config.timeout_seconds
+
+    @pytest.mark.asyncio
+    async def test_results_truncated_under_memory_pressure(self, config, mock_boto3_client):
+        """Test a fetch near the memory limit stops after its first page with a cursor."""
+        mock_boto3_client.get_query_execution.return_value = {
+            "QueryExecution": {"Status": {"State": "SUCCEEDED"}, "Statistics": {}}
+        }
+        mock_boto3_client.get_query_results.return_value = {
+            "ResultSet": {
+                "ResultSetMetadata": {"ColumnInfo": [{"Name": "n"}]},
+                "Rows": [{"Data": [{"VarCharValue": "n"}]}]
+                + [{"Data": [{"VarCharValue": str(i)}]} for i in range(3)],
+            },
+            "NextToken": "page-2",
+        }
+
+        client = AthenaClient(config)
+        client.memory.wait_seconds = 0.01
+        # Other in-flight work holds all the memory
+        client.memory.force_reserve("responses", client.memory.limit_bytes)
+        result = await client.get_query_results("pressure-id", max_rows=1000)
+
+        assert [row["n"] for row in result.rows] == ["0", "1", "2"]
+        assert result.truncated
+        assert result.next_cursor is not None
+        assert client.memory.usage()["categories"]["responses"] == client.memory.limit_bytes
+        assert "result_fetches" not in client.memory.usage()["categories"]
+
+    @pytest.mark.asyncio
+    async def test_large_results_served_from_spill(self, config, mock_boto3_client, tmp_path):
+        """Test complete results are spilled to disk and served again without refetching."""
+        config.spill_dir = str(tmp_path)
+        mock_boto3_client.get_query_execution.return_value = {
+            "QueryExecution": {"Status": {"State": "SUCCEEDED"}, "Statistics": {}}
+        }
+        mock_boto3_client.get_query_results.return_value = {
+            "ResultSet": {
+                "ResultSetMetadata": {"ColumnInfo": [{"Name": "n"}]},
+                "Rows": [{"Data": [{"VarCharValue": "n"}]}]
+                + [{"Data": [{"VarCharValue": str(i)}]} for i in range(5)],
+            }
+        }
+
+        client = AthenaClient(config)
+        with patch("athena_mcp.athena.SPILL_MIN_BYTES", 0):
+            first = await client.get_query_results("spill-id", max_rows=2)
+        # Evicted from memory, the result is rebuilt from its spill file
+        client.results.discard("spill-id")
+        second = await client.get_query_results("spill-id", cursor=first.next_cursor)
+
+        assert [row["n"] for row in first.rows] == ["0", "1"]
+        assert [row["n"] for row in second.rows] == ["2", "3", "4"]
+        assert not second.truncated
+        assert os.listdir(tmp_path) == ["spill-id.spill"]
+        assert mock_boto3_client.get_query_results.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_prefetched_schema_skips_queries(self, config, mock_boto3_client):
+        """Test list_tables and describe_table answer from the prefetched catalog."""
+        config.prefetch_databases = ["test_db"]
+        mock_boto3_client.get_tables.return_value = {
+            "TableList": [
+                {
+                    "Name": "events",
+                    "StorageDescriptor": {"Columns": [{"Name": "id", "Type": "int"}]},
+                }
+            ]
+        }
+
+        client = AthenaClient(config)
+        await client.catalog.refresh()
+        database_info = await client.list_tables("test_db")
+        table_info = await client.describe_table("test_db", "events")
+
+        assert database_info.tables == ["events"]
+        assert table_info.columns == [{"name": "id", "type": "int", "comment": ""}]
+        assert mock_boto3_client.start_query_execution.call_count == 0
+
+    @pytest.mark.asyncio
+    async def test_query_local_loads_results_once(self, config, mock_boto3_client):
+        """Test follow-up queries load a result once and then run locally."""
+        execution_id = "33333333-3333-3333-3333-333333333333"
+        mock_boto3_client.get_query_execution.return_value = {
+            "QueryExecution": {"Status": {"State": "SUCCEEDED"}, "Statistics": {}}
+        }
+        mock_boto3_client.get_query_results.return_value = {
+            "ResultSet": {
+                "ResultSetMetadata": {"ColumnInfo": [{"Name": "n", "Type": "integer"}]},
+                "Rows": [{"Data": [{"VarCharValue": "n"}]}]
+                + [{"Data": [{"VarCharValue": str(i)}]} for i in (3, 1, 2)],
+            }
+        }
+
+        client = AthenaClient(config)
+        first = await client.query_local(f'SELECT max(n) AS top FROM "{execution_id}"')
+        second = await client.query_local(f'SELECT n FROM "{execution_id}" ORDER BY n')
+
+        assert first.rows == [{"top": 3}]
+        assert [row["n"] for row in second.rows] == [1, 2, 3]
+        assert mock_boto3_client.get_query_results.call_count == 1
@@ -0,0 +1,56 @@
+"""
+Tests for the hot path microbenchmark suite.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
+
+from hot_paths import build_benchmarks, compare, generate_pages, generate_query, run
+
+
+class TestBenchmarkInputs:
+    """Test the generated inputs."""
+
+    def test_generated_sizes(self):
+        """Test queries and result pages come out at the requested scale."""
+        query = generate_query(99000)
+        pages = generate_pages(2500, 50)
+
+        assert 98000 < len(query) <= 100000
+        assert [len(page["ResultSet"]["Rows"]) for page in pages] == [1000, 1000, 501]
+        assert "NextToken" not in pages[-1]
+
+    def test_benchmarks_run(self):
+        """Test every benchmark runs on small inputs."""
+        for function in build_benchmarks(scale=0.01).values():
+            function()
+
+
+class TestCompare:
+    """Test regression detection against a baseline."""
+
+    def test_threshold(self):
+        """Test only slowdowns past the threshold are reported."""
+        baseline = {"benchmarks": {"a": {"relative": 1.0}, "b": {"relative": 2.0}}}
+        current = {
+            "benchmarks": {
+                "a": {"relative": 1.2},
+                "b": {"relative": 3.0},
+                "new": {"relative": 9.0},
+            }
+        }
+
+        regressions = compare(current, baseline, threshold=0.25)
+
+        assert len(regressions) == 1
+        assert regressions[0].startswith("b: +50%")
+
+    def test_run_reports_relative_times(self):
+        """Test timings are reported in calibration units."""
+        result = run(scale=0.001, repeats=1, min_run_seconds=0)
+
+        timing = result["benchmarks"]["validate_query"]
+        assert timing["relative"] > 0
+        assert result["calibration_seconds"] > 0
@@ -0,0 +1,48 @@
+"""
+Tests for in-memory caches.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from athena_mcp.cache import LRUCache
+
+
+class TestLRUCache:
+    """Test the bounded LRU cache."""
+
+    def test_eviction_order(self):
+        """Test the least recently used entry is evicted first."""
+        cache: LRUCache[str, int] = LRUCache(max_entries=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+
+        assert "a" in cache
+        assert "b" not in cache
+        assert len(cache) == 2
+
+    def test_hit_and_miss_counters(self):
+        """Test hits and misses are counted."""
+        cache: LRUCache[str, int] = LRUCache()
+        cache.put("a", 1)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_byte_bound(self):
+        """Test entries are evicted to stay within the size bound."""
+        cache: LRUCache[str, str] = LRUCache(max_bytes=10, sizeof=len)
+        cache.put("a", "12345")
+        cache.put("b", "12345")
+        cache.put("c", "123")
+        cache.put("huge", "x" * 11)
+
+        assert "a" not in cache
+        assert "huge" not in cache
+        assert cache.bytes == 8
+        assert cache.stats()["evictions"] == 1
@@ -0,0 +1,139 @@
+"""
+Tests for schema catalog prefetching.
+"""
+
+import os
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+from botocore.exceptions import ClientError
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from athena_mcp.catalog import SchemaCatalog
+from athena_mcp.throttle import ApiRateLimiter
+
+
+def _table(name, columns, partition_keys=()):
+    return {
+        "Name": name,
+        "StorageDescriptor": {"Columns": [{"Name": c, "Type": "string"} for c in columns]},
+        "PartitionKeys": [{"Name": key, "Type": "string"} for key in partition_keys],
+    }
+
+
+def _glue():
+    glue = MagicMock()
+    tables = {
+        "sales": [_table("orders", ["id"], ["dt"]), _table("customers", ["id", "name"])],
+        "analytics_web": [_table("events", ["id"])],
+    }
+
+    def get_tables(DatabaseName, NextToken=None):
+        if DatabaseName not in tables:
+            raise ClientError({"Error": {"Code": "EntityNotFoundException"}}, "GetTables")
+        pages = tables[DatabaseName]
+        if NextToken is None:
+            return (
+                {"TableList": pages[:1], "NextToken": "2"}
+                if len(pages) > 1
+                else {"TableList": pages}
+            )
+        return {"TableList": pages[1:]}
+
+    glue.get_tables.side_effect = get_tables
+    glue.get_databases.return_value = {
+        "DatabaseList": [{"Name": "sales"}, {"Name": "analytics_web"}, {"Name": "scratch"}]
+    }
+    return glue
+
+
+class TestSchemaCatalog:
+    """Test prefetching and serving table lists and schemas."""
+
+    @pytest.mark.asyncio
+    async def test_prefetch_named_databases(self):
+        """Test named databases are loaded without listing databases."""
+        glue = _glue()
+        catalog = SchemaCatalog(glue, ApiRateLimiter(), ["sales"])
+
+        await catalog.refresh()
+
+        assert glue.get_databases.call_count == 0
+        assert catalog.get_database("sales").tables == ["customers", "orders"]
+        orders = catalog.get_table("sales", "ORDERS")
+        assert [column["name"] for column in orders.columns] == ["id", "dt"]
+        assert orders.partition_keys == ["dt"]
+        assert catalog.get_database("analytics_web") is None
+
+    @pytest.mark.asyncio
+    async def test_prefetch_glob_patterns(self):
+        """Test glob patterns are matched against the database list."""
+        catalog = SchemaCatalog(_glue(), ApiRateLimiter(), ["analytics_*", "sal?s"])
+
+        await catalog.refresh()
+
+        assert catalog.get_database("analytics_web").tables == ["events"]
+        assert catalog.get_database("sales") is not None
+        assert catalog.get_database("scratch") is None
+        assert catalog.metrics()["databases_loaded"] == 2
+
+    @pytest.mark.asyncio
+    async def test_failures_and_staleness(self):
+        """Test failed databases are counted and stale entries are not served."""
+        catalog = SchemaCatalog(_glue(), ApiRateLimiter(), ["sales", "missing"], 60)
+
+        await catalog.refresh()
+
+        metrics = catalog.metrics()
+        assert metrics["failures"] == 1
+        assert metrics["tables"] == 2
+
+        catalog._entries["sales"].loaded_at -= 121
+        assert catalog.get_database("sales") is None
+        assert catalog.metrics()["max_age_seconds"] >= 121
+
+    @pytest.mark.asyncio
+    async def test_start_without_databases(self):
+        """Test prefetching is not started when no databases are configured."""
+        catalog = SchemaCatalog(_glue(), ApiRateLimiter(), [])
+
+        catalog.start()
+        await catalog.stop()
+
+        assert catalog.metrics()["running"] is False
+
+    @pytest.mark.asyncio
+    async def test_index_follows_catalog(self):
+        """Test the search index is built from loaded pages and drops deleted tables."""
+        glue = _glue()
+        catalog = SchemaCatalog(glue, ApiRateLimiter(), ["sales"])
+
+        await catalog.refresh()
+        assert [m.table_name for m in catalog.index.search("name")] == ["customers"]
+
+        glue.get_tables.side_effect = None
+        glue.get_tables.return_value = {"TableList": [_table("orders", ["id"], ["dt"])]}
+        await catalog.refresh()
+
+        assert catalog.index.search("name") == []
+        assert catalog.metrics()["indexed_tables"] == 1
+
+    @pytest.mark.asyncio
+    async def test_fetch_named_tables_in_batches(self):
+        """Test named tables are fetched with name expressions and filtered exactly."""
+        glue = MagicMock()
+        glue.get_tables.return_value = {
+            "TableList": [_table("orders", ["id"]), _table("orders_archive", ["id"])]
+        }
+        catalog = SchemaCatalog(glue, ApiRateLimiter(), [])
+
+        tables = await catalog.fetch_tables("Sales", ["orders", "ghost"])
+
+        assert list(tables) == ["orders"]
+        assert glue.get_tables.call_args.kwargs == {
+            "DatabaseName": "sales",
+            "Expression": "ghost|orders",
+        }
+        assert [m.table_name for m in catalog.index.search("orders")] == ["orders"]
@@ -83,6 +83,161 @@ class TestConfig:
             with pytest.raises(ValueError, match="Timeout must be at least 1 second"):
                 Config.from_env()
 
+    def test_partition_refresh_seconds(self):
+        """Test partition refresh interval parsing and validation."""
+        env_vars = {
+            "ATHENA_S3_OUTPUT_LOCATION": "s3://test-bucket/results/",
+            "ATHENA_PARTITION_REFRESH_SECONDS": "30",
+        }
+
+        with patch.dict(os.environ, env_vars, clear=True):
+            assert Config.from_env().partition_refresh_seconds == 30
+
+        env_vars["ATHENA_PARTITION_REFRESH_SECONDS"] = "-1"
+        with patch.dict(os.environ, env_vars, clear=True):
+            with pytest.raises(ValueError, match="must be at least 0"):
+                Config.from_env()
+
+    def test_prefetch_databases(self):
+        """Test schema prefetch settings are parsed from the environment."""
+        env_vars = {
+            "ATHENA_S3_OUTPUT_LOCATION": "s3://test-bucket/results/",
+            "ATHENA_PREFETCH_DATABASES": "sales, analytics_*,",
+            "ATHENA_PREFETCH_CONCURRENCY": "2",
+        }
+
+        with patch.dict(os.environ, env_vars, clear=True):
+            config = Config.from_env()
+
+        assert config.prefetch_databases == ["sales", "analytics_*"]
+        assert config.prefetch_concurrency == 2
+        assert config.prefetch_refresh_seconds == 900
+
+    def test_record_and_replay_files(self):
+        """Test record and replay settings, which cannot be combined."""
+        env_vars = {
+            "ATHENA_S3_OUTPUT_LOCATION": "s3://test-bucket/results/",
+            "ATHENA_REPLAY_FILE": "session.jsonl",
+            "ATHENA_REPLAY_SPEED": "2.5",
+        }
+
+        with patch.dict(os.environ, env_vars, clear=True):
+            config = Config.from_env()
+
+        assert config.replay_file == "session.jsonl"
+        assert config.replay_speed == 2.5
+        assert config.record_file is None
+
+        env_vars["ATHENA_RECORD_FILE"] = "other.jsonl"
+        with patch.dict(os.environ, env_vars, clear=True):
+            with pytest.raises(ValueError, match="cannot both be set"):
+                Config.from_env()
+
+    def test_lint_policy(self):
+        """Test the server lint policy, which cannot be rewrite."""
+        env_vars = {"ATHENA_S3_OUTPUT_LOCATION": "s3://test-bucket/results/"}
+
+        with patch.dict(os.environ, env_vars, clear=True):
+            assert Config.from_env().lint_policy == "warn"
+
+        env_vars["ATHENA_LINT_POLICY"] = "rewrite"
+        with patch.dict(os.environ, env_vars, clear=True):
+            with pytest.raises(ValueError, match="ATHENA_LINT_POLICY"):
+                Config.from_env()
+
+    def test_cpu_chunk_cells(self):
+        """Test the chunk size for decoding and serializing large results."""
+        env_vars = {"ATHENA_S3_OUTPUT_LOCATION": "s3://test-bucket/results/"}
+
+        with patch.dict(os.environ, env_vars, clear=True):
+            assert Config.from_env().cpu_chunk_cells == 10000
+
+        env_vars["ATHENA_CPU_CHUNK_CELLS"] = "10"
+        with patch.dict(os.environ, env_vars, clear=True):
+            with pytest.raises(ValueError, match="at least 100"):
+                Config.from_env()
+
+    def test_materialize_settings(self):
+        """Test subquery materialization is off by default and its prefix defaults."""
+        env_vars = {"ATHENA_S3_OUTPUT_LOCATION": "s3://test-bucket/results/"}
+
+        with patch.dict(os.environ, env_vars, clear=True):
+            config = Config.from_env()
+            assert config.materialize_database is None
+            assert config.materialize_prefix() == "s3://test-bucket/results/materialized/"
+
+        env_vars["ATHENA_MATERIALIZE_DATABASE"] = "scratch"
+        env_vars["ATHENA_MATERIALIZE_LOCATION"] = "s3://scratch-bucket/mv"
+        env_vars["ATHENA_MATERIALIZE_MIN_USES"] = "5"
+        with patch.dict(os.environ, env_vars, clear=True):
+            config = Config.from_env()
+            assert config.materialize_database == "scratch"
+            assert config.materialize_prefix() == "s3://scratch-bucket/mv/"
+            assert config.materialize_min_uses == 5
+
+        env_vars["ATHENA_MATERIALIZE_LOCATION"] = "/tmp/mv"
+        with patch.dict(os.environ, env_vars, clear=True):
+            with pytest.raises(ValueError, match="ATHENA_MATERIALIZE_LOCATION"):
+                Config.from_env()
+
+    def test_workgroup_pool(self):
+        """Test parsing of the ATHENA_WORKGROUPS routing pool."""
+        env_vars = {
+            "ATHENA_S3_OUTPUT_LOCATION": "s3://test-bucket/results/",
+            "ATHENA_WORKGROUPS": (
+                '[{"name": "wg1", "max_concurrent": 5},'
+                ' {"name": "wg2", "region": "eu-west-1", "s3_output_location": "s3://eu/"}]'
+            ),
+        }
+
+        with patch.dict(os.environ, env_vars, clear=True):
+            pool = Config.from_env().workgroup_pool()
+
+            assert [(wg.name, wg.region, wg.max_concurrent) for wg in pool] == [
+                ("wg1", "us-east-1", 5),
+                ("wg2", "eu-west-1", None),
+            ]
+            assert pool[0].s3_output_location == "s3://test-bucket/results/"
+            assert pool[1].s3_output_location == "s3://eu/"
+
+    def test_default_workgroup_pool(self):
+        """Test the pool defaults to the single configured workgroup."""
+        config = Config(s3_output_location="s3://test-bucket/results/", athena_workgroup="wg")
+
+        assert [wg.name for wg in config.workgroup_pool()] == ["wg"]
+
+    def test_invalid_workgroup_pool(self):
+        """Test malformed ATHENA_WORKGROUPS values are rejected."""
+        env_vars = {
+            "ATHENA_S3_OUTPUT_LOCATION": "s3://test-bucket/results/",
+            "ATHENA_WORKGROUPS": '[{"region": "us-east-1"}]',
+        }
+
+        with patch.dict(os.environ, env_vars, clear=True):
+            with pytest.raises(ValueError, match="ATHENA_WORKGROUPS must be a JSON list"):
+                Config.from_env()
+
+    @pytest.mark.parametrize(
+        "entry",
+        [
+            '{"name": "wg", "max_concurrent": "4"}',
+            '{"name": "wg", "max_concurrent": 2.5}',
+            '{"name": "wg", "max_concurrent": true}',
+            '{"name": 7}',
+            '{"name": "wg", "s3_output_location": null}',
+        ],
+    )
+    def test_mistyped_workgroup_fields(self, entry):
+        """Test wrongly typed workgroup fields raise the same error as malformed entries."""
+        env_vars = {
+            "ATHENA_S3_OUTPUT_LOCATION": "s3://test-bucket/results/",
+            "ATHENA_WORKGROUPS": f"[{entry}]",
+        }
+
+        with patch.dict(os.environ, env_vars, clear=True):
+            with pytest.raises(ValueError, match="ATHENA_WORKGROUPS must be a JSON list"):
+                Config.from_env()
+
     def test_str_representation(self):
         """Test string representation doesn't expose sensitive data."""
         env_vars = {"ATHENA_S3_OUTPUT_LOCATION": "s3://test-bucket/results/"}
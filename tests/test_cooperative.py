@@ -0,0 +1,153 @@
+"""
+Tests for cooperative decoding and serialization of large results.
+"""
+
+import asyncio
+import json
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from athena_mcp.athena import AthenaClient
+from athena_mcp.config import Config
+from athena_mcp.cooperative import (
+    chunk_rows,
+    copy_rows_cooperatively,
+    decode_rows_cooperatively,
+    dumps_cooperatively,
+    size_rows_cooperatively,
+)
+from athena_mcp.results import decode_rows, row_size
+
+
+def _payload(rows, columns=50):
+    return {
+        "query_execution_id": "q1",
+        "columns": [f"c{i}" for i in range(columns)],
+        "rows": [
+            {f"c{i}": None if (row + i) % 7 == 0 else f'v"{row}\n{i}' for i in range(columns)}
+            for row in range(rows)
+        ],
+        "truncated": False,
+        "column_types": {"c0": "varchar"},
+    }
+
+
+def _pages(rows, columns):
+    """GetQueryResults pages of 1000 rows, keyed by the NextToken that fetches them."""
+    names = [f"c{i}" for i in range(columns)]
+    header = {"Data": [{"VarCharValue": name} for name in names]}
+    pages = {}
+    for first in range(0, rows, 1000):
+        data = [
+            {"Data": [{"VarCharValue": f"value-{row}-{i}"} for i in range(columns)]}
+            for row in range(first, min(first + 1000, rows))
+        ]
+        page = {
+            "ResultSet": {
+                "ResultSetMetadata": {"ColumnInfo": [{"Name": name} for name in names]},
+                "Rows": ([header] if first == 0 else []) + data,
+            }
+        }
+        if first + 1000 < rows:
+            page["NextToken"] = f"page-{first + 1000}"
+        pages[f"page-{first}" if first else None] = page
+    return pages
+
+
+class TestCooperativeWork:
+    """Test chunked work gives the same output and lets other tasks run."""
+
+    @pytest.mark.asyncio
+    async def test_dumps_matches_json(self):
+        """Test chunked serialization is identical to json.dumps(indent=2)."""
+        for rows in (0, 3, 1001):
+            payload = _payload(rows, columns=5)
+
+            assert await dumps_cooperatively(payload, "rows", 100) == json.dumps(payload, indent=2)
+
+    @pytest.mark.asyncio
+    async def test_decode_matches_inline(self):
+        """Test chunked decoding gives the same rows and sizes."""
+        columns = ["a", "b", "c"]
+        rows_data = [
+            {"Data": [{"VarCharValue": f"{row}-{i}"} for i in range(3)] + [{}]}
+            for row in range(250)
+        ]
+
+        assert await decode_rows_cooperatively(rows_data, columns, 100) == decode_rows(
+            rows_data, columns
+        )
+
+    @pytest.mark.asyncio
+    async def test_copy_and_size_match_inline(self):
+        """Test chunked row copies and sizes match slicing and summing row_size."""
+        rows = _payload(250, columns=4)["rows"]
+
+        assert await copy_rows_cooperatively(rows, 7, 243, 4, 100) == rows[7:243]
+        assert await copy_rows_cooperatively(rows, 5, 5, 4, 100) == []
+        assert await size_rows_cooperatively(rows, 100) == sum(row_size(row) for row in rows)
+
+    @pytest.mark.asyncio
+    async def test_large_result_does_not_stall_event_loop(self, tmp_path):
+        """
+        Test other tasks run between every chunk of rows while a large result is
+        fetched, spilled, copied out and serialized.
+
+        Work is counted as rows encoded or decoded as JSON, which every per-row
+        step does, so the check does not depend on timing.
+        """
+        config = Config(
+            s3_output_location="s3://test-bucket/results/",
+            cpu_chunk_cells=1000,
+            spill_dir=str(tmp_path),
+        )
+        pages = _pages(3000, columns=10)
+        step = chunk_rows(10, config.cpu_chunk_cells)
+        work = [0]
+        done = False
+        dumps, loads = json.dumps, json.loads
+
+        def counting_dumps(value, *args, **kwargs):
+            rows = isinstance(value, list) and value and isinstance(value[0], dict)
+            work[-1] += len(value) if rows else 1
+            return dumps(value, *args, **kwargs)
+
+        def counting_loads(value, *args, **kwargs):
+            work[-1] += 1
+            return loads(value, *args, **kwargs)
+
+        async def ticker():
+            while not done:
+                work.append(0)
+                await asyncio.sleep(0)
+
+        with patch("boto3.Session") as session:
+            athena = session.return_value.client.return_value
+            athena.get_query_execution.return_value = {
+                "QueryExecution": {"Status": {"State": "SUCCEEDED"}, "Statistics": {}}
+            }
+            athena.get_query_results.side_effect = lambda **params: pages[params.get("NextToken")]
+            client = AthenaClient(config)
+
+            task = asyncio.ensure_future(ticker())
+            await asyncio.sleep(0)
+            with patch("json.dumps", counting_dumps), patch("json.loads", counting_loads):
+                result = await client.get_query_results("big-id", max_rows=5000)
+                # As the query tools serialize results
+                payload = result.copy(update={"rows": []}).dict()
+                payload["rows"] = result.rows
+                text = await dumps_cooperatively(payload, "rows", config.cpu_chunk_cells)
+            done = True
+            await task
+
+        assert client.results.get("big-id").spilled is not None
+        assert len(json.loads(text)["rows"]) == 3000
+        # Decoded, spilled, read back and serialized
+        assert sum(work) > 4 * 3000
+        # At most the end of one chunk and the start of the next between turns
+        assert max(work) <= 2 * step + 5
@@ -0,0 +1,69 @@
+"""
+Tests for schema digests.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from athena_mcp.digest import build_schema_digest
+from athena_mcp.models import TableInfo
+
+
+def _table(name, columns, partition_keys=()):
+    return TableInfo(
+        database="sales",
+        table_name=name,
+        columns=[{"name": c, "type": t, "comment": ""} for c, t in columns],
+        partition_keys=list(partition_keys),
+    )
+
+
+class TestSchemaDigest:
+    """Test digest compaction."""
+
+    def test_shared_columns_typed_once(self):
+        """Test columns repeated across tables are typed once."""
+        digest = build_schema_digest(
+            "sales",
+            [
+                _table("orders", [("id", "bigint"), ("total", "double"), ("dt", "string")], ["dt"]),
+                _table(
+                    "refunds", [("id", "bigint"), ("reason", "string"), ("dt", "string")], ["dt"]
+                ),
+            ],
+            missing=["ghost"],
+        )
+
+        assert digest.shared_columns == {"dt": "string", "id": "bigint"}
+        assert digest.tables["orders"] == {"columns": "id, total double", "partitioned_by": "dt"}
+        assert digest.tables["refunds"]["columns"] == "id, reason string"
+        assert digest.missing == ["ghost"]
+
+    def test_conflicting_types_not_shared(self):
+        """Test a name used with different types keeps its type everywhere."""
+        digest = build_schema_digest(
+            "sales",
+            [
+                _table("a", [("id", "bigint")]),
+                _table("b", [("id", "bigint")]),
+                _table("c", [("id", "string")]),
+            ],
+            missing=[],
+        )
+
+        assert digest.shared_columns == {}
+        assert digest.tables["c"] == {"columns": "id string"}
+
+    def test_identical_schemas_collapsed(self):
+        """Test tables with identical schemas reference the first one."""
+        columns = [("id", "bigint"), ("payload", "string")]
+        digest = build_schema_digest(
+            "sales",
+            [_table("events_2024", columns), _table("events_2023", columns)],
+            missing=[],
+        )
+
+        assert digest.tables["events_2024"] == {"same_as": "events_2023"}
+        assert digest.table_count == 2
@@ -0,0 +1,143 @@
+"""
+Tests for query fingerprinting and per-shape statistics.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from athena_mcp.fingerprint import QueryStatsTracker, fingerprint, normalize_query
+
+
+def _statistics(bytes_scanned=0, total_ms=0, reused=False):
+    return {
+        "DataScannedInBytes": bytes_scanned,
+        "TotalExecutionTimeInMillis": total_ms,
+        "ResultReuseInformation": {"ReusedPreviousResult": reused},
+    }
+
+
+class TestNormalizeQuery:
+    """Test SQL normalization."""
+
+    def test_literals_replaced(self):
+        """Test string, numeric and typed literals become placeholders."""
+        normalized = normalize_query(
+            "SELECT * FROM t WHERE name = 'it''s' AND n > 1.5e3 AND dt = DATE '2024-01-01'"
+        )
+
+        assert normalized == "select * from t where name = ? and n > ? and dt = ?"
+
+    def test_case_whitespace_and_comments_folded(self):
+        """Test case, whitespace and comments do not change the shape."""
+        first = "SELECT a,\n  COUNT(*)  FROM t -- daily\nGROUP BY a;"
+        second = "/* report */ select a, count( * ) from T group   by a"
+
+        assert normalize_query(first) == "select a, count(*) from t group by a"
+        assert fingerprint(first) == fingerprint(second)
+
+    def test_in_lists_collapsed(self):
+        """Test IN-lists of any length share a shape, but subqueries do not."""
+        assert fingerprint("SELECT 1 FROM t WHERE id IN (1)") == fingerprint(
+            "SELECT 1 FROM t WHERE id IN (4, 5, 6, 7)"
+        )
+        assert normalize_query("SELECT 1 FROM t WHERE id IN (SELECT id FROM u)") == (
+            "select ? from t where id in (select id from u)"
+        )
+
+    def test_identifiers_kept(self):
+        """Test identifiers containing digits and different tables stay distinct."""
+        assert normalize_query("SELECT c1 FROM t2") == "select c1 from t2"
+        assert fingerprint("SELECT * FROM a") != fingerprint("SELECT * FROM b")
+
+
+class TestQueryStatsTracker:
+    """Test rolling per-shape statistics."""
+
+    def test_aggregates_per_shape(self):
+        """Test executions of one shape are aggregated."""
+        tracker = QueryStatsTracker()
+        for i, (total_ms, reused) in enumerate([(100, False), (300, True), (200, False)]):
+            tracker.started(f"id-{i}", f"SELECT * FROM t WHERE id = {i}")
+            tracker.finished(f"id-{i}", "SUCCEEDED", _statistics(1000, total_ms, reused))
+
+        [shape] = tracker.top()
+
+        assert shape.query == "select * from t where id = ?"
+        assert shape.executions == 3
+        assert shape.bytes_scanned == 3000
+        assert shape.mean_execution_ms == 200
+        assert shape.p95_execution_ms == 300
+        assert shape.reuse_hit_rate == 0.333
+
+    def test_finished_is_idempotent(self):
+        """Test repeated or unknown terminal statuses are not counted."""
+        tracker = QueryStatsTracker()
+        tracker.started("id-1", "SELECT 1")
+        tracker.finished("id-1", "FAILED", _statistics())
+        tracker.finished("id-1", "FAILED", _statistics())
+        tracker.finished("unknown", "SUCCEEDED", _statistics())
+
+        [shape] = tracker.top()
+
+        assert shape.executions == 1
+        assert shape.failed == 1
+
+    def test_top_orderings(self):
+        """Test shapes rank by bytes scanned, latency or execution count."""
+        tracker = QueryStatsTracker()
+        runs = [("SELECT * FROM big", 10**9, 50)] + [("SELECT * FROM slow", 10, 9000)] * 2
+        for i, (query, bytes_scanned, total_ms) in enumerate(runs):
+            tracker.started(f"id-{i}", query)
+            tracker.finished(f"id-{i}", "SUCCEEDED", _statistics(bytes_scanned, total_ms))
+
+        assert tracker.top(1, "cost")[0].query == "select * from big"
+        assert tracker.top(1, "latency")[0].query == "select * from slow"
+        assert tracker.top(1, "count")[0].executions == 2
+        with pytest.raises(ValueError, match="order_by"):
+            tracker.top(1, "bytes")
+
+    def test_bounded_shapes(self):
+        """Test the least recently seen shapes are dropped beyond the limit."""
+        tracker = QueryStatsTracker(max_shapes=2)
+        for i, table in enumerate(["a", "b", "a", "c"]):
+            tracker.started(f"id-{i}", f"SELECT * FROM {table}")
+            tracker.finished(f"id-{i}", "SUCCEEDED", _statistics())
+
+        assert len(tracker) == 2
+        assert tracker.shape("SELECT * FROM b") is None
+        assert tracker.shape("select * from A").executions == 2
+
+    def test_predict_per_workgroup(self):
+        """Test runtimes are predicted per workgroup once enough runs succeeded."""
+        tracker = QueryStatsTracker()
+        for i, total_ms in enumerate([1000, 3000, 2000, 60000]):
+            tracker.started(f"id-{i}", "SELECT * FROM t", "us-east-1/etl")
+            state = "FAILED" if total_ms == 60000 else "SUCCEEDED"
+            tracker.finished(f"id-{i}", state, _statistics(total_ms=total_ms))
+
+        prediction = tracker.predict("select * from T", "us-east-1/etl")
+
+        assert prediction.samples == 3
+        assert prediction.median_ms == 2000
+        assert prediction.p95_ms == 3000
+        assert tracker.predict("SELECT * FROM t", "us-east-1/adhoc") is None
+
+    def test_eta_of_pending_execution(self):
+        """Test pending executions get an ETA from their shape's history."""
+        tracker = QueryStatsTracker()
+        for i in range(3):
+            tracker.started(f"id-{i}", "SELECT 1")
+            tracker.finished(f"id-{i}", "SUCCEEDED", _statistics(total_ms=120000))
+        tracker.started("running", "SELECT 2")
+        tracker.started("unknown-shape", "SELECT * FROM t")
+
+        eta = tracker.eta("running")
+
+        assert eta["expected_runtime_seconds"] == 120.0
+        assert 119 <= eta["eta_seconds"] <= 120
+        assert tracker.eta("unknown-shape") is None
+        assert tracker.eta("missing") is None
@@ -0,0 +1,145 @@
+"""
+Tests for query history lookups.
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from athena_mcp.history import ExecutionHistory, HistoryFilter
+from athena_mcp.throttle import ApiRateLimiter
+
+NOW = datetime(2024, 6, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _execution(execution_id, state="SUCCEEDED", age_hours=0, database="db", scanned=0):
+    return {
+        "QueryExecutionId": execution_id,
+        "Query": f"SELECT {execution_id}",
+        "QueryExecutionContext": {"Database": database},
+        "Status": {"State": state, "SubmissionDateTime": NOW - timedelta(hours=age_hours)},
+        "Statistics": {"DataScannedInBytes": scanned},
+    }
+
+
+def _client(executions, page_size=50):
+    """Mock client serving executions newest first in pages."""
+    client = MagicMock()
+    by_id = {execution["QueryExecutionId"]: execution for execution in executions}
+    ids = [execution["QueryExecutionId"] for execution in executions]
+
+    def list_query_executions(MaxResults, NextToken=None, WorkGroup=None):
+        start = int(NextToken or 0)
+        response = {"QueryExecutionIds": ids[start : start + page_size]}
+        if start + page_size < len(ids):
+            response["NextToken"] = str(start + page_size)
+        return response
+
+    def batch_get_query_execution(QueryExecutionIds):
+        assert len(QueryExecutionIds) <= 50
+        return {"QueryExecutions": [by_id[i] for i in QueryExecutionIds]}
+
+    client.list_query_executions.side_effect = list_query_executions
+    client.batch_get_query_execution.side_effect = batch_get_query_execution
+    return client
+
+
+class TestExecutionHistory:
+    """Test history scanning, filtering and caching."""
+
+    @pytest.mark.asyncio
+    async def test_filters(self):
+        """Test state, database and bytes filters."""
+        client = _client(
+            [
+                _execution("a", scanned=100),
+                _execution("b", state="FAILED", scanned=100),
+                _execution("c", database="other", scanned=100),
+                _execution("d", scanned=1),
+            ]
+        )
+        history_filter = HistoryFilter(state="succeeded", database="db", min_bytes_scanned=10)
+
+        history = await ExecutionHistory(ApiRateLimiter()).search(client, "wg", history_filter)
+
+        assert [e.query_execution_id for e in history.executions] == ["a"]
+        assert history.scanned == 4
+
+    @pytest.mark.asyncio
+    async def test_finished_executions_are_cached(self):
+        """Test terminal executions are not fetched twice, running ones are."""
+        client = _client([_execution("done"), _execution("busy", state="RUNNING")])
+        history = ExecutionHistory(ApiRateLimiter())
+
+        await history.search(client, None, HistoryFilter())
+        await history.search(client, None, HistoryFilter())
+
+        second_batch = client.batch_get_query_execution.call_args_list[1].kwargs
+        assert second_batch["QueryExecutionIds"] == ["busy"]
+
+    @pytest.mark.asyncio
+    async def test_stops_at_window_start(self):
+        """Test scanning stops once executions are older than `since`."""
+        executions = [_execution(str(i), age_hours=i) for i in range(120)]
+        client = _client(executions)
+        since = (NOW - timedelta(hours=10)).isoformat()
+
+        history = await ExecutionHistory(ApiRateLimiter()).search(
+            client, None, HistoryFilter(since=since), limit=100
+        )
+
+        assert len(history.executions) == 11
+        assert history.next_token is None
+        assert client.list_query_executions.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_limit_and_continuation(self):
+        """Test results are limited and a token is returned to continue."""
+        client = _client([_execution(str(i)) for i in range(120)])
+
+        history = await ExecutionHistory(ApiRateLimiter()).search(
+            client, None, HistoryFilter(), limit=60
+        )
+
+        assert len(history.executions) == 60
+        assert history.next_token is not None
+
+        rest = await ExecutionHistory(ApiRateLimiter()).search(
+            client, None, HistoryFilter(), limit=100, next_token=history.next_token
+        )
+        assert [e.query_execution_id for e in rest.executions] == [str(i) for i in range(60, 120)]
+        assert rest.next_token is None
+
+    @pytest.mark.asyncio
+    async def test_continuation_within_page(self):
+        """Test matches left on a page when the limit is reached are returned next time."""
+        client = _client([_execution(f"id{i}") for i in range(100)])
+        history = ExecutionHistory(ApiRateLimiter())
+
+        first = await history.search(client, None, HistoryFilter(), limit=20)
+        second = await history.search(
+            client, None, HistoryFilter(), limit=20, next_token=first.next_token
+        )
+
+        assert first.executions[-1].query_execution_id == "id19"
+        assert [e.query_execution_id for e in second.executions] == [
+            f"id{i}" for i in range(20, 40)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_invalid_token(self):
+        """Test tokens not returned by a search are rejected."""
+        with pytest.raises(ValueError, match="history token"):
+            await ExecutionHistory(ApiRateLimiter()).search(
+                _client([]), None, HistoryFilter(), next_token="not-a-token"
+            )
+
+    def test_invalid_timestamp(self):
+        """Test malformed time filters are rejected."""
+        with pytest.raises(ValueError, match="Invalid ISO 8601"):
+            HistoryFilter(since="yesterday")
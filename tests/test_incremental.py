@@ -0,0 +1,120 @@
+"""
+Tests for incremental aggregate queries.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from athena_mcp.incremental import IncrementalAggregate, check_incremental_query, key_versions
+from athena_mcp.partitions import PartitionIndex
+
+
+def _index():
+    index = PartitionIndex(
+        "db", "events", [{"name": "region", "type": "string"}, {"name": "day", "type": "int"}]
+    )
+    for region in ("eu", "us"):
+        for day in ("01", "2"):
+            index.upsert(
+                {
+                    "Values": [region, day],
+                    "StorageDescriptor": {"Location": f"s3://b/{region}/{day}/"},
+                    "Parameters": {"transient_lastDdlTime": "100"},
+                }
+            )
+    return index
+
+
+class TestCheckIncrementalQuery:
+    """Test which queries can be assembled per partition."""
+
+    def test_accepted_queries(self):
+        """Test grouping by the key, with optional ordering by it."""
+        query = "SELECT dt, count(*) AS n FROM events WHERE dt >= '2024-01-01' GROUP BY dt"
+
+        assert check_incremental_query(query, "dt") is False
+        assert check_incremental_query(query + " ORDER BY e.dt DESC", "DT") is True
+        grouped = (
+            "SELECT dt, region, sum(x) FROM events "
+            "GROUP BY region, dt HAVING sum(x) > 0 ORDER BY dt"
+        )
+        assert check_incremental_query(grouped, "dt") is False
+
+    @pytest.mark.parametrize(
+        "query, message",
+        [
+            ("SELECT region, count(*) FROM events GROUP BY region", "GROUP BY the partition key"),
+            ("SELECT dt, count(*) FROM events GROUP BY ROLLUP (dt)", "ROLLUP"),
+            ("SELECT dt, count(*) FROM events GROUP BY dt LIMIT 10", "LIMIT"),
+            ("SELECT dt, count(*) FROM events GROUP BY dt ORDER BY count(*)", "ORDER BY"),
+            ("SELECT dt, sum(count(*)) OVER () FROM events GROUP BY dt", "OVER"),
+            ("SELECT dt, count(*) FROM events WHERE dt > current_date GROUP BY dt", "current_date"),
+        ],
+    )
+    def test_rejected_queries(self, query, message):
+        """Test queries whose rows combine partitions or depend on the time they run."""
+        with pytest.raises(ValueError, match=message):
+            check_incremental_query(query, "dt")
+
+    def test_literals_are_not_functions(self):
+        """Test volatile function names inside string literals are allowed."""
+        query = "SELECT dt, count(*) FROM events WHERE kind = 'now' GROUP BY dt"
+
+        assert check_incremental_query(query, "dt") is False
+
+
+class TestIncrementalAggregate:
+    """Test per-partition versions, staleness and merging."""
+
+    def test_key_versions_cover_every_partition_of_a_value(self):
+        """Test a non-leading key's versions combine partitions and normalize numbers."""
+        index = _index()
+        versions = key_versions(index, 1)
+
+        assert set(versions) == {"1", "2"}
+        index.upsert(
+            {
+                "Values": ["us", "2"],
+                "StorageDescriptor": {"Location": "s3://b/us/2/"},
+                "Parameters": {"transient_lastDdlTime": "200"},
+            }
+        )
+        changed = key_versions(index, 1)
+        assert changed["1"] == versions["1"]
+        assert changed["2"] != versions["2"]
+
+    def test_stale_merge_and_order(self):
+        """Test changed and newest values are stale, and merges replace only those."""
+        aggregate = IncrementalAggregate()
+        aggregate.merge(
+            ["dt", "n"],
+            {},
+            [{"dt": "a", "n": "1"}, {"dt": "b", "n": "2"}, {"dt": "c", "n": "3"}],
+            {"a": "v1", "b": "v1", "c": "v1"},
+            "dt",
+            "string",
+        )
+
+        versions = {"a": "v1", "b": "v2", "c": "v1", "d": "v1"}
+        assert aggregate.stale(versions, "d") == ["b", "d"]
+        assert aggregate.stale({"a": "v1", "b": "v1", "c": "v1"}, "c") == ["c"]
+
+        aggregate.merge(
+            ["dt", "n"],
+            {},
+            [{"dt": "b", "n": "20"}],
+            {"b": "v2", "d": "v1"},
+            "dt",
+            "string",
+        )
+        aggregate.prune({"b": "v2", "c": "v1", "d": "v1"})
+
+        assert aggregate.rows(True, lambda value: value) == [
+            {"dt": "c", "n": "3"},
+            {"dt": "b", "n": "20"},
+        ]
+        assert aggregate.partitions["d"] == ("v1", [])
@@ -0,0 +1,144 @@
+"""
+Tests for query cost linting.
+"""
+
+import os
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from athena_mcp.catalog import SchemaCatalog
+from athena_mcp.lint import QueryLinter, add_partition_filter, has_outer_star, predicate_columns
+from athena_mcp.models import LintPolicy, TableInfo
+from athena_mcp.partitions import PartitionCatalog
+from athena_mcp.rewrite import table_references
+from athena_mcp.throttle import ApiRateLimiter
+
+
+def _linter(glue=None):
+    glue = glue or MagicMock()
+    api = ApiRateLimiter()
+    linter = QueryLinter(SchemaCatalog(glue, api, []), PartitionCatalog(glue, api))
+    linter.remember(
+        TableInfo(
+            database="db",
+            table_name="events",
+            columns=[{"name": f"c{i}", "type": "string"} for i in range(40)]
+            + [{"name": "dt", "type": "string"}],
+            partition_keys=["dt"],
+        )
+    )
+    linter.remember(
+        TableInfo(database="db", table_name="users", columns=[{"name": "id", "type": "bigint"}])
+    )
+    return linter
+
+
+def _partitioned_glue():
+    glue = MagicMock()
+    glue.get_table.return_value = {"Table": {"PartitionKeys": [{"Name": "dt", "Type": "string"}]}}
+    glue.get_partitions.return_value = {
+        "Partitions": [{"Values": [f"2024-01-0{day}"]} for day in range(1, 5)]
+    }
+    return glue
+
+
+class TestLintHelpers:
+    """Test the token-level checks."""
+
+    def test_predicate_columns(self):
+        """Test names are collected from WHERE and ON clauses only."""
+        query = "SELECT dt FROM a JOIN b ON a.id = b.id WHERE a.x > 1 GROUP BY y"
+
+        assert predicate_columns(query) == {"a", "b", "id", "x"}
+
+    def test_outer_star_only(self):
+        """Test stars inside subqueries and count(*) are ignored."""
+        assert has_outer_star("SELECT * FROM t")
+        assert has_outer_star("SELECT t.* FROM t")
+        assert not has_outer_star("SELECT a FROM (SELECT * FROM t)")
+        assert not has_outer_star("SELECT count(*), a * 2 FROM t")
+
+    def test_add_partition_filter(self):
+        """Test the predicate is added to, or wraps, the WHERE clause."""
+        query = "SELECT a FROM events e WHERE x = 1 OR y = 2 LIMIT 5"
+        reference = table_references(query)[0]
+
+        assert add_partition_filter(query, reference, "dt", "'d'") == (
+            "SELECT a FROM events e WHERE \"dt\" = 'd' AND (x = 1 OR y = 2) LIMIT 5"
+        )
+
+        query = "SELECT a FROM events GROUP BY a"
+        reference = table_references(query)[0]
+        assert add_partition_filter(query, reference, "dt", "'d'") == (
+            "SELECT a FROM events WHERE \"dt\" = 'd' GROUP BY a"
+        )
+
+    def test_add_partition_filter_skips_joins(self):
+        """Test tables sharing a FROM clause are not rewritten."""
+        query = "SELECT a FROM events JOIN (SELECT 1 AS id) s ON true"
+
+        assert add_partition_filter(query, table_references(query)[0], "dt", "'d'") is None
+
+
+class TestQueryLinter:
+    """Test findings, policies and estimated savings."""
+
+    @pytest.mark.asyncio
+    async def test_select_star_and_missing_partition_filter(self):
+        """Test both findings on a wide partitioned table."""
+        linter = _linter()
+
+        report, query = await linter.lint("SELECT * FROM events", "db", LintPolicy.WARN)
+
+        assert query == "SELECT * FROM events"
+        assert [finding.rule for finding in report.findings] == [
+            "select_star",
+            "missing_partition_filter",
+        ]
+        assert report.findings[0].estimated_savings_percent == 97.5
+        assert not any(finding.fixed for finding in report.findings)
+
+    @pytest.mark.asyncio
+    async def test_clean_and_unknown_tables(self):
+        """Test filtered, narrow and uncached tables produce no findings."""
+        linter = _linter()
+
+        filtered = "SELECT c1 FROM events WHERE dt = '1'"
+
+        assert (await linter.lint(filtered, "db", LintPolicy.WARN))[0] is None
+        assert (await linter.lint("SELECT * FROM users", "db", LintPolicy.WARN))[0] is None
+        assert (await linter.lint("SELECT * FROM other", "db", LintPolicy.WARN))[0] is None
+        assert (await linter.lint("SELECT * FROM events", "db", LintPolicy.OFF))[0] is None
+
+    @pytest.mark.asyncio
+    async def test_warn_uses_cached_partitions_only(self):
+        """Test partition counts come from loaded indexes without calling Glue."""
+        glue = _partitioned_glue()
+        linter = _linter(glue)
+
+        report, _ = await linter.lint("SELECT c1 FROM db.events", "other", LintPolicy.WARN)
+        assert report.findings[0].estimated_savings_percent is None
+        glue.get_partitions.assert_not_called()
+
+        await linter.partitions.get_index("db", "events")
+        report, _ = await linter.lint("SELECT c1 FROM db.events", "other", LintPolicy.WARN)
+        assert report.findings[0].estimated_savings_percent == 75.0
+        assert report.estimated_savings_percent == 75.0
+
+    @pytest.mark.asyncio
+    async def test_rewrite_restricts_to_newest_partition(self):
+        """Test REWRITE adds a newest-partition predicate but leaves SELECT * alone."""
+        linter = _linter(_partitioned_glue())
+
+        report, query = await linter.lint(
+            "SELECT * FROM events WHERE c1 = 'a'", "db", LintPolicy.REWRITE
+        )
+
+        assert query == "SELECT * FROM events WHERE \"dt\" = '2024-01-04' AND (c1 = 'a')"
+        star, partition = report.findings
+        assert not star.fixed
+        assert partition.fixed
@@ -0,0 +1,122 @@
+"""
+Tests for local follow-up queries.
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from athena_mcp.local import LocalEngine
+from athena_mcp.models import QueryResult
+
+ORDERS_ID = "11111111-1111-1111-1111-111111111111"
+REGIONS_ID = "22222222-2222-2222-2222-222222222222"
+
+
+def _orders():
+    return QueryResult(
+        query_execution_id=ORDERS_ID,
+        columns=["region", "total"],
+        column_types={"region": "varchar", "total": "bigint"},
+        rows=[
+            {"region": "eu", "total": "5"},
+            {"region": "us", "total": "10"},
+            {"region": "eu", "total": "20"},
+            {"region": "ap", "total": None},
+        ],
+    )
+
+
+def _regions():
+    return QueryResult(
+        query_execution_id=REGIONS_ID,
+        columns=["region", "name"],
+        rows=[{"region": "eu", "name": "Europe"}, {"region": "us", "name": "Americas"}],
+        truncated=True,
+    )
+
+
+class TestLocalEngine:
+    """Test loading results and querying them locally."""
+
+    @pytest.mark.asyncio
+    async def test_aggregate_uses_numeric_types(self):
+        """Test numeric Athena columns sort and sum as numbers."""
+        engine = LocalEngine()
+        await engine.load(_orders())
+
+        result = await engine.query(
+            f'SELECT region, sum(total) AS total FROM "{ORDERS_ID}" '
+            "GROUP BY region ORDER BY total DESC"
+        )
+
+        assert result.rows[0] == {"region": "eu", "total": 25}
+        assert result.sources[ORDERS_ID] == {"rows": 4, "partial": False}
+
+    @pytest.mark.asyncio
+    async def test_join_across_results(self):
+        """Test joins across two loaded results and partial flags."""
+        engine = LocalEngine()
+        await engine.load(_orders())
+        await engine.load(_regions())
+
+        result = await engine.query(
+            f'SELECT r.name, o.total FROM "{ORDERS_ID}" o JOIN "{REGIONS_ID}" r '
+            "USING (region) ORDER BY o.total",
+            max_rows=2,
+        )
+
+        assert [row["name"] for row in result.rows] == ["Europe", "Americas"]
+        assert result.truncated
+        assert result.sources[REGIONS_ID]["partial"]
+
+    @pytest.mark.asyncio
+    async def test_writes_denied(self):
+        """Test only reads are allowed."""
+        engine = LocalEngine()
+        await engine.load(_orders())
+
+        for sql in (f'DELETE FROM "{ORDERS_ID}"', "ATTACH DATABASE 'x.db' AS x"):
+            with pytest.raises(ValueError, match="Local query failed"):
+                await engine.query(sql)
+
+        assert (await engine.query(f'SELECT count(*) AS n FROM "{ORDERS_ID}"')).rows == [{"n": 4}]
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_evicted(self):
+        """Test the least recently used table is dropped past the limit."""
+        engine = LocalEngine(max_tables=1)
+        await engine.load(_orders())
+        await engine.load(_regions())
+
+        assert ORDERS_ID not in engine
+        assert REGIONS_ID in engine
+
+    @pytest.mark.asyncio
+    async def test_slow_query_does_not_block_event_loop(self):
+        """Test the event loop keeps running while a local query runs to its time limit."""
+        engine = LocalEngine(timeout_seconds=0.5)
+        await engine.load(_orders())
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker = asyncio.create_task(tick())
+        slow = (
+            "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n) "
+            "SELECT count(*) FROM n"
+        )
+        with pytest.raises(ValueError, match="exceeded"):
+            await engine.query(slow)
+        ticker.cancel()
+
+        assert ticks >= 10
+        assert engine.evict_bytes(1) > 0
@@ -0,0 +1,176 @@
+"""
+Tests for CTAS materialization of reused subqueries.
+"""
+
+import asyncio
+import os
+import sys
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from athena_mcp.materialize import MaterializationCache, body_key, canonical_sql
+from athena_mcp.throttle import ApiRateLimiter
+
+QUERY = "WITH recent AS (SELECT id FROM events WHERE dt > '2024-01-01') SELECT count(*) FROM recent"
+
+
+def _cache(run_statement=None, s3=None, **kwargs):
+    s3 = s3 or MagicMock()
+    s3.list_objects_v2.return_value = {"Contents": [{"Key": "mv/a"}], "IsTruncated": False}
+    return MaterializationCache(
+        run_statement or AsyncMock(),
+        s3,
+        ApiRateLimiter(),
+        "scratch",
+        "s3://bucket/mv",
+        **kwargs,
+    )
+
+
+async def _settle(cache):
+    await asyncio.gather(*cache._tasks)
+
+
+class TestKeys:
+    """Test how CTE bodies are identified."""
+
+    def test_canonical_sql_keeps_literals(self):
+        """Test case and whitespace are folded but literals are not."""
+        assert canonical_sql("SELECT  A\nFROM T WHERE b = 'X'") == "select a from t where b = 'X'"
+        assert body_key("db", "select a from t") == body_key("DB", "SELECT a  FROM t")
+        assert body_key("db", "select a from t where b = 1") != body_key(
+            "db", "select a from t where b = 2"
+        )
+        assert body_key("db", "select a from t") != body_key("other", "select a from t")
+
+
+class TestMaterializationCache:
+    """Test materializing, rewriting and dropping hot subqueries."""
+
+    @pytest.mark.asyncio
+    async def test_materializes_after_min_uses(self):
+        """Test the CTAS starts on the Nth use and later queries read the table."""
+        run_statement = AsyncMock()
+        cache = _cache(run_statement, min_uses=2)
+
+        assert cache.apply(QUERY, "db") == QUERY
+        run_statement.assert_not_called()
+        assert cache.apply(QUERY, "db") == QUERY
+        await _settle(cache)
+
+        statement, database = run_statement.call_args.args
+        assert database == "db"
+        assert statement.startswith("CREATE TABLE scratch.mv_")
+        assert "format = 'PARQUET', write_compression = 'SNAPPY'" in statement
+        assert "external_location = 's3://bucket/mv/" in statement
+        assert statement.endswith("AS SELECT id FROM events WHERE dt > '2024-01-01'")
+
+        table = cache.entries()[0].table
+        assert cache.apply(QUERY, "db") == (
+            f"WITH recent AS (SELECT * FROM scratch.{table}) SELECT count(*) FROM recent"
+        )
+        assert cache.stats() == {
+            "ready": 1,
+            "pending": 0,
+            "expired_pending_drop": 0,
+            "materialized": 1,
+            "failed": 0,
+            "expired": 0,
+            "rewrites": 1,
+        }
+
+    @pytest.mark.asyncio
+    async def test_dependent_and_different_bodies(self):
+        """Test bodies reading other CTEs, and other databases, are counted apart."""
+        run_statement = AsyncMock()
+        cache = _cache(run_statement, min_uses=2)
+        query = "WITH a AS (SELECT 1 AS x), b AS (SELECT x FROM a) SELECT * FROM b"
+
+        cache.apply(query, "db")
+        cache.apply(query, "other")
+        cache.apply(query, "db")
+        await _settle(cache)
+
+        assert run_statement.await_count == 1
+        assert run_statement.call_args.args[0].endswith("AS SELECT 1 AS x")
+
+    @pytest.mark.asyncio
+    async def test_volatile_bodies_are_not_materialized(self):
+        """Test bodies whose result depends on when they run are never materialized."""
+        run_statement = AsyncMock()
+        cache = _cache(run_statement, min_uses=2)
+        query = "WITH today AS (SELECT id FROM events WHERE dt = current_date) SELECT * FROM today"
+
+        for _ in range(3):
+            assert cache.apply(query, "db") == query
+        await _settle(cache)
+
+        run_statement.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_failed_materialization_is_not_used(self):
+        """Test a failed CTAS leaves queries unchanged and cleans up its output."""
+        s3 = MagicMock()
+        cache = _cache(AsyncMock(side_effect=RuntimeError("denied")), s3, min_uses=2)
+
+        cache.apply(QUERY, "db")
+        cache.apply(QUERY, "db")
+        await _settle(cache)
+
+        assert cache.apply(QUERY, "db") == QUERY
+        assert cache.stats()["failed"] == 1
+        s3.delete_objects.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_expired_tables_are_dropped(self):
+        """Test tables past the TTL stop being read, then are dropped with their S3 data."""
+        run_statement = AsyncMock()
+        s3 = MagicMock()
+        cache = _cache(run_statement, s3, min_uses=2, ttl_seconds=60, drop_grace_seconds=600)
+        cache.apply(QUERY, "db")
+        cache.apply(QUERY, "db")
+        await _settle(cache)
+        entry = cache.entries()[0]
+
+        with patch("athena_mcp.materialize.time.time", return_value=entry.created_at + 61):
+            assert cache.apply(QUERY, "db") == QUERY
+        await _settle(cache)
+
+        # Queries rewritten just before the TTL may still be reading the table
+        assert run_statement.await_count == 1
+        assert cache.stats()["expired_pending_drop"] == 1
+
+        with patch("athena_mcp.materialize.time.time", return_value=entry.created_at + 662):
+            cache.apply("SELECT 1", "db")
+        await _settle(cache)
+
+        assert run_statement.call_args.args == (
+            f"DROP TABLE IF EXISTS scratch.{entry.table}",
+            "scratch",
+        )
+        s3.delete_objects.assert_called_once_with(
+            Bucket="bucket", Delete={"Objects": [{"Key": "mv/a"}], "Quiet": True}
+        )
+        assert (
+            s3.list_objects_v2.call_args.kwargs["Prefix"] == entry.location[len("s3://bucket/") :]
+        )
+        assert cache.stats()["expired"] == 1
+        assert cache.stats()["expired_pending_drop"] == 0
+
+    @pytest.mark.asyncio
+    async def test_close_drops_everything(self):
+        """Test shutdown drops ready tables."""
+        run_statement = AsyncMock()
+        cache = _cache(run_statement, min_uses=2)
+        cache.apply(QUERY, "db")
+        cache.apply(QUERY, "db")
+        await _settle(cache)
+        table = cache.entries()[0].table
+
+        await cache.close()
+
+        assert run_statement.call_args.args[0] == f"DROP TABLE IF EXISTS scratch.{table}"
+        assert cache.entries() == []
@@ -0,0 +1,112 @@
+"""
+Tests for memory accounting.
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from athena_mcp.memory import MemoryManager
+
+
+class FakeCache:
+    """Cache of fixed-size entries that evicts whole entries."""
+
+    def __init__(self, entries, entry_size=100):
+        self.entries = entries
+        self.entry_size = entry_size
+
+    def bytes(self):
+        return self.entries * self.entry_size
+
+    def evict_bytes(self, size):
+        freed = 0
+        while freed < size and self.entries:
+            self.entries -= 1
+            freed += self.entry_size
+        return freed
+
+
+class TestMemoryManager:
+    """Test reservations, eviction and backpressure."""
+
+    def test_reserve_within_limit(self):
+        """Test reservations under the limit succeed without evicting."""
+        cache = FakeCache(entries=3)
+        memory = MemoryManager(1000)
+        memory.register_cache("results", cache.bytes, cache.evict_bytes)
+
+        assert memory.try_reserve("result_fetches", 500)
+        assert cache.entries == 3
+        assert memory.used_bytes() == 800
+
+    def test_evicts_in_registration_order(self):
+        """Test reservations past the limit evict from the first cache first."""
+        first = FakeCache(entries=3)
+        second = FakeCache(entries=3)
+        memory = MemoryManager(1000)
+        memory.register_cache("results", first.bytes, first.evict_bytes)
+        memory.register_cache("local", second.bytes, second.evict_bytes)
+
+        assert memory.try_reserve("result_fetches", 800)
+
+        assert first.entries == 0
+        assert second.entries == 2
+        assert memory.usage()["evicted_bytes"] == 400
+
+    def test_denied_when_nothing_to_evict(self):
+        """Test caches without an evict callback are never shrunk."""
+        cache = FakeCache(entries=5)
+        memory = MemoryManager(1000)
+        memory.register_cache("statuses", cache.bytes)
+
+        assert not memory.try_reserve("result_fetches", 600)
+        assert cache.entries == 5
+        assert memory.used_bytes() == 500
+
+    @pytest.mark.asyncio
+    async def test_reserve_waits_for_release(self):
+        """Test a reservation waits until in-flight work releases memory."""
+        memory = MemoryManager(1000)
+        assert memory.try_reserve("result_fetches", 800)
+
+        async def release_later():
+            await asyncio.sleep(0.05)
+            memory.release("result_fetches", 800)
+
+        releaser = asyncio.create_task(release_later())
+        assert await memory.reserve("responses", 500, wait_seconds=2.0)
+        await releaser
+
+        usage = memory.usage()
+        assert usage["categories"] == {"responses": 500}
+        assert usage["waits"] == 1
+        assert usage["denied"] == 0
+
+    @pytest.mark.asyncio
+    async def test_reserve_denied_after_wait(self):
+        """Test a reservation gives up after waiting and can be forced."""
+        memory = MemoryManager(1000, wait_seconds=0.01)
+        assert memory.try_reserve("result_fetches", 800)
+
+        assert not await memory.reserve("responses", 500)
+        memory.force_reserve("responses", 500)
+
+        usage = memory.usage()
+        assert usage["denied"] == 1
+        assert usage["used_bytes"] == 1300
+        assert usage["available_bytes"] == 0
+
+    @pytest.mark.asyncio
+    async def test_hold_releases_after_block(self):
+        """Test hold accounts memory only while the block runs."""
+        memory = MemoryManager(1000)
+
+        async with memory.hold("responses", 300):
+            assert memory.usage()["categories"] == {"responses": 300}
+
+        assert memory.used_bytes() == 0
@@ -0,0 +1,130 @@
+"""
+Tests for partition discovery.
+"""
+
+import os
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from athena_mcp.partitions import PartitionCatalog
+from athena_mcp.throttle import ApiRateLimiter
+
+
+def _partition(values, ddl_time="1"):
+    return {
+        "Values": values,
+        "StorageDescriptor": {"Location": f"s3://bucket/{'/'.join(values)}/"},
+        "Parameters": {"transient_lastDdlTime": ddl_time},
+    }
+
+
+class TestPartitionCatalog:
+    """Test partition index loading and refresh."""
+
+    def _glue(self):
+        glue = MagicMock()
+        glue.get_table.return_value = {
+            "Table": {
+                "PartitionKeys": [{"Name": "dt", "Type": "string"}, {"Name": "hr", "Type": "int"}]
+            }
+        }
+        return glue
+
+    @pytest.mark.asyncio
+    async def test_full_load_is_paginated(self):
+        """Test the initial load follows NextToken across pages."""
+        glue = self._glue()
+        glue.get_partitions.side_effect = [
+            {"Partitions": [_partition(["2024-01-01", "9"])], "NextToken": "page-2"},
+            {"Partitions": [_partition(["2024-01-02", "10"])]},
+        ]
+
+        index = await PartitionCatalog(glue, ApiRateLimiter()).get_index("db", "events")
+
+        assert len(index.partitions) == 2
+        assert glue.get_partitions.call_args_list[1].kwargs["NextToken"] == "page-2"
+        assert index.key_ranges() == {
+            "dt": {"min": "2024-01-01", "max": "2024-01-02", "distinct": 2},
+            "hr": {"min": "9", "max": "10", "distinct": 2},
+        }
+
+    @pytest.mark.asyncio
+    async def test_readers_never_see_a_partial_index(self):
+        """Test loads and full reloads publish partitions only once every page is listed."""
+        glue = self._glue()
+        catalog = PartitionCatalog(glue, ApiRateLimiter())
+        seen = []
+
+        def get_partitions(**params):
+            index = catalog.cached_index("db", "events")
+            seen.append(None if index is None else len(index.partitions))
+            if "NextToken" not in params:
+                return {"Partitions": [_partition(["2024-01-01", "0"])], "NextToken": "page-2"}
+            return {"Partitions": [_partition(["2024-01-02", "0"])]}
+
+        glue.get_partitions.side_effect = get_partitions
+
+        await catalog.get_index("db", "events")
+        index = await catalog.get_index("db", "events", refresh=True)
+
+        assert seen == [None, None, 2, 2]
+        assert len(index.partitions) == 2
+
+    @pytest.mark.asyncio
+    async def test_cached_index_is_reused(self):
+        """Test a fresh index does not hit the catalog again."""
+        glue = self._glue()
+        glue.get_partitions.return_value = {"Partitions": [_partition(["2024-01-01", "0"])]}
+        catalog = PartitionCatalog(glue, ApiRateLimiter(), refresh_seconds=300)
+
+        await catalog.get_index("db", "events")
+        await catalog.get_index("db", "events")
+
+        assert glue.get_partitions.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_incremental_refresh(self):
+        """Test a stale index only fetches partitions from the newest known value."""
+        glue = self._glue()
+        glue.get_partitions.side_effect = [
+            {"Partitions": [_partition(["2024-01-01", "0"]), _partition(["2024-01-02", "0"])]},
+            {"Partitions": [_partition(["2024-01-02", "0"], "2"), _partition(["2024-01-03", "0"])]},
+        ]
+        catalog = PartitionCatalog(glue, ApiRateLimiter(), refresh_seconds=0)
+
+        await catalog.get_index("db", "events")
+        index = await catalog.get_index("db", "events")
+
+        assert glue.get_partitions.call_args.kwargs["Expression"] == "dt >= '2024-01-02'"
+        assert len(index.partitions) == 3
+        assert index.partitions[("2024-01-02", "0")]["version"] == "2"
+
+    @pytest.mark.asyncio
+    async def test_unpartitioned_table(self):
+        """Test tables without partition keys skip partition listing."""
+        glue = MagicMock()
+        glue.get_table.return_value = {"Table": {"PartitionKeys": []}}
+
+        index = await PartitionCatalog(glue, ApiRateLimiter()).get_index("db", "dim")
+        summary = index.to_model(10)
+
+        assert summary.partition_count == 0
+        glue.get_partitions.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_to_model_lists_newest_first(self):
+        """Test partition listing order and truncation."""
+        glue = self._glue()
+        glue.get_partitions.return_value = {
+            "Partitions": [_partition(["2024-01-01", "2"]), _partition(["2024-01-01", "10"])]
+        }
+
+        index = await PartitionCatalog(glue, ApiRateLimiter()).get_index("db", "events")
+        summary = index.to_model(1)
+
+        assert summary.partitions == [{"dt": "2024-01-01", "hr": "10"}]
+        assert summary.truncated
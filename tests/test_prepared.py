@@ -0,0 +1,40 @@
+"""
+Tests for the prepared statement registry.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from athena_mcp.prepared import PreparedStatementRegistry, count_placeholders, statement_name
+
+
+class TestPreparedStatements:
+    """Test prepared statement naming and registry bookkeeping."""
+
+    def test_statement_name_is_deterministic(self):
+        """Test names depend only on the query shape."""
+        query = "SELECT * FROM orders WHERE customer_id = ?"
+
+        assert statement_name(query) == statement_name(query)
+        assert statement_name(query) != statement_name(query + " AND day = ?")
+        assert statement_name(query).startswith("mcp_")
+
+    def test_count_placeholders_ignores_literals(self):
+        """Test placeholders inside string literals are not counted."""
+        assert count_placeholders("SELECT '?' FROM t WHERE a = ? AND b = ?") == 2
+
+    def test_registry_lookup_and_eviction(self):
+        """Test lookups refresh recency and the oldest shape is evicted."""
+        registry = PreparedStatementRegistry(max_statements=2)
+        registry.register("primary", "q1", "s1")
+        registry.register("primary", "q2", "s2")
+
+        assert registry.get("primary", "q1") == "s1"
+        assert registry.get("other", "q1") is None
+
+        evicted = registry.register("primary", "q3", "s3")
+
+        assert evicted == [("primary", "s2")]
+        assert len(registry) == 2
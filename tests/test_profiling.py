@@ -0,0 +1,126 @@
+"""
+Tests for result profiling.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from athena_mcp.models import QueryResult
+from athena_mcp.profiling import ColumnProfiler, DistinctSketch, ResultProfiler, profile_result
+
+
+class TestDistinctSketch:
+    """Test approximate distinct counting."""
+
+    def test_exact_for_small_sets(self):
+        """Test that small cardinalities are counted exactly."""
+        sketch = DistinctSketch()
+        for value in ["a", "b", "a", "c"]:
+            sketch.add(value)
+
+        assert sketch.estimate() == 3
+
+    def test_approximate_for_large_sets(self):
+        """Test that large cardinalities stay within a few percent."""
+        sketch = DistinctSketch()
+        for i in range(50000):
+            sketch.add(str(i))
+
+        assert abs(sketch.estimate() - 50000) / 50000 < 0.1
+
+
+class TestColumnProfiler:
+    """Test single-column profiling."""
+
+    def test_numeric_column(self):
+        """Test statistics for a numeric column with nulls."""
+        profiler = ColumnProfiler("amount", top_k=2, bins=2)
+        profiler.update(["1", "2", "2", None, "5"])
+        profile = profiler.summary()
+
+        assert profile.count == 4
+        assert profile.nulls == 1
+        assert profile.distinct_estimate == 3
+        assert profile.min == 1.0
+        assert profile.max == 5.0
+        assert profile.mean == 2.5
+        assert profile.top_values[0] == {"value": "2", "count": 2}
+        assert [bucket["count"] for bucket in profile.histogram] == [3, 1]
+
+    def test_non_finite_values(self):
+        """Test NaN and infinities are counted apart from min, max, mean and histogram."""
+        profiler = ColumnProfiler("ratio", bins=2)
+        profiler.update(["1", "Infinity", "3", "NaN", "-Infinity", None])
+        profile = profiler.summary()
+
+        assert profile.count == 5
+        assert profile.nulls == 1
+        assert profile.non_finite == 3
+        assert profile.min == 1.0
+        assert profile.max == 3.0
+        assert profile.mean == 2.0
+        assert [bucket["count"] for bucket in profile.histogram] == [1, 1]
+
+    def test_string_column(self):
+        """Test statistics for a non-numeric column."""
+        profiler = ColumnProfiler("name")
+        profiler.update(["bob", "alice", "carol", "alice"])
+        profile = profiler.summary()
+
+        assert profile.min == "alice"
+        assert profile.max == "carol"
+        assert profile.mean is None
+        assert profile.histogram == []
+        assert profile.top_values[0] == {"value": "alice", "count": 2}
+
+    def test_top_values_bounded(self):
+        """Test that heavy hitters survive bounded frequency tracking."""
+        profiler = ColumnProfiler("key", top_k=1)
+        values = ["hot"] * 500 + [str(i) for i in range(1000)]
+        profiler.update(values)
+
+        assert profiler.summary().top_values[0]["value"] == "hot"
+        assert len(profiler._counts) <= profiler._capacity
+
+
+class TestResultProfiler:
+    """Test whole-result profiling."""
+
+    def test_profile_result(self):
+        """Test profiling a query result."""
+        result = QueryResult(
+            query_execution_id="test-execution-id",
+            columns=["id", "name"],
+            rows=[{"id": "1", "name": "a"}, {"id": "2", "name": None}],
+        )
+
+        profile = profile_result(result)
+
+        assert profile.query_execution_id == "test-execution-id"
+        assert profile.row_count == 2
+        assert [column.name for column in profile.columns] == ["id", "name"]
+        assert profile.columns[1].nulls == 1
+        assert not profile.truncated
+
+    def test_profile_of_truncated_result(self):
+        """Test a profile of a partial result is marked truncated."""
+        result = QueryResult(
+            query_execution_id="test-execution-id",
+            columns=["id"],
+            rows=[{"id": "1"}],
+            truncated=True,
+        )
+
+        assert profile_result(result).truncated
+
+    def test_streamed_pages(self):
+        """Test that profiling several pages matches profiling them at once."""
+        profiler = ResultProfiler(["n"])
+        profiler.update([{"n": "1"}, {"n": "2"}])
+        profiler.update([{"n": "3"}])
+        profile = profiler.finish("test-execution-id")
+
+        assert profile.row_count == 3
+        assert profile.columns[0].mean == 2.0
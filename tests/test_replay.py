@@ -0,0 +1,175 @@
+"""
+Tests for recording and replaying AWS traffic.
+"""
+
+import os
+import sys
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from botocore.exceptions import ClientError
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from athena_mcp.athena import AthenaClient
+from athena_mcp.config import Config
+from athena_mcp.models import QueryRequest
+from athena_mcp.replay import (
+    RecordingClient,
+    ReplayError,
+    ReplaySession,
+    SessionRecorder,
+    redact,
+)
+from athena_mcp.throttle import ApiRateLimiter
+
+
+def _mock_client(region="us-east-1"):
+    client = MagicMock()
+    client.meta.region_name = region
+    return client
+
+
+class TestRedact:
+    """Test redaction of recorded calls."""
+
+    def test_sensitive_values_redacted(self):
+        """Test result data, literals, tokens and S3 locations are redacted."""
+        redacted = redact(
+            {
+                "QueryString": "SELECT * FROM users WHERE email = 'a@example.com'",
+                "ClientRequestToken": "token-123",
+                "ExecutionParameters": ["'secret'", "42"],
+                "ResultConfiguration": {"OutputLocation": "s3://private-bucket/results/"},
+                "ResultSet": {"Rows": [{"Data": [{"VarCharValue": "alice"}]}]},
+                "QueryExecutionId": "abc",
+            }
+        )
+
+        assert redacted == {
+            "QueryString": "select * from users where email = ?",
+            "ClientRequestToken": "redacted",
+            "ExecutionParameters": ["?", "?"],
+            "ResultConfiguration": {"OutputLocation": "s3://redacted/"},
+            "ResultSet": {"Rows": [{"Data": [{"VarCharValue": "xxxxx"}]}]},
+            "QueryExecutionId": "abc",
+        }
+
+
+class TestRecordAndReplay:
+    """Test session files round-trip through recording and replay."""
+
+    def test_round_trip(self, tmp_path):
+        """Test responses, datetimes and errors are replayed in recorded order."""
+        path = str(tmp_path / "session.jsonl")
+        submitted = datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)
+        client = _mock_client()
+        client.get_query_execution.side_effect = [
+            {"QueryExecution": {"Status": {"State": "RUNNING"}}},
+            {"QueryExecution": {"Status": {"SubmissionDateTime": submitted}}},
+        ]
+        client.get_table.side_effect = ClientError(
+            {"Error": {"Code": "EntityNotFoundException", "Message": "missing"}}, "GetTable"
+        )
+
+        recorder = SessionRecorder(path)
+        recording = RecordingClient(client, "athena", recorder)
+        recording.get_query_execution(QueryExecutionId="id-1")
+        recording.get_query_execution(QueryExecutionId="id-1")
+        with pytest.raises(ClientError):
+            recording.get_table(DatabaseName="db", Name="t")
+        recorder.close()
+
+        session = ReplaySession.load(path)
+        replayed = session.client("athena", "us-east-1")
+
+        assert replayed.meta.region_name == "us-east-1"
+        first = replayed.get_query_execution(QueryExecutionId="id-1")
+        assert first["QueryExecution"]["Status"]["State"] == "RUNNING"
+        second = replayed.get_query_execution(QueryExecutionId="id-1")
+        assert second["QueryExecution"]["Status"]["SubmissionDateTime"] == submitted
+        with pytest.raises(ClientError, match="EntityNotFoundException"):
+            replayed.get_table(DatabaseName="db", Name="t")
+        with pytest.raises(ReplayError):
+            replayed.get_query_execution(QueryExecutionId="id-1")
+        assert session.remaining == 0
+
+    def test_calls_after_close_are_dropped(self, tmp_path):
+        """Test a closed recorder ignores calls still finishing, and closes only once."""
+        path = str(tmp_path / "session.jsonl")
+        recorder = SessionRecorder(path)
+        client = _mock_client()
+        client.list_work_groups.return_value = {"WorkGroups": []}
+        recording = RecordingClient(client, "athena", recorder)
+        recording.list_work_groups()
+
+        recorder.close()
+        recording.list_work_groups()
+        recorder.close()
+
+        assert recorder.calls == 1
+        assert ReplaySession.load(path).remaining == 1
+
+    @pytest.mark.asyncio
+    async def test_replay_at_recorded_speed(self):
+        """Test a speed paces calls at their recorded duration divided by speed, asynchronously."""
+        event = {
+            "t": 0.0,
+            "duration": 0.2,
+            "service": "athena",
+            "region": "us-east-1",
+            "operation": "get_query_execution",
+            "params": {},
+            "response": {},
+            "error": None,
+        }
+        session = ReplaySession([event, event], speed=4.0)
+        client = session.client("athena", "us-east-1")
+
+        with patch("athena_mcp.replay.asyncio.sleep", new=AsyncMock()) as sleep, patch(
+            "athena_mcp.replay.time.sleep"
+        ) as blocking_sleep:
+            response = await ApiRateLimiter().call(
+                client, "get_query_execution", QueryExecutionId="id-1"
+            )
+
+        assert response == {}
+        sleep.assert_awaited_once_with(0.05)
+        blocking_sleep.assert_not_called()
+        with pytest.raises(ValueError, match="positive"):
+            ReplaySession([], speed=0)
+
+    @pytest.mark.asyncio
+    async def test_athena_client_session_replays_offline(self, tmp_path):
+        """Test a recorded AthenaClient session replays without AWS."""
+        path = str(tmp_path / "session.jsonl")
+        config = Config(s3_output_location="s3://test-bucket/results/", record_file=path)
+        request = QueryRequest(database="test_db", query="SELECT n FROM numbers WHERE n < 3")
+
+        with patch("boto3.Session") as mock_session:
+            aws = _mock_client()
+            mock_session.return_value.client.return_value = aws
+            aws.start_query_execution.return_value = {"QueryExecutionId": "replayed-id"}
+            aws.get_query_execution.return_value = {
+                "QueryExecution": {"Status": {"State": "SUCCEEDED"}, "Statistics": {}}
+            }
+            aws.get_query_results.return_value = {
+                "ResultSet": {
+                    "ResultSetMetadata": {"ColumnInfo": [{"Name": "n", "Type": "integer"}]},
+                    "Rows": [{"Data": [{"VarCharValue": "n"}]}]
+                    + [{"Data": [{"VarCharValue": str(i)}]} for i in (10, 20)],
+                }
+            }
+            recorded = await AthenaClient(config).execute_query(request)
+        assert [row["n"] for row in recorded.rows] == ["10", "20"]
+
+        replay_config = Config(s3_output_location="s3://test-bucket/results/", replay_file=path)
+        with patch("boto3.Session") as unused_session:
+            client = AthenaClient(replay_config)
+            replayed = await client.execute_query(request)
+
+        assert unused_session.call_count == 0
+        assert replayed.query_execution_id == "replayed-id"
+        assert [row["n"] for row in replayed.rows] == ["xx", "xx"]
+        assert client.replay.remaining == 0
@@ -0,0 +1,98 @@
+"""
+Tests for result paging under row and byte budgets.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from athena_mcp.results import (
+    ResultBuffer,
+    byte_budget,
+    decode_cursor,
+    encode_cursor,
+    row_size,
+)
+
+
+def _page(values, header=False, next_token=None):
+    rows = [{"Data": [{"VarCharValue": "v"}]}] if header else []
+    rows += [{"Data": [{"VarCharValue": value}]} for value in values]
+    response = {"ResultSet": {"ResultSetMetadata": {"ColumnInfo": [{"Name": "v"}]}, "Rows": rows}}
+    if next_token:
+        response["NextToken"] = next_token
+    return response
+
+
+class TestBudgets:
+    """Test budget and cursor helpers."""
+
+    def test_byte_budget(self):
+        """Test the tighter of the byte and token budgets wins."""
+        assert byte_budget(None, None) is None
+        assert byte_budget(1000, None) == 1000
+        assert byte_budget(1000, 100) == 400
+        assert byte_budget(None, 100) == 400
+
+    def test_cursor_round_trip(self):
+        """Test cursors decode to the encoded position."""
+        assert decode_cursor(encode_cursor("token", 7)) == ("token", 7)
+        assert decode_cursor(encode_cursor(None, 0)) == (None, 0)
+
+    def test_invalid_cursor(self):
+        """Test malformed cursors are rejected."""
+        with pytest.raises(ValueError, match="Invalid result cursor"):
+            decode_cursor("not-a-cursor")
+
+
+class TestResultBuffer:
+    """Test buffering pages and taking rows under budgets."""
+
+    def test_header_skipped_on_first_page_only(self):
+        """Test only the first page of a result carries a header row."""
+        buffer = ResultBuffer()
+        buffer.add_page(_page(["a", "b"], header=True, next_token="t1"))
+        buffer.add_page(_page(["c"]))
+
+        assert [row["v"] for row in buffer.rows] == ["a", "b", "c"]
+        assert buffer.pages == [(0, None), (2, "t1")]
+        assert buffer.complete
+
+    def test_take_stops_at_byte_budget(self):
+        """Test rows are taken until the next one would exceed the budget."""
+        buffer = ResultBuffer()
+        buffer.add_page(_page(["x" * 10] * 5, header=True))
+        size = row_size({"v": "x" * 10})
+
+        assert buffer.take(0, 100, size * 2 + 1) == (2, size * 2, True)
+        assert buffer.take(0, 3, None) == (3, size * 3, True)
+        assert buffer.take(0, 100, 1) == (1, size, True)
+        assert buffer.take(3, 100, None) == (2, size * 2, False)
+
+    def test_cursor_positions(self):
+        """Test cursors point at the page holding a row and resolve back to it."""
+        buffer = ResultBuffer()
+        buffer.add_page(_page(["a", "b"], header=True, next_token="t1"))
+        buffer.add_page(_page(["c", "d"], next_token="t2"))
+
+        assert decode_cursor(buffer.cursor_at(3)) == ("t1", 1)
+        assert decode_cursor(buffer.cursor_at(4)) == ("t2", 0)
+        assert buffer.position("t1", 1) == 3
+        assert buffer.position("t2", 0) == 4
+        assert buffer.position("unknown", 0) is None
+
+    def test_page_size_follows_row_width(self):
+        """Test the next page is sized to the remaining byte budget."""
+        buffer = ResultBuffer()
+        assert buffer.next_page_size(10, None) == 11  # Header row
+
+        buffer.add_page(_page(["x" * 10] * 5, header=True, next_token="t1"))
+        size = row_size({"v": "x" * 10})
+
+        assert buffer.next_page_size(5000, None) == 1000
+        assert buffer.next_page_size(5000, size * 3) == 4
+        assert buffer.next_page_size(10, None, skip_rows=900) == 910
+        assert buffer.next_page_size(10, size * 3, skip_rows=900) == 904
@@ -0,0 +1,119 @@
+"""
+Tests for exploratory SQL rewriting.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from athena_mcp.models import QueryRequest, SampleMethod
+from athena_mcp.rewrite import (
+    add_limit,
+    add_tablesample,
+    cte_definitions,
+    has_limit,
+    rewrite_query,
+)
+
+
+class TestLimitPushdown:
+    """Test LIMIT detection and insertion."""
+
+    def test_has_limit(self):
+        """Test detection of an outer LIMIT."""
+        assert has_limit("SELECT * FROM t LIMIT 10")
+        assert has_limit("SELECT * FROM t OFFSET 5 FETCH FIRST 3 ROWS ONLY")
+        assert not has_limit("SELECT * FROM (SELECT * FROM t LIMIT 10)")
+        assert not has_limit("SELECT 'limit' FROM t")
+
+    def test_add_limit(self):
+        """Test LIMIT is appended only when missing."""
+        assert add_limit("SELECT * FROM t;", 10) == "SELECT * FROM t\nLIMIT 10"
+        assert add_limit("SELECT * FROM t LIMIT 5", 10) == "SELECT * FROM t LIMIT 5"
+
+
+class TestTablesample:
+    """Test TABLESAMPLE insertion on table references."""
+
+    def test_simple_and_aliased_tables(self):
+        """Test sampling of plain, aliased and joined tables."""
+        query = "SELECT * FROM db.events e JOIN users AS u ON e.id = u.id WHERE x = 1"
+
+        assert add_tablesample(query, SampleMethod.BERNOULLI, 10) == (
+            "SELECT * FROM db.events e TABLESAMPLE BERNOULLI (10) "
+            "JOIN users AS u TABLESAMPLE BERNOULLI (10) ON e.id = u.id WHERE x = 1"
+        )
+
+    def test_comma_joins_and_subqueries(self):
+        """Test sampling inside comma lists and subqueries, but not of subqueries."""
+        query = "SELECT * FROM a, (SELECT * FROM b) s"
+
+        assert add_tablesample(query, SampleMethod.SYSTEM, 5) == (
+            "SELECT * FROM a TABLESAMPLE SYSTEM (5), (SELECT * FROM b TABLESAMPLE SYSTEM (5)) s"
+        )
+
+    def test_skips_ctes_and_functions(self):
+        """Test that CTE references and table functions are left alone."""
+        query = "WITH x AS (SELECT * FROM t) SELECT * FROM x CROSS JOIN UNNEST(arr) AS u(v)"
+
+        assert add_tablesample(query, SampleMethod.BERNOULLI, 1) == (
+            "WITH x AS (SELECT * FROM t TABLESAMPLE BERNOULLI (1)) "
+            "SELECT * FROM x CROSS JOIN UNNEST(arr) AS u(v)"
+        )
+
+    def test_from_inside_function_calls(self):
+        """Test FROM in extract, trim and substring is not taken for a table reference."""
+        query = (
+            "SELECT extract(year FROM ts), trim(both ' ' FROM name), "
+            "substring(code FROM 2 FOR 3) FROM events"
+        )
+
+        assert add_tablesample(query, SampleMethod.BERNOULLI, 10) == (
+            query + " TABLESAMPLE BERNOULLI (10)"
+        )
+
+
+class TestCteDefinitions:
+    """Test locating CTE bodies."""
+
+    def test_bodies_and_column_lists(self):
+        """Test bodies are the text inside each CTE's parentheses."""
+        query = (
+            "WITH a AS (SELECT x FROM t WHERE y IN (1, 2)), b (c) AS (SELECT 1) SELECT * FROM a, b"
+        )
+
+        bodies = [(name, query[start:end]) for name, start, end in cte_definitions(query)]
+
+        assert bodies == [("a", "SELECT x FROM t WHERE y IN (1, 2)"), ("b", "SELECT 1")]
+
+    def test_no_leading_with(self):
+        """Test recursive and nested WITH clauses are not reported."""
+        assert cte_definitions("SELECT * FROM (WITH a AS (SELECT 1) SELECT * FROM a)") == []
+        assert cte_definitions("WITH RECURSIVE a (n) AS (SELECT 1) SELECT * FROM a") == []
+
+
+class TestRewriteQuery:
+    """Test request-level rewrites."""
+
+    def test_no_rewrite_by_default(self):
+        """Test queries pass through unchanged unless opted in."""
+        request = QueryRequest(database="db", query="SELECT * FROM t", max_rows=10)
+
+        assert rewrite_query(request) == "SELECT * FROM t"
+
+    def test_non_select_untouched(self):
+        """Test that DDL/utility statements are never rewritten."""
+        request = QueryRequest(
+            database="db", query="SHOW TABLES", max_rows=10, exploratory=True, sample_percent=5
+        )
+
+        assert rewrite_query(request) == "SHOW TABLES"
+
+    def test_exploratory_with_sample(self):
+        """Test exploratory LIMIT combined with sampling."""
+        request = QueryRequest(
+            database="db", query="SELECT * FROM t", max_rows=10, exploratory=True, sample_percent=5
+        )
+
+        assert rewrite_query(request) == "SELECT * FROM t TABLESAMPLE BERNOULLI (5)\nLIMIT 10"
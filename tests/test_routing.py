@@ -0,0 +1,105 @@
+"""
+Tests for workgroup routing.
+"""
+
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from athena_mcp.athena import AthenaClient
+from athena_mcp.config import Config, WorkgroupConfig
+from athena_mcp.models import QueryRequest
+from athena_mcp.routing import WorkgroupRoute, WorkgroupRouter
+
+
+def _route(name, max_concurrent=None, region="us-east-1"):
+    workgroup = WorkgroupConfig(name, region, f"s3://bucket/{name}/", max_concurrent)
+    return WorkgroupRoute(workgroup, MagicMock())
+
+
+class TestWorkgroupRouter:
+    """Test load-aware workgroup selection."""
+
+    def test_selects_least_loaded(self):
+        """Test queries go to the workgroup with fewer in-flight executions."""
+        busy, idle = _route("busy"), _route("idle")
+        router = WorkgroupRouter([busy, idle])
+        router.bind("q1", busy)
+
+        assert router.select() is idle
+
+    def test_respects_concurrency_limits(self):
+        """Test full workgroups are skipped while others have capacity."""
+        small, large = _route("small", max_concurrent=1), _route("large", max_concurrent=10)
+        router = WorkgroupRouter([small, large])
+        router.bind("q1", large)
+
+        assert router.select() is small
+        router.bind("q2", small)
+        assert router.select() is large
+
+    def test_recent_queue_time_counts_as_load(self):
+        """Test workgroups that recently queued queries are avoided."""
+        slow, fast = _route("slow"), _route("fast")
+        router = WorkgroupRouter([slow, fast])
+        router.bind("q1", slow)
+        router.finished("q1", queue_time_ms=5000)
+
+        assert slow.in_flight == 0
+        assert router.select() is fast
+
+    def test_affinity(self):
+        """Test executions resolve to the workgroup that started them."""
+        first, second = _route("first"), _route("second", region="eu-west-1")
+        router = WorkgroupRouter([first, second])
+        router.bind("q1", second)
+
+        assert router.route_for("q1") is second
+        assert router.route_for("unknown") is first
+        assert router.get("eu-west-1/second") is second
+
+
+class TestClientRouting:
+    """Test AthenaClient dispatch through the router."""
+
+    @pytest.mark.asyncio
+    async def test_follow_up_calls_use_routed_client(self):
+        """Test status calls go to the regional client that started the query."""
+        config = Config(
+            s3_output_location="s3://test-bucket/results/",
+            workgroups=[
+                WorkgroupConfig("east", "us-east-1", "s3://east/results/"),
+                WorkgroupConfig("west", "us-west-2", "s3://west/results/"),
+            ],
+        )
+        clients = {"us-east-1": MagicMock(), "us-west-2": MagicMock()}
+
+        def session(region_name):
+            mock_session = MagicMock()
+            mock_session.client.return_value = clients[region_name]
+            return mock_session
+
+        with patch("boto3.Session", side_effect=session):
+            client = AthenaClient(config)
+
+        east, west = client.router.routes
+        client.router.bind("busy", east)
+        west.client.start_query_execution.return_value = {"QueryExecutionId": "q1"}
+        west.client.get_query_execution.return_value = {
+            "QueryExecution": {"Status": {"State": "RUNNING"}, "Statistics": {}}
+        }
+        config.timeout_seconds = 0
+
+        request = QueryRequest(database="test_db", query="SELECT 1", max_rows=10)
+        assert await client.execute_query(request) == "q1"
+
+        start_params = clients["us-west-2"].start_query_execution.call_args.kwargs
+        assert start_params["WorkGroup"] == "west"
+        assert start_params["ResultConfiguration"]["OutputLocation"] == "s3://west/results/"
+
+        await client.get_query_status("q1")
+        clients["us-east-1"].get_query_execution.assert_not_called()
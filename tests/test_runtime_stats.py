@@ -0,0 +1,84 @@
+"""
+Tests for query execution profiling.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from athena_mcp.runtime_stats import build_query_profile
+
+
+def _execution(queue=0, planning=0, engine=0, total=0):
+    return {
+        "Status": {"State": "SUCCEEDED"},
+        "Statistics": {
+            "QueryQueueTimeInMillis": queue,
+            "QueryPlanningTimeInMillis": planning,
+            "EngineExecutionTimeInMillis": engine,
+            "ServiceProcessingTimeInMillis": 10,
+            "TotalExecutionTimeInMillis": total,
+            "DataScannedInBytes": 4096,
+        },
+    }
+
+
+def _runtime_statistics(scan_ms, aggregate_ms):
+    return {
+        "Rows": {"InputRows": 1000, "InputBytes": 4096, "OutputRows": 10, "OutputBytes": 100},
+        "OutputStage": {
+            "StageId": 0,
+            "State": "FINISHED",
+            "ExecutionTime": aggregate_ms,
+            "InputRows": 500,
+            "QueryStagePlan": {"Name": "Output", "Children": [{"Name": "Aggregate"}]},
+            "SubStages": [
+                {
+                    "StageId": 1,
+                    "ExecutionTime": scan_ms,
+                    "InputRows": 1000,
+                    "InputBytes": 4096,
+                    "QueryStagePlan": {"Name": "Filter", "Children": [{"Name": "TableScan"}]},
+                }
+            ],
+        },
+    }
+
+
+class TestBuildQueryProfile:
+    """Test profile construction and diagnosis."""
+
+    def test_stage_tree_is_flattened(self):
+        """Test stages are flattened with depth and plan operators."""
+        profile = build_query_profile(
+            "q1", _execution(engine=900, total=1000), _runtime_statistics(800, 100)
+        )
+
+        assert profile.timeline["engine_ms"] == 900
+        assert profile.rows["output_rows"] == 10
+        assert [(stage.stage_id, stage.depth) for stage in profile.stages] == [(0, 0), (1, 1)]
+        assert profile.stages[1].operators == ["Filter", "TableScan"]
+
+    def test_scan_bound_diagnosis(self):
+        """Test engine-dominated queries with a slow scan are reported as scan-bound."""
+        profile = build_query_profile(
+            "q1", _execution(engine=900, total=1000), _runtime_statistics(800, 100)
+        )
+
+        assert any(finding.startswith("scan-bound") for finding in profile.findings)
+
+    def test_compute_bound_diagnosis(self):
+        """Test a slow non-scan stage is reported as compute-bound."""
+        profile = build_query_profile(
+            "q1", _execution(engine=900, total=1000), _runtime_statistics(100, 800)
+        )
+
+        assert any(finding.startswith("compute-bound") for finding in profile.findings)
+
+    def test_queued_diagnosis_without_runtime_statistics(self):
+        """Test queue-dominated queries are flagged even without stage statistics."""
+        profile = build_query_profile("q1", _execution(queue=800, engine=100, total=1000), None)
+
+        assert profile.stages == []
+        assert profile.findings[0].startswith("queued")
@@ -0,0 +1,82 @@
+"""
+Tests for the schema search index.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from athena_mcp.models import TableInfo
+from athena_mcp.search import SchemaIndex, tokenize
+
+
+def _table(name, columns, database="sales"):
+    return TableInfo(
+        database=database,
+        table_name=name,
+        columns=[{"name": c, "type": t, "comment": ""} for c, t in columns],
+    )
+
+
+def _index():
+    index = SchemaIndex()
+    index.update_table(_table("orders", [("order_id", "bigint"), ("customer_id", "bigint")]))
+    index.update_table(
+        _table("order_items", [("order_id", "bigint"), ("order_total", "decimal(10,2)")])
+    )
+    index.update_table(
+        _table("facts", [("customer_id", "bigint"), ("order_total", "double")], "warehouse")
+    )
+    return index
+
+
+class TestTokenize:
+    """Test identifier tokenization."""
+
+    def test_snake_and_camel_case(self):
+        """Test names are split into parts while keeping the whole name."""
+        assert tokenize("customer_id") == {"customer_id", "customer", "id"}
+        assert tokenize("orderTotal") == {"ordertotal", "order", "total"}
+
+
+class TestSchemaIndex:
+    """Test indexing and ranking."""
+
+    def test_tables_matching_all_terms_rank_first(self):
+        """Test a table with both columns outranks tables with one."""
+        matches = _index().search("the table with customer_id and order_total")
+
+        assert (matches[0].database, matches[0].table_name) == ("warehouse", "facts")
+        assert [c["name"] for c in matches[0].matched_columns] == ["customer_id", "order_total"]
+
+    def test_prefix_match(self):
+        """Test prefixes match longer tokens with a lower score."""
+        matches = _index().search("cust")
+
+        assert {m.table_name for m in matches} == {"orders", "facts"}
+        assert all(m.score == 0.5 for m in matches)
+
+    def test_database_filter(self):
+        """Test results can be limited to one database."""
+        matches = _index().search("order_total", database="sales")
+
+        assert [m.table_name for m in matches] == ["order_items", "orders"]
+        assert matches[1].score == 0.25
+
+    def test_incremental_updates(self):
+        """Test changed tables are reindexed and removed tables disappear."""
+        index = _index()
+
+        assert not index.update_table(
+            _table("orders", [("order_id", "bigint"), ("customer_id", "bigint")])
+        )
+        assert index.update_table(_table("orders", [("order_id", "bigint"), ("region", "string")]))
+        assert [m.table_name for m in index.search("region")] == ["orders"]
+        scores = {m.table_name: m.score for m in index.search("customer_id")}
+        assert scores["facts"] == 1.0
+        assert scores["orders"] == 0.25  # Only "id" of order_id still matches
+
+        assert index.retain_tables("sales", ["orders"]) == 1
+        assert "order_items" not in {m.table_name for m in index.search("order_total")}
+        assert len(index) == 2
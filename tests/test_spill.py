@@ -0,0 +1,191 @@
+"""
+Tests for on-disk result spilling.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from athena_mcp.results import ResultBuffer, row_size
+from athena_mcp.spill import SpillFile, SpillStore
+
+COLUMNS = ["id", "name"]
+TYPES = {"id": "integer", "name": "varchar"}
+
+
+def _rows(count, start=0):
+    return [
+        {"id": str(i), "name": None if i % 3 == 0 else f"name-{i}"}
+        for i in range(start, start + count)
+    ]
+
+
+def _spill(store, key, rows, metadata=None):
+    return store.spill(key, COLUMNS, TYPES, rows, [row_size(row) for row in rows], metadata)
+
+
+class TestSpillFile:
+    """Test the spill file format."""
+
+    def test_round_trip(self, tmp_path):
+        """Test rows, types, sizes and metadata read back from the mapped file."""
+        path = str(tmp_path / "result.spill")
+        rows = _rows(10)
+        SpillFile.write(
+            path, COLUMNS, TYPES, rows, [row_size(r) for r in rows], {"pages": [[0, None]]}
+        )
+
+        spill_file = SpillFile(path)
+
+        assert spill_file.columns == COLUMNS
+        assert spill_file.column_types == TYPES
+        assert spill_file.metadata == {"pages": [[0, None]]}
+        assert list(spill_file.row_sizes) == [row_size(row) for row in rows]
+        assert list(spill_file.rows) == rows
+        spill_file.close()
+
+    def test_slices_decode_only_requested_rows(self, tmp_path):
+        """Test slicing and indexing decode just the rows asked for."""
+        path = str(tmp_path / "result.spill")
+        rows = _rows(100)
+        SpillFile.write(path, COLUMNS, TYPES, rows, [row_size(r) for r in rows], {})
+
+        spill_file = SpillFile(path)
+
+        assert spill_file.rows[40:43] == rows[40:43]
+        assert spill_file.rows[-1] == rows[-1]
+        assert spill_file.reads == 4
+        with pytest.raises(IndexError):
+            spill_file.rows[100]
+        spill_file.close()
+
+    def test_rejects_other_files(self, tmp_path):
+        """Test files without the spill header are rejected."""
+        path = tmp_path / "other.spill"
+        path.write_bytes(b"not a spill file")
+
+        with pytest.raises(ValueError, match="Not a spill file"):
+            SpillFile(str(path))
+
+
+class TestSpillStore:
+    """Test spill file lifetime and size-based eviction."""
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        """Test older files are evicted and reported once the size limit is passed."""
+        evicted = []
+        store = SpillStore(10**9, str(tmp_path), on_evict=evicted.append)
+        first = _spill(store, "first", _rows(50))
+        store.max_bytes = 2 * first.file_bytes + 10
+        _spill(store, "second", _rows(50))
+        store.get("first")
+        _spill(store, "third", _rows(50))
+
+        assert evicted == ["second"]
+        assert "first" in store and "third" in store
+        assert sorted(os.listdir(tmp_path)) == ["first.spill", "third.spill"]
+        assert store.stats()["evictions"] == 1
+
+    def test_oversized_result_not_spilled(self, tmp_path):
+        """Test a result larger than the whole limit is left in memory."""
+        store = SpillStore(100, str(tmp_path))
+
+        assert _spill(store, "big", _rows(50)) is None
+        assert os.listdir(tmp_path) == []
+
+    def test_close_removes_temporary_directory(self):
+        """Test a store's own temporary directory is created lazily and removed on close."""
+        store = SpillStore(10**6)
+        assert store.directory is None
+
+        _spill(store, "result", _rows(5))
+        directory = store.directory
+        assert os.path.isdir(directory)
+
+        store.close()
+        assert not os.path.exists(directory)
+
+
+class TestSpilledBuffer:
+    """Test result buffers served from spill files."""
+
+    def _buffer(self):
+        buffer = ResultBuffer(bytes_scanned=123, execution_time_ms=45)
+        page = {
+            "ResultSet": {
+                "ResultSetMetadata": {"ColumnInfo": [{"Name": "id", "Type": "integer"}]},
+                "Rows": [{"Data": [{"VarCharValue": "id"}]}]
+                + [{"Data": [{"VarCharValue": str(i)}]} for i in range(3)],
+            },
+            "NextToken": "page-2",
+        }
+        buffer.add_page(page)
+        buffer.add_page(
+            {"ResultSet": {"Rows": [{"Data": [{"VarCharValue": str(i)}]} for i in range(3, 6)]}}
+        )
+        return buffer
+
+    def test_spill_preserves_paging(self, tmp_path):
+        """Test a spilled buffer keeps its rows, budgets and cursors but frees memory."""
+        buffer = self._buffer()
+        rows = list(buffer.rows)
+        size_before = buffer.size
+        cursor = buffer.cursor_at(4)
+
+        assert buffer.spill(SpillStore(10**6, str(tmp_path)), "result-id")
+
+        assert buffer.spilled is not None
+        assert buffer.size < size_before
+        assert list(buffer.rows) == rows
+        assert buffer.take(0, 4, None) == (4, sum(buffer.row_sizes[:4]), True)
+        assert buffer.cursor_at(4) == cursor
+        with pytest.raises(ValueError, match="spilled"):
+            buffer.add_page({"ResultSet": {"Rows": []}})
+
+    @pytest.mark.asyncio
+    async def test_cooperative_spill_matches_spill(self, tmp_path):
+        """Test spilling a chunk of rows at a time writes the same file."""
+        store = SpillStore(10**6, str(tmp_path))
+        inline, chunked = self._buffer(), self._buffer()
+
+        assert inline.spill(store, "inline")
+        assert await chunked.spill_cooperatively(store, "chunked", 2)
+
+        with open(store.get("inline").path, "rb") as a, open(store.get("chunked").path, "rb") as b:
+            assert a.read() == b.read()
+        assert list(chunked.rows) == list(inline.rows)
+        assert chunked.pages == inline.pages
+
+    def test_from_spill_rebuilds_buffer(self, tmp_path):
+        """Test a buffer rebuilt from a spill file resumes cursors of the original."""
+        store = SpillStore(10**6, str(tmp_path))
+        original = self._buffer()
+        cursor_page_2 = original.cursor_at(3)
+        original.spill(store, "result-id")
+
+        rebuilt = ResultBuffer.from_spill(store.get("result-id"))
+
+        assert rebuilt.complete
+        assert rebuilt.bytes_scanned == 123
+        assert rebuilt.execution_time_ms == 45
+        assert rebuilt.position("page-2", 1) == 4
+        assert rebuilt.cursor_at(3) == cursor_page_2
+        assert rebuilt.rows[3:] == [{"id": "3"}, {"id": "4"}, {"id": "5"}]
+
+    def test_incomplete_buffer_not_spilled(self, tmp_path):
+        """Test buffers that may still grow stay in memory."""
+        buffer = ResultBuffer()
+        buffer.add_page(
+            {
+                "ResultSet": {
+                    "ResultSetMetadata": {"ColumnInfo": [{"Name": "v"}]},
+                    "Rows": [{"Data": [{"VarCharValue": "v"}]}],
+                },
+                "NextToken": "more",
+            }
+        )
+
+        assert not buffer.spill(SpillStore(10**6, str(tmp_path)), "result-id")
@@ -0,0 +1,96 @@
+"""
+Tests for API rate limiting and retries.
+"""
+
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+from botocore.exceptions import ClientError
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from athena_mcp.throttle import ApiRateLimiter, TokenBucket
+
+
+def _error(code):
+    return ClientError({"Error": {"Code": code, "Message": code}}, "Operation")
+
+
+class TestTokenBucket:
+    """Test token bucket rate limiting."""
+
+    @pytest.mark.asyncio
+    async def test_burst_then_wait(self):
+        """Test the bucket allows a burst and then waits for refill."""
+        bucket = TokenBucket(rate=1000, capacity=2)
+
+        assert await bucket.acquire() == 0
+        assert await bucket.acquire() == 0
+        assert await bucket.acquire() > 0
+
+
+class TestApiRateLimiter:
+    """Test retry behaviour and metrics."""
+
+    @pytest.mark.asyncio
+    async def test_retries_throttling(self):
+        """Test throttled calls are retried and counted."""
+        client = MagicMock()
+        client.get_query_execution.side_effect = [_error("ThrottlingException"), {"ok": True}]
+        limiter = ApiRateLimiter(max_retries=3, base_delay=0)
+
+        with patch("asyncio.sleep", return_value=None):
+            response = await limiter.call(client, "get_query_execution", QueryExecutionId="q")
+
+        assert response == {"ok": True}
+        metrics = limiter.metrics()["get_query_execution"]
+        assert metrics["calls"] == 2
+        assert metrics["throttled"] == 1
+        assert metrics["retries"] == 1
+        assert metrics["failures"] == 0
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_retries(self):
+        """Test persistent throttling is raised once retries are exhausted."""
+        client = MagicMock()
+        client.get_query_results.side_effect = _error("TooManyRequestsException")
+        limiter = ApiRateLimiter(max_retries=2, base_delay=0)
+
+        with patch("asyncio.sleep", return_value=None):
+            with pytest.raises(ClientError):
+                await limiter.call(client, "get_query_results", QueryExecutionId="q")
+
+        assert client.get_query_results.call_count == 3
+        assert limiter.metrics()["get_query_results"]["failures"] == 1
+
+    @pytest.mark.asyncio
+    async def test_non_retryable_errors_raise_immediately(self):
+        """Test errors other than throttling are not retried."""
+        client = MagicMock()
+        client.get_query_execution.side_effect = _error("InvalidRequestException")
+        limiter = ApiRateLimiter(max_retries=3)
+
+        with pytest.raises(ClientError):
+            await limiter.call(client, "get_query_execution", QueryExecutionId="q")
+
+        assert client.get_query_execution.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_start_query_requires_idempotency_token(self):
+        """Test StartQueryExecution is only retried with a ClientRequestToken."""
+        client = MagicMock()
+        client.start_query_execution.side_effect = _error("ThrottlingException")
+        limiter = ApiRateLimiter(max_retries=3, base_delay=0)
+
+        with pytest.raises(ClientError):
+            await limiter.call(client, "start_query_execution", QueryString="SELECT 1")
+        assert client.start_query_execution.call_count == 1
+
+        client.start_query_execution.side_effect = [_error("ThrottlingException"), {"id": "q"}]
+        with patch("asyncio.sleep", return_value=None):
+            response = await limiter.call(
+                client, "start_query_execution", QueryString="SELECT 1", ClientRequestToken="t"
+            )
+        assert response == {"id": "q"}